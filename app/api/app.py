@@ -7,7 +7,7 @@ Flask应用创建和配置
 3. 系统管理API
 """
 
-from flask import Flask, jsonify, request, g
+from flask import Flask, Response, jsonify, request, g
 from flask_cors import CORS
 from datetime import datetime
 from app.utils import get_config, get_logger
@@ -16,6 +16,9 @@ from app.services.market_data_service import get_market_data_service
 
 logger = get_logger(__name__)
 
+# 本机回环地址（/metrics 对这些来源免认证）
+LOOPBACK_ADDRESSES = ('127.0.0.1', '::1')
+
 
 def configure_werkzeug_logging():
     """
@@ -79,6 +82,50 @@ def configure_werkzeug_logging():
         werkzeug_logger.addHandler(console_handler)
 
 
+def enable_compression(app):
+    """
+    安装了 Flask-Compress 时，对客户端支持压缩的较大响应（默认不小于500字节）启用gzip等压缩
+    
+    Args:
+        app: Flask应用
+    """
+    try:
+        from flask_compress import Compress
+    except ImportError:
+        return
+    
+    Compress(app)
+    logger.info("已启用响应压缩")
+
+
+def enable_metrics(app, metrics_config: dict):
+    """
+    配置启用且安装了 prometheus_client 时，注册导出数据库连接池监控指标的 /metrics 接口
+    
+    本机直接访问（不经过反向代理）时无需认证，其他来源需要携带有效的Token
+    
+    Args:
+        app: Flask应用
+        metrics_config: 监控指标配置（api.metrics）
+    """
+    from app.models.pool_metrics import metrics_enabled, generate_metrics
+    
+    if not metrics_config.get('enabled', False):
+        return
+    
+    if not metrics_enabled():
+        logger.warning("已配置 api.metrics.enabled，但未安装 prometheus_client，/metrics 接口未启用")
+        return
+    
+    @app.route('/metrics')
+    def metrics():
+        """Prometheus监控指标"""
+        body, content_type = generate_metrics()
+        return Response(body, content_type=content_type)
+    
+    logger.info("已启用 /metrics 监控指标接口")
+
+
 def create_app(config=None):
     """
     创建Flask应用
@@ -108,9 +155,19 @@ def create_app(config=None):
     cors_origins = api_config.get('cors_origins', '*')
     CORS(app, origins=cors_origins)
     
+    # 启用响应压缩
+    enable_compression(app)
+    
+    # 注册监控指标接口
+    enable_metrics(app, api_config.get('metrics') or {})
+    
     # 配置Werkzeug日志使用容错处理器
     configure_werkzeug_logging()
     
+    # 记录JWT签名的硬件加速情况
+    from app.utils.auth import log_hmac_acceleration
+    log_hmac_acceleration()
+    
     # 初始化数据库（使用 ORM 模式）
     with app.app_context():
         get_database()  # 使用工厂方法获取数据库（MySQL或SQLite）
@@ -238,6 +295,77 @@ def register_error_handlers(app):
         }), 500
 
 
+# 无需认证的API路径（API应用和包含API蓝图的Web应用共用）
+PUBLIC_PATHS = frozenset([
+    '/api/auth/login',
+    '/api/auth/register',
+    '/health',
+    '/',
+    '/api/system/health',
+    '/api/system/config',
+    '/api/system/system-info',
+    '/api/system/database-status',
+    '/api/system/scheduler/jobs',
+    '/api/system/stats',
+    '/api/system/info',
+    '/api/system/scheduler/logs'
+])
+
+
+def authenticate_request(public_paths=PUBLIC_PATHS):
+    """
+    校验当前请求的认证Token，通过后将用户信息保存到 g.user
+    
+    作为 before_request 钩子的认证逻辑使用，API应用和Web应用共用
+    
+    Args:
+        public_paths: 无需认证的路径，默认为API应用的白名单
+    
+    Returns:
+        认证失败时返回 (错误响应, 401)，无需认证或认证通过时返回None
+    """
+    # 认证逻辑
+    if request.method == 'OPTIONS':
+        return None
+    
+    # 静态文件或白名单路径直接放行
+    if request.path in public_paths or request.path.startswith('/static/'):
+        return None
+    
+    # 监控指标只对本机直接访问放行（经过反向代理的请求来源地址也是本机，需要认证）
+    if (request.path == '/metrics' and request.remote_addr in LOOPBACK_ADDRESSES
+            and 'X-Forwarded-For' not in request.headers):
+        return None
+    
+    # 获取 Token
+    auth_header = request.headers.get('Authorization')
+    if not auth_header:
+        logger.warning(f"认证失败: 缺少 Authorization header - {request.method} {request.path}")
+        return jsonify({'error': 'Missing Authorization header'}), 401
+    
+    try:
+        parts = auth_header.split()
+        if len(parts) != 2 or parts[0].lower() != 'bearer':
+            logger.warning(f"认证失败: 无效的 token 类型 - {request.method} {request.path}")
+            return jsonify({'error': 'Invalid token type'}), 401
+        token = parts[1]
+    except ValueError:
+        logger.warning(f"认证失败: 无效的 Authorization header - {request.method} {request.path}")
+        return jsonify({'error': 'Invalid Authorization header'}), 401
+    
+    # 验证 Token
+    from app.utils.auth import AuthUtils
+    
+    payload = AuthUtils.verify_token(token)
+    if not payload:
+        logger.warning(f"认证失败: 无效或过期的 token - {request.method} {request.path}")
+        return jsonify({'error': 'Invalid or expired token'}), 401
+    
+    # 设置用户信息到上下文
+    g.user = payload
+    return None
+
+
 def register_request_hooks(app):
     """注册请求钩子"""
     
@@ -247,55 +375,7 @@ def register_request_hooks(app):
         # 记录请求信息
         logger.debug(f"Request: {request.method} {request.path}")
         
-        # 认证逻辑
-        if request.method == 'OPTIONS':
-            return
-            
-        # 白名单
-        public_paths = [
-            '/api/auth/login',
-            '/api/auth/register',
-            '/health',
-            '/',
-            '/api/system/config',
-            '/api/system/system-info',
-            '/api/system/database-status',
-            '/api/system/scheduler/jobs',
-            '/api/system/stats',
-            '/api/system/info',
-            '/api/system/scheduler/logs'
-        ]
-        
-        # 静态文件或白名单路径直接放行
-        if request.path in public_paths or request.path.startswith('/static/'):
-            return
-            
-        # 获取 Token
-        auth_header = request.headers.get('Authorization')
-        if not auth_header:
-            logger.warning(f"认证失败: 缺少 Authorization header - {request.method} {request.path}")
-            return jsonify({'error': 'Missing Authorization header'}), 401
-            
-        try:
-            parts = auth_header.split()
-            if len(parts) != 2 or parts[0].lower() != 'bearer':
-                logger.warning(f"认证失败: 无效的 token 类型 - {request.method} {request.path}")
-                return jsonify({'error': 'Invalid token type'}), 401
-            token = parts[1]
-        except ValueError:
-            logger.warning(f"认证失败: 无效的 Authorization header - {request.method} {request.path}")
-            return jsonify({'error': 'Invalid Authorization header'}), 401
-            
-        # 验证 Token
-        from app.utils.auth import AuthUtils
-        
-        payload = AuthUtils.verify_token(token)
-        if not payload:
-            logger.warning(f"认证失败: 无效或过期的 token - {request.method} {request.path}")
-            return jsonify({'error': 'Invalid or expired token'}), 401
-            
-        # 设置用户信息到上下文
-        g.user = payload
+        return authenticate_request()
     
     @app.after_request
     def after_request(response):
@@ -1,10 +1,17 @@
 """
 自定义JSON Provider，用于格式化datetime对象
+
+安装了 orjson 时使用 orjson 序列化和解析，速度明显快于标准库 json
 """
 
 from datetime import datetime, date
 from flask.json.provider import DefaultJSONProvider
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class CustomJSONProvider(DefaultJSONProvider):
     """自定义JSON提供者，格式化datetime和date对象"""
@@ -24,3 +31,46 @@ class CustomJSONProvider(DefaultJSONProvider):
         if isinstance(obj, date):
             return obj.strftime('%Y-%m-%d')
         return super().default(obj)
+    
+    def dumps(self, obj, **kwargs) -> str:
+        """
+        序列化为JSON字符串
+        
+        Args:
+            obj: 要序列化的对象
+            **kwargs: 传给 json.dumps 的参数
+            
+        Returns:
+            str: JSON字符串
+        """
+        indent = kwargs.pop('indent', None)
+        separators = kwargs.pop('separators', None)
+        if orjson is None or kwargs or indent not in (None, 2):
+            if indent is not None:
+                kwargs['indent'] = indent
+            if separators is not None:
+                kwargs['separators'] = separators
+            return super().dumps(obj, **kwargs)
+        
+        # datetime/date 交给 default 处理，保持与标准库相同的输出格式
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        """
+        解析JSON字符串
+        
+        Args:
+            s: JSON字符串或字节串
+            **kwargs: 传给 json.loads 的参数
+            
+        Returns:
+            解析后的对象
+        """
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
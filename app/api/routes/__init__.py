@@ -1,14 +1,31 @@
-"""API路由模块"""
-from .strategy_routes import strategy_bp
-from .stock_routes import stock_bp
-from .system_routes import system_bp
-from .data_routes import data_bp
-from .auth_routes import auth_bp
-
-__all__ = [
-    'strategy_bp',
-    'stock_bp',
-    'system_bp',
-    'data_bp',
-    'auth_bp'
-]
+"""
+API路由模块
+
+蓝图在首次访问时才导入对应的路由模块，导入本包或其中单个路由模块时不会连带导入其他路由
+"""
+import importlib
+
+# 蓝图名称 -> 所在模块
+_BLUEPRINT_MODULES = {
+    'strategy_bp': '.strategy_routes',
+    'stock_bp': '.stock_routes',
+    'system_bp': '.system_routes',
+    'data_bp': '.data_routes',
+    'auth_bp': '.auth_routes'
+}
+
+__all__ = list(_BLUEPRINT_MODULES)
+
+
+def __getattr__(name):
+    """按需导入蓝图"""
+    module_name = _BLUEPRINT_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    blueprint = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = blueprint
+    return blueprint
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -23,6 +23,7 @@ def list_stocks():
         keyword: 搜索关键词（股票代码或名称）
         limit: 返回记录数（默认100）
         offset: 偏移量（默认0）
+        fields: 只返回指定字段，多个用逗号分隔（可选）
         
     Returns:
         股票列表
@@ -32,6 +33,7 @@ def list_stocks():
         keyword = request.args.get('keyword')
         limit = int(request.args.get('limit', 100))
         offset = int(request.args.get('offset', 0))
+        fields = request.args.get('fields')
         
         stock_service = get_stock_service()
         stocks = stock_service.list_stocks(
@@ -43,6 +45,11 @@ def list_stocks():
         
         total = stock_service.count_stocks(market=market, keyword=keyword)
         
+        # 按需裁剪字段，减小响应体积
+        if fields:
+            keys = [f.strip() for f in fields.split(',') if f.strip()]
+            stocks = [{k: stock[k] for k in keys if k in stock} for stock in stocks]
+        
         return jsonify({
             'success': True,
             'data': stocks,
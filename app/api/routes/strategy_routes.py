@@ -32,12 +32,16 @@ def list_strategies():
     
     Query参数:
         enabled_only: 是否只返回启用的策略（true/false）
+        limit: 返回记录数（可选，默认返回全部）
+        offset: 偏移量（默认0）
         
     Returns:
         策略列表和统计信息
     """
     try:
         enabled_only = request.args.get('enabled_only', 'false').lower() == 'true'
+        limit = request.args.get('limit', type=int)
+        offset = request.args.get('offset', 0, type=int)
         
         # 获取当前用户
         user = getattr(g, 'user', None)
@@ -50,17 +54,23 @@ def list_strategies():
             # 如果是管理员，默认查看所有，也可以通过参数筛选特定用户（暂未实现参数筛选）
         
         strategy_service = get_strategy_service()
-        strategies = strategy_service.list_strategies(enabled_only=enabled_only, user_id=user_id)
+        strategies = strategy_service.list_strategies(
+            enabled_only=enabled_only, user_id=user_id, limit=limit, offset=offset
+        )
         
         # 计算统计信息
-        if enabled_only:
-            # 如果只查询启用的策略，需要重新获取所有策略来统计
-            all_strategies = strategy_service.list_strategies(enabled_only=False, user_id=user_id)
+        if enabled_only or limit:
+            # 如果只查询启用的策略或分页查询，需要遍历所有策略来统计
+            all_strategies = strategy_service.iter_strategies(enabled_only=False, user_id=user_id)
         else:
             all_strategies = strategies
         
-        total = len(all_strategies)
-        enabled = sum(1 for s in all_strategies if s.get('enabled'))
+        total = 0
+        enabled = 0
+        for s in all_strategies:
+            total += 1
+            if s.get('enabled'):
+                enabled += 1
         disabled = total - enabled
         
         return jsonify({
@@ -508,6 +518,92 @@ def get_strategy_results(strategy_id):
         }), 500
 
 
+@strategy_bp.route('/<int:strategy_id>/result-batches', methods=['GET'])
+def get_strategy_result_batches(strategy_id):
+    """
+    按执行批次获取策略执行结果
+    
+    Args:
+        strategy_id: 策略ID
+        
+    Query参数:
+        limit: 返回批次数（默认20）
+        offset: 偏移量（默认0）
+        
+    Returns:
+        执行批次列表，每个批次包含批次ID、执行时间和匹配股票数
+    """
+    try:
+        limit = int(request.args.get('limit', 20))
+        offset = int(request.args.get('offset', 0))
+        
+        strategy_executor = get_strategy_executor()
+        batches = strategy_executor.get_strategy_result_batches(
+            strategy_id=strategy_id,
+            limit=limit,
+            offset=offset
+        )
+        
+        total = strategy_executor.get_strategy_result_batches_count(strategy_id)
+        
+        return jsonify({
+            'success': True,
+            'data': batches,
+            'pagination': {
+                'total': total,
+                'limit': limit,
+                'offset': offset,
+                'has_more': offset + len(batches) < total
+            }
+        })
+        
+    except Exception as e:
+        logger.error(f"获取策略执行批次失败: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@strategy_bp.route('/<int:strategy_id>/result-batches/<int:batch_id>/stocks', methods=['GET'])
+def get_strategy_result_batch_stocks(strategy_id, batch_id):
+    """
+    获取一个执行批次匹配的股票
+    
+    Args:
+        strategy_id: 策略ID
+        batch_id: 批次ID
+        
+    Query参数:
+        limit: 最多返回的股票数（默认500）
+        
+    Returns:
+        股票列表
+    """
+    try:
+        limit = int(request.args.get('limit', 500))
+        
+        strategy_executor = get_strategy_executor()
+        stocks = strategy_executor.get_strategy_result_batch_stocks(
+            strategy_id=strategy_id,
+            batch_id=batch_id,
+            limit=limit
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': stocks,
+            'limit': limit
+        })
+        
+    except Exception as e:
+        logger.error(f"获取执行批次股票失败: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @strategy_bp.route('/<int:strategy_id>/enable', methods=['POST'])
 def enable_strategy(strategy_id):
     """
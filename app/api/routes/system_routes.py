@@ -151,7 +151,13 @@ def get_system_logs():
                 r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - ([^ ]+) - (\w+) - (.+)'
             )
             
+            # 按级别过滤时先做子串预筛，其他级别的行无需执行正则匹配
+            level_marker = f' - {level_filter} - ' if level_filter else None
+            
             for line in reversed(lines):  # 从最新的开始
+                if level_marker and level_marker not in line:
+                    continue
+                
                 line = line.strip()
                 if not line:
                     continue
@@ -210,6 +216,7 @@ def get_scheduler_logs():
     Query参数:
         limit: 返回记录数（默认100）
         offset: 偏移量（默认0）
+        job_type: 任务类型，多个用逗号分隔（可选）
         
     Returns:
         任务日志列表
@@ -217,6 +224,8 @@ def get_scheduler_logs():
     try:
         limit = int(request.args.get('limit', 100))
         offset = int(request.args.get('offset', 0))
+        job_type = request.args.get('job_type')
+        job_types = [t.strip() for t in job_type.split(',') if t.strip()] if job_type else None
         
         # 获取当前用户
         user = getattr(g, 'user', None)
@@ -225,8 +234,8 @@ def get_scheduler_logs():
             user_id = user.get('user_id')
         
         scheduler = get_task_scheduler()
-        logs = scheduler.get_job_logs(limit=limit, offset=offset, user_id=user_id)
-        total = scheduler.get_job_logs_count(user_id=user_id)
+        logs = scheduler.get_job_logs(limit=limit, offset=offset, user_id=user_id, job_types=job_types)
+        total = scheduler.get_job_logs_count(user_id=user_id, job_types=job_types)
         
         return jsonify({
             'success': True,
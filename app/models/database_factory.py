@@ -24,11 +24,21 @@ class DatabaseAdapter(ABC):
         """执行更新语句"""
         pass
     
+    @abstractmethod
+    def execute_insert(self, query: str, params: tuple = None) -> int:
+        """执行插入语句并返回自增ID"""
+        pass
+    
     @abstractmethod
     def execute_many(self, query: str, params_list: list) -> int:
         """批量执行更新语句"""
         pass
     
+    @abstractmethod
+    def execute_transaction(self, operations: list) -> int:
+        """在同一个事务中执行多条更新语句"""
+        pass
+    
     @abstractmethod
     def insert_one(self, table: str, data: dict) -> int:
         """插入单条记录"""
@@ -153,6 +163,23 @@ def get_database(db_type: str = None, config: dict = None, use_orm: bool = True)
     return _db_factory.get_database(db_type, config, use_orm)
 
 
+def reset_connection_pools_after_fork():
+    """
+    重建已创建的数据库连接池（Gunicorn preload_app 模式下在 post_fork 中调用）
+    
+    master 进程加载应用时建立的连接会被所有工作进程继承，
+    每个工作进程需要丢弃这些连接，改用自己的连接池
+    """
+    from app.models import mysql_db
+    
+    adapter = _db_factory._db_adapter if _db_factory is not None else None
+    if adapter is not None:
+        adapter.reset_pool_after_fork()
+    
+    if mysql_db._db_instance is not None and mysql_db._db_instance is not adapter:
+        mysql_db._db_instance.reset_pool_after_fork()
+
+
 def switch_database(db_type: str, config: dict = None):
     """
     切换数据库类型
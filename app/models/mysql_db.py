@@ -232,7 +232,8 @@ class MySQLDB:
                     error TEXT,
                     INDEX idx_job_type (job_type),
                     INDEX idx_status (status),
-                    INDEX idx_started_at (started_at)
+                    INDEX idx_started_at (started_at),
+                    INDEX idx_job_logs_type_started (job_type, started_at)
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
             ''')
             
@@ -327,6 +328,37 @@ class MySQLDB:
             logger.error(f"更新执行失败: {query[:100]}... 错误: {e}", exc_info=True)
             raise
     
+    def execute_insert(self, query: str, params: tuple = None) -> int:
+        """
+        执行插入语句并返回自增ID
+        
+        Args:
+            query: SQL插入语句
+            params: 插入参数
+            
+        Returns:
+            插入记录的ID
+        """
+        import time
+        start_time = time.time()
+        
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                
+                # 记录操作日志
+                execution_time = time.time() - start_time
+                self._log_operation(query, params, execution_time, cursor.rowcount)
+                
+                return cursor.lastrowid
+        except Exception as e:
+            logger.error(f"插入执行失败: {query[:100]}... 错误: {e}", exc_info=True)
+            raise
+    
     def execute_many(self, query: str, params_list: List[tuple]) -> int:
         """
         批量执行更新语句
@@ -356,6 +388,39 @@ class MySQLDB:
             logger.error(f"批量操作失败: {query[:100]}... 错误: {e}", exc_info=True)
             raise
     
+    def execute_transaction(self, operations: List[tuple]) -> int:
+        """
+        在同一个事务中依次执行多条更新语句，任一失败则整体回滚
+        
+        Args:
+            operations: (SQL更新语句, 参数) 元组列表
+            
+        Returns:
+            影响的总行数
+        """
+        import time
+        start_time = time.time()
+        
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                affected_rows = 0
+                for query, params in operations:
+                    if params:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
+                    affected_rows += cursor.rowcount
+                
+                # 记录操作日志
+                execution_time = time.time() - start_time
+                logger.debug(f"事务操作: 语句数={len(operations)}, 影响行数={affected_rows}, 耗时={execution_time:.3f}s")
+                
+                return affected_rows
+        except Exception as e:
+            logger.error(f"事务执行失败: {e}", exc_info=True)
+            raise
+    
     def insert_one(self, table: str, data: Dict[str, Any]) -> int:
         """
         插入单条记录
@@ -426,6 +491,15 @@ class MySQLDB:
             f"SQL:{query[:100]}{'...' if len(query) > 100 else ''}"
         )
     
+    def reset_pool_after_fork(self):
+        """
+        fork 后重建连接池
+        
+        继承的连接与父进程共用套接字，旧连接池保留引用不再使用，避免被回收时关闭父进程的连接
+        """
+        self._inherited_pool = self.pool
+        self._init_pool()
+    
     def get_connection_pool_size(self) -> int:
         """获取当前连接池大小"""
         return self.pool._maxconnections
@@ -101,6 +101,19 @@ class ORMDBAdapter:
         """
         return self.orm_db.execute_update(query, params)
     
+    def execute_insert(self, query: str, params: tuple = None) -> int:
+        """
+        执行插入语句并返回自增ID
+        
+        Args:
+            query: SQL插入语句
+            params: 插入参数
+            
+        Returns:
+            插入记录的ID
+        """
+        return self.orm_db.execute_insert(query, params)
+    
     def execute_many(self, query: str, params_list: list) -> int:
         """
         批量执行更新语句
@@ -114,6 +127,18 @@ class ORMDBAdapter:
         """
         return self.orm_db.execute_many(query, params_list)
     
+    def execute_transaction(self, operations: list) -> int:
+        """
+        在同一个事务中执行多条更新语句
+        
+        Args:
+            operations: (SQL更新语句, 参数) 元组列表
+            
+        Returns:
+            影响的总行数
+        """
+        return self.orm_db.execute_transaction(operations)
+    
     def insert_one(self, table: str, data: Dict[str, Any]) -> int:
         """
         插入单条记录
@@ -164,6 +189,36 @@ class ORMDBAdapter:
         """
         return self.orm_db.get_session()
     
+    def warm_up_pool(self) -> int:
+        """
+        预热连接池：同时借出 pool_size 个连接并各执行一次 SELECT 1，随后全部归还
+        
+        归还后的连接已完成TCP握手和认证，首批请求无需再建立连接
+        
+        Returns:
+            int: 预热的连接数
+        """
+        engine = self.orm_db.engine
+        connections = []
+        try:
+            for _ in range(engine.pool.size()):
+                conn = engine.connect()
+                connections.append(conn)
+                conn.exec_driver_sql("SELECT 1")
+        finally:
+            for conn in connections:
+                conn.close()
+        return len(connections)
+    
+    def reset_pool_after_fork(self):
+        """
+        fork 后丢弃从父进程继承的连接池
+        
+        继承的连接与父进程共用套接字，不关闭也不再使用，之后按需建立新连接
+        """
+        if self.orm_db:
+            self.orm_db.engine.dispose(close=False)
+    
     def close(self):
         """关闭数据库连接"""
         if self.orm_db:
@@ -167,6 +167,7 @@ class JobLog(Base):
         Index('idx_status', 'status'),
         Index('idx_started_at', 'started_at'),
         Index('idx_job_logs_user_id', 'user_id'),
+        Index('idx_job_logs_type_started', 'job_type', 'started_at'),
     )
 
 
@@ -241,6 +242,7 @@ class ORMDatabase:
             max_overflow = pool_config.get('max_overflow', 20)
             pool_timeout = pool_config.get('timeout', 30)
             pool_recycle = pool_config.get('recycle', 3600)
+            max_pool_size = pool_config.get('max_size', pool_size)
             
             logger.info(f"使用连接池配置: size={pool_size}, max_overflow={max_overflow}, timeout={pool_timeout}, recycle={pool_recycle}")
         except Exception as e:
@@ -249,10 +251,13 @@ class ORMDatabase:
             max_overflow = 20
             pool_timeout = 30
             pool_recycle = 3600
+            max_pool_size = pool_size
         
-        # 创建引擎
+        # 创建引擎（安装了 prometheus_client 时使用记录监控指标的连接池）
+        from app.models.pool_metrics import get_pool_class
         self.engine = create_engine(
             db_url,
+            poolclass=get_pool_class(),
             echo=False,  # 不输出SQL日志
             pool_pre_ping=True,  # 连接前检测，自动回收无效连接
             pool_recycle=pool_recycle,  # 连接回收时间（秒）
@@ -266,6 +271,13 @@ class ORMDatabase:
             }
         )
         
+        # 配置了 pool.max_size 时按负载在 pool.size ~ pool.max_size 之间动态调整连接池大小
+        self.pool_resizer = None
+        if max_pool_size > pool_size:
+            from app.models.pool_resizer import PoolResizer
+            self.pool_resizer = PoolResizer(self.engine, pool_size, max_pool_size)
+            self.pool_resizer.start()
+        
         # 创建会话工厂
         self.Session = sessionmaker(bind=self.engine)
         
@@ -445,6 +457,48 @@ class ORMDatabase:
         
         return _execute()
     
+    def execute_insert(self, query: str, params: tuple = None) -> int:
+        """
+        执行原生SQL插入语句，直接返回自增ID
+        支持自动重试机制
+        
+        Args:
+            query: SQL插入语句
+            params: 插入参数
+            
+        Returns:
+            插入记录的ID
+        """
+        from sqlalchemy import text
+        from app.utils.db_retry import retry_db_operation
+        
+        @retry_db_operation(max_retries=3, retry_delay=0.5)
+        def _execute():
+            session = self.get_session()
+            try:
+                if params:
+                    param_names = [f'p{i+1}' for i in range(len(params))]
+                    query_text = query
+                    
+                    # 检测使用哪种占位符
+                    placeholder = '%s' if '%s' in query else '?'
+                    for param_name in param_names:
+                        query_text = query_text.replace(placeholder, f':{param_name}', 1)
+                    
+                    param_dict = {param_names[i]: params[i] for i in range(len(params))}
+                    result = session.execute(text(query_text), param_dict)
+                else:
+                    result = session.execute(text(query))
+                session.commit()
+                return result.lastrowid
+            except Exception as e:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+        
+        return _execute()
+    
     def execute_many(self, query: str, params_list: list) -> int:
         """
         批量执行更新语句
@@ -496,6 +550,50 @@ class ORMDatabase:
         
         return _execute()
     
+    def execute_transaction(self, operations: list) -> int:
+        """
+        在同一个事务中依次执行多条更新语句
+        任一语句失败则整体回滚，支持自动重试机制
+        
+        Args:
+            operations: (SQL更新语句, 参数) 元组列表
+            
+        Returns:
+            影响的总行数
+        """
+        from sqlalchemy import text
+        from app.utils.db_retry import retry_db_operation
+        
+        @retry_db_operation(max_retries=3, retry_delay=0.5)
+        def _execute():
+            session = self.get_session()
+            try:
+                affected_rows = 0
+                for query, params in operations:
+                    if params:
+                        param_names = [f'p{i+1}' for i in range(len(params))]
+                        query_text = query
+                        
+                        # 检测使用哪种占位符
+                        placeholder = '%s' if '%s' in query else '?'
+                        for param_name in param_names:
+                            query_text = query_text.replace(placeholder, f':{param_name}', 1)
+                        
+                        param_dict = {param_names[i]: params[i] for i in range(len(params))}
+                        result = session.execute(text(query_text), param_dict)
+                    else:
+                        result = session.execute(text(query))
+                    affected_rows += result.rowcount
+                session.commit()
+                return affected_rows
+            except Exception as e:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+        
+        return _execute()
+    
     def insert_one(self, table: str, data: dict) -> int:
         """
         插入单条记录（使用ORM）
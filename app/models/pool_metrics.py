@@ -0,0 +1,119 @@
+"""
+数据库连接池监控指标
+安装了 prometheus_client 时记录连接池的借出连接数、溢出连接数、获取连接耗时和连接借出时长，
+由API应用的 /metrics 接口导出
+
+Gunicorn 多进程部署时需要设置环境变量 PROMETHEUS_MULTIPROC_DIR（指向一个空目录），
+/metrics 接口会汇总所有工作进程的指标
+"""
+import os
+import time
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Gauge, Histogram, generate_latest
+    )
+    from prometheus_client import multiprocess
+except ImportError:
+    Gauge = None
+
+
+if Gauge is not None:
+    POOL_CHECKED_OUT = Gauge(
+        'db_pool_checkedout', '已借出的数据库连接数', multiprocess_mode='livesum'
+    )
+    POOL_SIZE = Gauge(
+        'db_pool_size_current', '当前的 pool_size（启用动态扩缩容时会变化）', multiprocess_mode='livesum'
+    )
+    POOL_OVERFLOW = Gauge(
+        'db_pool_overflow', '超出 pool_size 的溢出连接数', multiprocess_mode='livesum'
+    )
+    POOL_ACQUIRE_SECONDS = Histogram(
+        'db_pool_acquire_seconds', '从连接池获取连接的耗时（秒）',
+        buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+    )
+    POOL_LEASE_SECONDS = Histogram(
+        'db_pool_lease_seconds', '连接从借出到归还的时长（秒）',
+        buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30, 120)
+    )
+
+
+class MeteredQueuePool(QueuePool):
+    """记录监控指标的连接池（engine.dispose() 重建连接池时沿用同一个类）"""
+    
+    def _do_get(self):
+        """获取连接，记录获取耗时"""
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_ACQUIRE_SECONDS.observe(time.perf_counter() - start)
+            self._update_gauges()
+    
+    def _do_return_conn(self, record):
+        """归还连接"""
+        super()._do_return_conn(record)
+        self._update_gauges()
+    
+    def _update_gauges(self):
+        """更新连接池大小、借出连接数和溢出连接数"""
+        POOL_SIZE.set(self.size())
+        POOL_CHECKED_OUT.set(self.checkedout())
+        POOL_OVERFLOW.set(max(self.overflow(), 0))
+
+
+@event.listens_for(MeteredQueuePool, 'checkout')
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    """记录连接借出时间"""
+    connection_record.info['checkout_time'] = time.perf_counter()
+
+
+@event.listens_for(MeteredQueuePool, 'checkin')
+def _on_checkin(dbapi_connection, connection_record):
+    """连接归还时记录借出时长"""
+    checkout_time = connection_record.info.pop('checkout_time', None)
+    if checkout_time is not None:
+        POOL_LEASE_SECONDS.observe(time.perf_counter() - checkout_time)
+
+
+def metrics_enabled() -> bool:
+    """是否安装了 prometheus_client"""
+    return Gauge is not None
+
+
+def get_pool_class():
+    """
+    获取创建引擎使用的连接池类
+    
+    Returns:
+        安装了 prometheus_client 时返回 MeteredQueuePool，否则返回 QueuePool
+    """
+    return MeteredQueuePool if Gauge is not None else QueuePool
+
+
+def generate_metrics():
+    """
+    生成Prometheus文本格式的指标
+    
+    Returns:
+        Tuple[bytes, str]: 指标内容和Content-Type
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int):
+    """
+    清理已退出工作进程的指标文件（多进程模式下在 Gunicorn child_exit 钩子中调用）
+    
+    Args:
+        pid: 工作进程ID
+    """
+    if Gauge is not None and os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,136 @@
+"""
+数据库连接池动态扩缩容
+连接池持续出现溢出连接时逐步扩大 pool_size（不超过 pool.max_size），
+长时间空闲后再逐步缩回配置的 pool.size
+"""
+import os
+import threading
+import time
+from sqlalchemy.util import queue as sqla_queue
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def resize_queue_pool(pool, new_size: int):
+    """
+    调整 QueuePool 的 pool_size
+    
+    QueuePool 用 overflow = 连接总数 - pool_size 计算溢出连接数，调整队列容量时需要同步调整 overflow；
+    缩小时关闭队列中超出新容量的空闲连接，已借出的连接归还时按新容量处理
+    
+    Args:
+        pool: sqlalchemy.pool.QueuePool
+        new_size: 新的 pool_size
+    """
+    with pool._overflow_lock:
+        with pool._pool.mutex:
+            delta = new_size - pool._pool.maxsize
+            pool._pool.maxsize = new_size
+        pool._overflow -= delta
+    
+    while pool._pool.qsize() > new_size:
+        try:
+            record = pool._pool.get(False)
+        except sqla_queue.Empty:
+            break
+        record.close()
+        pool._dec_overflow()
+
+
+class PoolResizer:
+    """连接池扩缩容后台线程"""
+    
+    def __init__(self, engine, min_size: int, max_size: int, step: int = 5,
+                 interval: float = 5, grow_after: int = 3, shrink_after: float = 60,
+                 idle_ratio: float = 0.3):
+        """
+        初始化扩缩容线程
+        
+        Args:
+            engine: SQLAlchemy引擎
+            min_size: 最小 pool_size（配置的 pool.size）
+            max_size: 最大 pool_size（配置的 pool.max_size）
+            step: 每次扩大或缩小的连接数
+            interval: 检查间隔（秒）
+            grow_after: 连续多少次检查出现溢出连接后扩大
+            shrink_after: 借出连接数持续低于 idle_ratio * pool_size 多少秒后缩小
+            idle_ratio: 判断空闲的借出比例
+        """
+        self.engine = engine
+        self.min_size = min_size
+        self.max_size = max_size
+        self.step = step
+        self.interval = interval
+        self.grow_after = grow_after
+        self.shrink_after = shrink_after
+        self.idle_ratio = idle_ratio
+        
+        self._overflow_checks = 0
+        self._idle_since = None
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._fork_hook_registered = False
+    
+    def start(self):
+        """启动后台线程"""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='db-pool-resizer', daemon=True)
+        self._thread.start()
+        
+        # fork 后子进程中没有该线程，需要重新启动
+        if not self._fork_hook_registered and hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._restart_after_fork)
+            self._fork_hook_registered = True
+        
+        logger.info(f"连接池动态扩缩容已启动: pool_size {self.min_size} ~ {self.max_size}")
+    
+    def stop(self):
+        """停止后台线程"""
+        self._stop_event.set()
+    
+    def _restart_after_fork(self):
+        """fork后在子进程中重新启动"""
+        if self._thread is None or self._stop_event.is_set():
+            return
+        self._overflow_checks = 0
+        self._idle_since = None
+        self._stop_event = threading.Event()
+        self.start()
+    
+    def _run(self):
+        """定时检查连接池状态"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"连接池扩缩容检查失败: {e}")
+    
+    def check(self):
+        """检查一次连接池状态，必要时扩大或缩小"""
+        pool = self.engine.pool
+        size = pool.size()
+        
+        if pool.overflow() > 0:
+            self._idle_since = None
+            self._overflow_checks += 1
+            if self._overflow_checks >= self.grow_after and size < self.max_size:
+                new_size = min(size + self.step, self.max_size)
+                resize_queue_pool(pool, new_size)
+                logger.info(f"连接池持续出现溢出连接，pool_size 扩大: {size} -> {new_size}")
+                self._overflow_checks = 0
+            return
+        
+        self._overflow_checks = 0
+        if size <= self.min_size or pool.checkedout() >= self.idle_ratio * size:
+            self._idle_since = None
+            return
+        
+        now = time.monotonic()
+        if self._idle_since is None:
+            self._idle_since = now
+        elif now - self._idle_since >= self.shrink_after:
+            new_size = max(size - self.step, self.min_size)
+            resize_queue_pool(pool, new_size)
+            logger.info(f"连接池空闲，pool_size 缩小: {size} -> {new_size}")
+            self._idle_since = now
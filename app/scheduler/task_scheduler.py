@@ -101,6 +101,11 @@ class TaskScheduler:
                 self.db.execute_update(
                     "CREATE INDEX idx_job_logs_status ON job_logs(status)"
                 )
+            # 按任务类型筛选并按开始时间倒序分页（如策略执行记录）
+            if 'idx_job_logs_type_started' not in index_names:
+                self.db.execute_update(
+                    "CREATE INDEX idx_job_logs_type_started ON job_logs(job_type, started_at)"
+                )
             
             logger.info("任务日志数据库表初始化完成")
             
@@ -822,7 +827,8 @@ class TaskScheduler:
         else:
             logger.debug(f"任务执行完成: {event.job_id}")
     
-    def get_job_logs(self, limit: int = 100, offset: int = 0, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_job_logs(self, limit: int = 100, offset: int = 0, user_id: Optional[int] = None,
+                     job_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         获取任务执行日志
         
@@ -830,6 +836,7 @@ class TaskScheduler:
             limit: 返回记录数
             offset: 偏移量
             user_id: 用户ID（可选，用于过滤）
+            job_types: 任务类型列表（可选，用于过滤）
             
         Returns:
             日志列表
@@ -843,11 +850,19 @@ class TaskScheduler:
                 FROM job_logs jl
                 LEFT JOIN users u ON jl.user_id = u.id
             """
+            conditions = []
             params = []
             
             if user_id is not None:
-                sql += " WHERE jl.user_id = %s"
+                conditions.append("jl.user_id = %s")
                 params.append(user_id)
+            
+            if job_types:
+                conditions.append(f"jl.job_type IN ({', '.join(['%s'] * len(job_types))})")
+                params.extend(job_types)
+            
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
 
             sql += " ORDER BY jl.started_at DESC LIMIT %s OFFSET %s"
             params.extend([limit, offset])
@@ -860,6 +875,12 @@ class TaskScheduler:
                     log['started_at'] = log['started_at'].strftime('%Y-%m-%d %H:%M:%S')
                 if log.get('completed_at') and isinstance(log['completed_at'], datetime):
                     log['completed_at'] = log['completed_at'].strftime('%Y-%m-%d %H:%M:%S')
+                # 统一执行时长为浮点数
+                if log.get('duration') is not None:
+                    try:
+                        log['duration'] = float(log['duration'])
+                    except (ValueError, TypeError):
+                        log['duration'] = None
             
             return logs
             
@@ -867,23 +888,33 @@ class TaskScheduler:
             logger.error(f"获取任务日志失败: {e}")
             return []
     
-    def get_job_logs_count(self, user_id: Optional[int] = None) -> int:
+    def get_job_logs_count(self, user_id: Optional[int] = None,
+                           job_types: Optional[List[str]] = None) -> int:
         """
         获取任务日志数量
         
         Args:
             user_id: 用户ID（可选）
+            job_types: 任务类型列表（可选）
             
         Returns:
             日志数量
         """
         try:
             sql = "SELECT COUNT(*) as count FROM job_logs"
+            conditions = []
             params = []
             
             if user_id is not None:
-                sql += " WHERE user_id = %s"
+                conditions.append("user_id = %s")
                 params.append(user_id)
+            
+            if job_types:
+                conditions.append(f"job_type IN ({', '.join(['%s'] * len(job_types))})")
+                params.extend(job_types)
+            
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
 
             result = self.db.execute_query(sql, tuple(params))
             
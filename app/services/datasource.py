@@ -3,6 +3,7 @@
 定义统一的数据源接口，支持akshare和tushare
 """
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 import pandas as pd
 
@@ -87,9 +88,15 @@ class DataSource(ABC):
         Returns:
             标准化后的股票代码
         """
-        # 移除可能的前缀和后缀
-        code = code.strip().upper()
-        # 只保留数字部分
-        if '.' in code:
-            code = code.split('.')[0]
-        return code
+        return _normalize_stock_code(code)
+
+
+@lru_cache(maxsize=8192)
+def _normalize_stock_code(code: str) -> str:
+    """标准化股票代码（带缓存，同一代码重复调用时直接命中）"""
+    # 移除可能的前缀和后缀
+    code = code.strip().upper()
+    # 只保留数字部分
+    if '.' in code:
+        code = code.split('.')[0]
+    return code
@@ -101,17 +101,16 @@ class StockDateRangeService:
             
             self.logger.debug(f"股票{stock_code}日期范围计算结果: new_earliest={new_earliest} (type: {type(new_earliest)}), new_latest={new_latest} (type: {type(new_latest)})")
             
+            # 日期直接作为参数绑定，由数据库驱动转换，无需先格式化为字符串
             if new_earliest is not None:
                 updates.append("earliest_data_date = %s")
-                earliest_str = new_earliest.strftime('%Y-%m-%d') if isinstance(new_earliest, (date, datetime)) else str(new_earliest)
-                params.append(earliest_str)
-                self.logger.debug(f"添加earliest_data_date更新: {earliest_str}")
+                params.append(new_earliest)
+                self.logger.debug(f"添加earliest_data_date更新: {new_earliest}")
             
             if new_latest is not None:
                 updates.append("latest_data_date = %s")
-                latest_str = new_latest.strftime('%Y-%m-%d') if isinstance(new_latest, (date, datetime)) else str(new_latest)
-                params.append(latest_str)
-                self.logger.debug(f"添加latest_data_date更新: {latest_str}")
+                params.append(new_latest)
+                self.logger.debug(f"添加latest_data_date更新: {new_latest}")
             
             if not updates:
                 # 没有需要更新的字段
@@ -119,7 +118,7 @@ class StockDateRangeService:
                 return True
             
             updates.append("updated_at = %s")
-            params.append(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            params.append(datetime.now())
             params.append(stock_code)
             
             query = f"UPDATE stocks SET {', '.join(updates)} WHERE code = %s"
@@ -495,14 +494,12 @@ class StockDateRangeService:
                 stock_codes.append(stock_code)
                 
                 if earliest_date is not None:
-                    earliest_str = earliest_date.strftime('%Y-%m-%d') if isinstance(earliest_date, (date, datetime)) else str(earliest_date)
                     cases_earliest.append(f"WHEN %s THEN %s")
-                    params_earliest.extend([stock_code, earliest_str])
+                    params_earliest.extend([stock_code, earliest_date])
                 
                 if latest_date is not None:
-                    latest_str = latest_date.strftime('%Y-%m-%d') if isinstance(latest_date, (date, datetime)) else str(latest_date)
                     cases_latest.append(f"WHEN %s THEN %s")
-                    params_latest.extend([stock_code, latest_str])
+                    params_latest.extend([stock_code, latest_date])
             
             # 如果没有需要更新的字段，直接返回成功
             if not cases_earliest and not cases_latest:
@@ -525,7 +522,7 @@ class StockDateRangeService:
             
             # 添加 updated_at 字段更新
             set_clauses.append(f"updated_at = %s")
-            params.append(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            params.append(datetime.now())
             
             # 添加 WHERE 子句参数
             placeholders = ','.join(['%s'] * len(stock_codes))
@@ -551,6 +548,46 @@ class StockDateRangeService:
             self.logger.error(f"执行批量更新失败: {e}", exc_info=True)
             return False
     
+    def fill_null_date_ranges_from_daily_market(self, partial_only: bool = False) -> Optional[int]:
+        """
+        在数据库中用一条 UPDATE JOIN 语句补全日期字段为 NULL 的股票
+        
+        日期范围由 daily_market 按主键 (code, trade_date) 分组求 MIN/MAX 得到，
+        已有的日期字段保持不变，daily_market 中没有数据的股票不会被更新
+        
+        Args:
+            partial_only: 为 True 时只处理只有一个日期字段为 NULL 的股票，
+                          否则只处理两个日期字段都为 NULL 的股票
+            
+        Returns:
+            Optional[int]: 更新的股票数量，执行失败时返回 None（可改用逐批查询后更新）
+        """
+        if partial_only:
+            condition = "(s.earliest_data_date IS NULL) <> (s.latest_data_date IS NULL)"
+        else:
+            condition = "s.earliest_data_date IS NULL AND s.latest_data_date IS NULL"
+        
+        try:
+            query = f"""
+                UPDATE stocks s
+                JOIN (
+                    SELECT code, MIN(trade_date) AS min_date, MAX(trade_date) AS max_date
+                    FROM daily_market
+                    GROUP BY code
+                ) d ON d.code = s.code
+                SET s.earliest_data_date = COALESCE(s.earliest_data_date, d.min_date),
+                    s.latest_data_date = COALESCE(s.latest_data_date, d.max_date),
+                    s.updated_at = %s
+                WHERE {condition}
+            """
+            affected_rows = self.db.execute_update(query, (datetime.now(),))
+            self.logger.info(f"UPDATE JOIN 补全股票日期字段完成，更新: {affected_rows} 只股票")
+            return affected_rows
+        
+        except Exception as e:
+            self.logger.error(f"UPDATE JOIN 补全股票日期字段失败: {e}", exc_info=True)
+            return None
+    
     def get_stocks_with_null_date_range(self) -> list:
         """
         获取日期字段为 NULL 的股票列表
@@ -4,6 +4,7 @@
 负责执行策略，扫描股票，查找符合条件的股票
 """
 
+import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Any, Tuple
 import pandas as pd
@@ -15,6 +16,32 @@ from app.utils import get_logger, get_stock_limit_for_mode
 
 logger = get_logger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _parse_observation_result(text: str) -> Any:
+    """
+    解析保存的 observation_result JSON
+    
+    安装了 orjson 时优先使用 orjson 解析；json.dumps 可能写入 NaN，
+    orjson 不支持该写法，此时回退到标准库 json
+    
+    Args:
+        text: JSON字符串
+        
+    Returns:
+        解析后的观察结果
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
 
 class StrategyExecutor:
     """策略执行引擎"""
@@ -442,10 +469,11 @@ class StrategyExecutor:
                 INSERT INTO strategy_results
                 (strategy_id, stock_code, stock_name, trigger_date,
                  trigger_pct_change, observation_days, ma_period,
-                 observation_result, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                 observation_result, executed_at, created_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
             
+            # 同一批次的结果使用相同的执行时间，按 executed_at 分组即可还原执行批次
             now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             saved_count = 0
             
@@ -476,6 +504,7 @@ class StrategyExecutor:
                         int(match['observation_days']),
                         int(match['ma_period']),
                         json.dumps(observation_result, ensure_ascii=False),
+                        now,
                         now
                     )
                 )
@@ -518,9 +547,8 @@ class StrategyExecutor:
             )
             
             # 解析observation_result JSON
-            import json
             for result in results:
-                result['observation_result'] = json.loads(result['observation_result'])
+                result['observation_result'] = _parse_observation_result(result['observation_result'])
             
             return results
             
@@ -528,6 +556,108 @@ class StrategyExecutor:
             logger.error(f"获取策略结果失败: {e}")
             return []
     
+    def get_strategy_result_batches(self, strategy_id: int,
+                                    limit: int = 20,
+                                    offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        按执行批次获取策略执行结果摘要
+        
+        同一次执行保存的结果使用同一个 executed_at（见 _save_results），
+        分组统计在数据库中完成；批次的股票列表通过 get_strategy_result_batch_stocks 按需获取
+        
+        Args:
+            strategy_id: 策略ID
+            limit: 返回批次数
+            offset: 跳过的批次数
+            
+        Returns:
+            批次列表（按执行时间倒序），每项包含 id、executed_at、stock_count
+        """
+        try:
+            return self.db.execute_query(
+                """
+                    SELECT MIN(id) AS id, executed_at, COUNT(*) AS stock_count
+                    FROM strategy_results
+                    WHERE strategy_id = %s
+                    GROUP BY executed_at
+                    ORDER BY executed_at DESC
+                    LIMIT %s OFFSET %s
+                """,
+                (strategy_id, limit, offset)
+            )
+            
+        except Exception as e:
+            logger.error(f"获取策略执行批次失败: {e}")
+            return []
+    
+    def get_strategy_result_batch_stocks(self, strategy_id: int, batch_id: int,
+                                         limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        获取一个执行批次匹配的股票
+        
+        只查询详情页展示的列，观察结果只保留首日的均线值（ma_value）
+        
+        Args:
+            strategy_id: 策略ID
+            batch_id: 批次ID（批次中最小的结果ID）
+            limit: 最多返回的股票数
+            
+        Returns:
+            股票列表（按触发日期倒序），每项包含 stock_code、stock_name、trigger_date、
+            trigger_pct_change、ma_period、ma_value
+        """
+        try:
+            rows = self.db.execute_query(
+                """
+                    SELECT r.stock_code, r.stock_name, r.trigger_date, r.trigger_pct_change,
+                           r.ma_period, r.observation_result
+                    FROM strategy_results r
+                    JOIN (
+                        SELECT executed_at FROM strategy_results WHERE id = %s AND strategy_id = %s
+                    ) b ON r.executed_at = b.executed_at
+                    WHERE r.strategy_id = %s
+                    ORDER BY r.trigger_date DESC, r.stock_code
+                    LIMIT %s
+                """,
+                (batch_id, strategy_id, strategy_id, limit)
+            )
+            
+            for row in rows:
+                observation_result = _parse_observation_result(row.pop('observation_result'))
+                details = observation_result.get('details') if isinstance(observation_result, dict) else None
+                row['ma_value'] = details[0].get(f"ma{row['ma_period']}") if details else None
+            
+            return rows
+            
+        except Exception as e:
+            logger.error(f"获取执行批次股票失败: {e}")
+            return []
+    
+    def get_strategy_result_batches_count(self, strategy_id: int) -> int:
+        """
+        获取策略执行批次数量
+        
+        Args:
+            strategy_id: 策略ID
+            
+        Returns:
+            批次数量
+        """
+        try:
+            result = self.db.execute_query(
+                "SELECT COUNT(DISTINCT executed_at) as count FROM strategy_results WHERE strategy_id = %s",
+                (strategy_id,)
+            )
+            
+            if result:
+                return result[0]['count']
+            
+            return 0
+            
+        except Exception as e:
+            logger.error(f"获取策略执行批次数量失败: {e}")
+            return 0
+    
     def get_strategy_results_count(self, strategy_id: int) -> int:
         """
         获取策略执行结果数量
@@ -6,7 +6,7 @@
 
 import json
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterator
 from app.models.database_factory import get_database
 from app.utils import get_logger
 
@@ -92,19 +92,14 @@ class StrategyService:
 
             now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-            self.db.execute_update(
+            # 插入时直接取回自增ID，无需再按名称查询
+            strategy_id = self.db.execute_insert(
                 sql,
                 (name.strip(), user_id, description, json.dumps(config),
                  enabled, now, now)
             )
 
-            # 获取新插入的策略ID
-            result = self.db.execute_query(
-                "SELECT id FROM strategies WHERE name = %s",
-                (name.strip(),)
-            )
-            if result:
-                strategy_id = result[0]['id']
+            if strategy_id:
                 logger.info(f"策略创建成功: {name} (ID: {strategy_id}, User: {user_id})")
                 return strategy_id
             
@@ -250,12 +245,6 @@ class StrategyService:
                 logger.error(f"策略不存在或无权访问: {strategy_id}")
                 return False
             
-            # 删除策略执行结果
-            self.db.execute_update(
-                "DELETE FROM strategy_results WHERE strategy_id = %s",
-                (strategy_id,)
-            )
-
             # 删除策略
             sql = "DELETE FROM strategies WHERE id = %s"
             params = [strategy_id]
@@ -264,7 +253,11 @@ class StrategyService:
                 sql += " AND user_id = %s"
                 params.append(user_id)
 
-            self.db.execute_update(sql, tuple(params))
+            # 执行结果与策略在同一事务中删除（数据库未使用外键级联）
+            self.db.execute_transaction([
+                ("DELETE FROM strategy_results WHERE strategy_id = %s", (strategy_id,)),
+                (sql, tuple(params)),
+            ])
             
             logger.info(f"策略删除成功: {strategy['name']} (ID: {strategy_id})")
             return True
@@ -295,24 +288,23 @@ class StrategyService:
             result = self.db.execute_query(sql, tuple(params))
             
             if result:
-                strategy = dict(result[0])
-                # 解析配置JSON
-                strategy['config'] = json.loads(strategy['config'])
-                strategy['enabled'] = bool(strategy['enabled'])
-                return strategy
+                return self._row_to_strategy(result[0])
             
             return None
             
         except Exception as e:
             logger.error(f"获取策略失败: {e}")
     
-    def list_strategies(self, enabled_only: bool = False, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    def list_strategies(self, enabled_only: bool = False, user_id: Optional[int] = None,
+                       limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
         """
         获取策略列表
         
         Args:
             enabled_only: 是否只返回启用的策略
             user_id: 用户ID（可选，用于过滤）
+            limit: 返回数量限制（可选，默认返回全部）
+            offset: 偏移量
             
         Returns:
             策略列表
@@ -337,24 +329,45 @@ class StrategyService:
             if conditions:
                 sql += " WHERE " + " AND ".join(conditions)
             
-            sql += " ORDER BY strategies.created_at DESC"
+            sql += " ORDER BY strategies.created_at DESC, strategies.id DESC"
+            
+            if limit:
+                sql += " LIMIT %s OFFSET %s"
+                params.extend([limit, offset])
             
             result = self.db.execute_query(sql, tuple(params))
             
-            strategies = []
-            for row in result:
-                strategy = dict(row)
-                # 解析配置JSON
-                strategy['config'] = json.loads(strategy['config'])
-                strategy['enabled'] = bool(strategy['enabled'])
-                strategies.append(strategy)
+            strategies = [self._row_to_strategy(row) for row in result]
             
             logger.info(f"获取策略列表成功，共 {len(strategies)} 条")
             return strategies
             
         except Exception as e:
             logger.error(f"获取策略列表失败: {e}")
-            return []    
+            return []
+    
+    def iter_strategies(self, enabled_only: bool = False, user_id: Optional[int] = None,
+                       batch_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """
+        逐条遍历策略列表，按批分页查询，避免一次性加载全部策略
+        
+        Args:
+            enabled_only: 是否只返回启用的策略
+            user_id: 用户ID（可选，用于过滤）
+            batch_size: 每批查询的数量
+            
+        Yields:
+            策略信息字典
+        """
+        offset = 0
+        while True:
+            batch = self.list_strategies(enabled_only=enabled_only, user_id=user_id,
+                                         limit=batch_size, offset=offset)
+            yield from batch
+            if len(batch) < batch_size:
+                break
+            offset += batch_size
+    
     def get_strategy_by_name(self, name: str, user_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
         根据名称获取策略
@@ -377,10 +390,7 @@ class StrategyService:
             result = self.db.execute_query(sql, tuple(params))
             
             if result:
-                strategy = dict(result[0])
-                strategy['config'] = json.loads(strategy['config'])
-                strategy['enabled'] = bool(strategy['enabled'])
-                return strategy
+                return self._row_to_strategy(result[0])
             
             return None
             
@@ -412,6 +422,23 @@ class StrategyService:
             logger.error(f"更新策略最后执行时间失败: {e}")
             return False
     
+    @staticmethod
+    def _row_to_strategy(row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        将数据库行转换为策略字典
+        
+        Args:
+            row: 查询结果行
+            
+        Returns:
+            策略信息字典（config已解析为字典）
+        """
+        strategy = dict(row)
+        # 解析配置JSON
+        strategy['config'] = json.loads(strategy['config'])
+        strategy['enabled'] = bool(strategy['enabled'])
+        return strategy
+    
     def validate_strategy_config(self, rise_threshold: float, 
                                 observation_days: int, 
                                 ma_period: int) -> tuple[bool, str]:
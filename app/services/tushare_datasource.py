@@ -1,14 +1,53 @@
 """
 Tushare数据源实现
 """
+import numpy as np
 import pandas as pd
 from typing import List, Optional
 from datetime import datetime
+from functools import lru_cache
 from .datasource import DataSource
 from app.utils import get_logger
 
 logger = get_logger(__name__)
 
+# Tushare市场类型（不在其中的统一归为"其他"）
+MARKET_TYPES = ['主板', '创业板', '科创板', '北交所']
+
+# 股票状态（第一个为默认状态）
+STOCK_STATUSES = ['normal', 'delisted', 'suspended']
+
+
+@lru_cache(maxsize=8192)
+def _to_ts_code(code: str) -> str:
+    """
+    将标准化后的股票代码转换为Tushare代码（带交易所后缀）
+    
+    Args:
+        code: 标准化后的股票代码
+        
+    Returns:
+        Tushare代码，如 600000.SH
+    """
+    if code.startswith('6'):
+        return f"{code}.SH"
+    return f"{code}.SZ"
+
+
+def _format_dates(dates: pd.Series) -> List[str]:
+    """
+    将Tushare返回的YYYYMMDD日期字符串转换为YYYY-MM-DD
+    
+    直接切片拼接字符串，避免解析为datetime再格式化回字符串
+    
+    Args:
+        dates: YYYYMMDD格式的日期序列
+        
+    Returns:
+        YYYY-MM-DD格式的日期列表
+    """
+    return [f"{d[:4]}-{d[4:6]}-{d[6:8]}" for d in dates.to_numpy()]
+
 
 class TushareDataSource(DataSource):
     """Tushare数据源实现类"""
@@ -58,15 +97,12 @@ class TushareDataSource(DataSource):
                 'market': 'market_type'
             })
             
-            # 转换市场类型
-            market_map = {
-                '主板': '主板',
-                '创业板': '创业板',
-                '科创板': '科创板',
-                '北交所': '北交所'
-            }
-            df['market_type'] = df['market_type'].map(market_map).fillna('其他')
-            df['status'] = 'normal'
+            # 转换市场类型（分类类型，未知市场直接落为缺失值后填充为"其他"）
+            market_type = pd.Categorical(df['market_type'], categories=MARKET_TYPES)
+            df['market_type'] = market_type.add_categories(['其他']).fillna('其他')
+            df['status'] = pd.Categorical.from_codes(
+                np.zeros(len(df), dtype='int8'), categories=STOCK_STATUSES
+            )
             
             # 选择需要的列
             df = df[['code', 'name', 'list_date', 'industry', 'market_type', 'status']]
@@ -108,10 +144,7 @@ class TushareDataSource(DataSource):
         try:
             # 标准化股票代码（Tushare需要带后缀）
             code = self.normalize_stock_code(stock_code)
-            if code.startswith('6'):
-                ts_code = f"{code}.SH"
-            else:
-                ts_code = f"{code}.SZ"
+            ts_code = _to_ts_code(code)
             
             # 转换日期格式（Tushare使用YYYYMMDD格式）
             start = start_date.replace('-', '') if start_date else '19900101'
@@ -144,7 +177,7 @@ class TushareDataSource(DataSource):
             df['code'] = code
             
             # 转换日期格式
-            df['trade_date'] = pd.to_datetime(df['trade_date']).dt.strftime('%Y-%m-%d')
+            df['trade_date'] = _format_dates(df['trade_date'])
             
             # 成交量单位转换（Tushare单位是手，转换为股）
             df['volume'] = df['volume'] * 100
@@ -192,7 +225,7 @@ class TushareDataSource(DataSource):
             )
             
             # 转换日期格式
-            df['cal_date'] = pd.to_datetime(df['cal_date']).dt.strftime('%Y-%m-%d')
+            df['cal_date'] = _format_dates(df['cal_date'])
             
             return df['cal_date'].tolist()
             
@@ -164,6 +164,7 @@ class BackgroundTaskManager:
     
     def __init__(self):
         """初始化任务管理器"""
+        # 写时复制：写操作在锁内构建新字典后整体替换引用，读操作直接取快照无需加锁
         self.tasks: Dict[str, BackgroundTask] = {}
         self._lock = threading.Lock()
         logger.info("后台任务管理器初始化完成")
@@ -189,7 +190,9 @@ class BackgroundTaskManager:
         task = BackgroundTask(task_id, task_name, func, args, kwargs)
         
         with self._lock:
-            self.tasks[task_id] = task
+            tasks = dict(self.tasks)
+            tasks[task_id] = task
+            self.tasks = tasks
         
         if auto_start:
             task.start()
@@ -207,9 +210,8 @@ class BackgroundTaskManager:
         Returns:
             任务信息字典
         """
-        with self._lock:
-            task = self.tasks.get(task_id)
-            return task.to_dict() if task else None
+        task = self.tasks.get(task_id)
+        return task.to_dict() if task else None
     
     def update_task_status(self, task_id: str):
         """更新任务状态（内部使用）"""
@@ -226,11 +228,8 @@ class BackgroundTaskManager:
         Returns:
             任务列表
         """
-        with self._lock:
-            tasks = list(self.tasks.values())
-            if status:
-                tasks = [t for t in tasks if t.status == status]
-            return [t.to_dict() for t in tasks]
+        snapshot = self.tasks
+        return [t.to_dict() for t in snapshot.values() if not status or t.status == status]
     
     def cancel_task(self, task_id: str) -> bool:
         """
@@ -242,12 +241,11 @@ class BackgroundTaskManager:
         Returns:
             是否成功
         """
-        with self._lock:
-            task = self.tasks.get(task_id)
-            if task and task.status in ['pending', 'running']:
-                task.stop()
-                logger.info(f"任务 {task_id} 已请求取消")
-                return True
+        task = self.tasks.get(task_id)
+        if task and task.status in ['pending', 'running']:
+            task.stop()
+            logger.info(f"任务 {task_id} 已请求取消")
+            return True
         return False
     
     def cleanup_completed_tasks(self, keep_hours: int = 24):
@@ -279,8 +277,11 @@ class BackgroundTaskManager:
                         if hours_elapsed > keep_hours:
                             to_remove.append(task_id)
             
-            for task_id in to_remove:
-                del self.tasks[task_id]
+            if to_remove:
+                tasks = dict(self.tasks)
+                for task_id in to_remove:
+                    del tasks[task_id]
+                self.tasks = tasks
             
             if to_remove:
                 logger.info(f"清理了 {len(to_remove)} 个已完成任务")
@@ -1,17 +1,19 @@
 """工具模块初始化"""
-from .config import ConfigManager, get_config
+from .config import ConfigManager, get_config, set_config
 from .logger import LoggerManager, setup_logging, get_logger
 from .rate_limiter import RateLimiter, get_rate_limiter, rate_limited
 
 __all__ = [
     'ConfigManager',
     'get_config',
+    'set_config',
     'LoggerManager',
     'setup_logging',
     'get_logger',
     'RateLimiter',
     'get_rate_limiter',
-    'rate_limited'
+    'rate_limited',
+    'bootstrap'
 ]
 
 
@@ -39,3 +41,17 @@ def get_stock_limit_for_mode() -> int:
         app_mode_config = config.get('app_mode', {})
         return app_mode_config.get('development_stock_limit', 100)
     return None
+
+
+def bootstrap():
+    """
+    独立运行脚本的初始化：加载配置、初始化日志系统并创建数据库实例
+    
+    Returns:
+        Tuple[ConfigManager, 数据库实例]: 配置和数据库实例
+    """
+    from app.models.database_factory import get_database
+    
+    config = get_config()
+    setup_logging(config)
+    return config, get_database(config=config.get('database.mysql'))
@@ -1,27 +1,199 @@
+import hmac
+import json
+import os
+import threading
+import time
 import jwt
 import bcrypt
-from datetime import datetime, timedelta
+from collections import OrderedDict
 from typing import Dict, Optional, Union
 from app.utils.config import get_config
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerificationError, InvalidHashError
+except ImportError:
+    PasswordHasher = None
+
+# JWT 签名算法：默认 HS256，可通过 web.jwt.algorithm 配置为 EdDSA（Ed25519）
+JWT_ALGORITHM = 'HS256'
+JWT_ALGORITHMS = [JWT_ALGORITHM]
+SUPPORTED_JWT_ALGORITHMS = ('HS256', 'EdDSA')
+
+# 复用的 JWS 编解码器（跳过 PyJWT 高层封装中的载荷转换和声明校验分派）
+_JWS = jwt.PyJWS()
+
+# bcrypt 默认计算成本（每加 1 耗时翻倍）
+DEFAULT_BCRYPT_COST = 12
+
+# argon2id 哈希器（按需创建）
+_argon2_hasher = None
+
+
+def _get_argon2_hasher():
+    """
+    获取 argon2id 哈希器
+    
+    Returns:
+        PasswordHasher实例，未安装 argon2-cffi 时返回 None
+    """
+    global _argon2_hasher
+    if _argon2_hasher is None and PasswordHasher is not None:
+        _argon2_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=1)
+    return _argon2_hasher
+
+
+# 密码验证结果缓存：键为 HMAC(pepper, 密码|哈希)，不保存明文密码
+# 缓存期内同一密码的重复验证不再执行 bcrypt/argon2 计算，代价是缓存期内
+# 进程内存中存在可用于离线比对的 HMAC 摘要，pepper 应按部署单独配置
+_VERIFY_CACHE_TTL = 300
+_VERIFY_CACHE_MAXSIZE = 1024
+_verify_cache: 'OrderedDict[bytes, tuple]' = OrderedDict()
+_verify_cache_lock = threading.Lock()
+_verify_pepper: Optional[bytes] = None
+
+
+def _get_verify_pepper() -> bytes:
+    """
+    获取密码验证缓存使用的 pepper
+    
+    优先使用 web.password.pepper 配置，未配置时使用进程内随机值
+    
+    Returns:
+        bytes: pepper
+    """
+    global _verify_pepper
+    if _verify_pepper is None:
+        pepper = get_config().get('web.password.pepper')
+        _verify_pepper = pepper.encode('utf-8') if pepper else os.urandom(32)
+    return _verify_pepper
+
+
+def log_hmac_acceleration():
+    """
+    检测并记录 JWT HMAC-SHA256 的硬件加速情况
+    
+    HS256 通过 hashlib 调用 OpenSSL 计算 HMAC，OpenSSL 在支持 SHA 指令扩展
+    （x86 的 SHA-NI、ARMv8 的 SHA2）的 CPU 上会自动使用硬件指令。
+    未检测到时记录警告，提示运维升级 CPU 机型或基础镜像。
+    """
+    import platform
+    import ssl
+    
+    logger.info(f"JWT HMAC 使用 {ssl.OPENSSL_VERSION} ({platform.machine()})")
+    
+    try:
+        with open('/proc/cpuinfo', 'r', encoding='utf-8') as f:
+            flags = set()
+            for line in f:
+                # x86 为 flags 行，ARM 为 Features 行
+                if line.startswith(('flags', 'Features')):
+                    flags.update(line.split(':', 1)[1].split())
+                    break
+    except OSError:
+        logger.debug("无法读取 /proc/cpuinfo，跳过 SHA 指令检测")
+        return
+    
+    if 'sha_ni' in flags or 'sha2' in flags:
+        logger.info("CPU 支持 SHA 指令扩展，JWT HMAC 将使用硬件加速")
+    else:
+        logger.warning("CPU 未检测到 SHA 指令扩展（sha_ni/sha2），JWT HMAC 将使用软件实现")
+
+
 class AuthUtils:
     """认证工具类"""
     
+    # 缓存的 JWT 签名配置 (算法, 签名密钥, 验证密钥, 允许的算法列表)，配置重新加载时清空
+    _jwt_keys: Optional[tuple] = None
+    
+    @classmethod
+    def _get_jwt_keys(cls) -> tuple:
+        """
+        获取 JWT 签名算法和密钥（首次读取配置后缓存）
+        
+        Returns:
+            tuple: (算法, 签名密钥, 验证密钥, 允许的算法列表)
+        """
+        jwt_keys = cls._jwt_keys
+        if jwt_keys is None:
+            jwt_keys = cls._load_jwt_keys()
+            cls._jwt_keys = jwt_keys
+        return jwt_keys
+    
+    @staticmethod
+    def _load_jwt_keys() -> tuple:
+        """
+        根据配置加载 JWT 签名算法和密钥
+        
+        EdDSA 需要配置 web.jwt.private_key_path（PEM 格式 Ed25519 私钥），
+        可选配置 web.jwt.public_key_path；密钥不可用时回退到 HS256
+        
+        Returns:
+            tuple: (算法, 签名密钥, 验证密钥, 允许的算法列表)
+        """
+        config = get_config()
+        secret_key = config.get('web.secret_key', 'dev-secret-key')
+        algorithm = config.get('web.jwt.algorithm', JWT_ALGORITHM)
+        
+        if algorithm not in SUPPORTED_JWT_ALGORITHMS:
+            logger.warning(f"不支持的JWT算法: {algorithm}，使用{JWT_ALGORITHM}")
+            algorithm = JWT_ALGORITHM
+        
+        if algorithm == 'EdDSA':
+            try:
+                from cryptography.hazmat.primitives.serialization import (
+                    load_pem_private_key, load_pem_public_key
+                )
+                
+                with open(config.get('web.jwt.private_key_path'), 'rb') as f:
+                    private_key = load_pem_private_key(f.read(), password=None)
+                
+                public_key_path = config.get('web.jwt.public_key_path')
+                if public_key_path:
+                    with open(public_key_path, 'rb') as f:
+                        public_key = load_pem_public_key(f.read())
+                else:
+                    public_key = private_key.public_key()
+                
+                logger.info("JWT使用EdDSA(Ed25519)签名")
+                return 'EdDSA', private_key, public_key, ['EdDSA']
+            except Exception as e:
+                logger.warning(f"加载EdDSA密钥失败，使用{JWT_ALGORITHM}: {e}")
+        
+        return JWT_ALGORITHM, secret_key, secret_key, JWT_ALGORITHMS
+    
+    @classmethod
+    def clear_key_cache(cls):
+        """清空缓存的 JWT 签名配置"""
+        cls._jwt_keys = None
+    
     @staticmethod
     def hash_password(password: str) -> str:
         """
         生成密码哈希
         
+        算法和计算成本由 web.password.algorithm（bcrypt/argon2id）
+        和 web.password.cost 配置
+        
         Args:
             password: 原始密码
             
         Returns:
             str: 哈希后的密码
         """
-        salt = bcrypt.gensalt()
+        config = get_config()
+        
+        if config.get('web.password.algorithm', 'bcrypt') == 'argon2id':
+            hasher = _get_argon2_hasher()
+            if hasher is not None:
+                return hasher.hash(password)
+            logger.warning("未安装argon2-cffi，改用bcrypt生成密码哈希: pip install argon2-cffi")
+        
+        cost = int(config.get('web.password.cost', DEFAULT_BCRYPT_COST))
+        salt = bcrypt.gensalt(rounds=cost)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
     
@@ -34,11 +206,68 @@ class AuthUtils:
             password: 原始密码
             hashed: 哈希后的密码
             
+        Returns:
+            bool: 是否匹配
+        """
+        # 哈希值均为ASCII，走ASCII快速编码；密码可能包含非ASCII字符
+        try:
+            hashed_bytes = hashed.encode('ascii')
+        except UnicodeEncodeError:
+            logger.error("密码验证失败: 密码哈希格式无效")
+            return False
+        password_bytes = password.encode('utf-8')
+        
+        key = hmac.new(
+            _get_verify_pepper(),
+            password_bytes + b'|' + hashed_bytes,
+            'sha256'
+        ).digest()
+        now = time.monotonic()
+        
+        with _verify_cache_lock:
+            cached = _verify_cache.get(key)
+            if cached is not None and now - cached[1] < _VERIFY_CACHE_TTL:
+                _verify_cache.move_to_end(key)
+                return cached[0]
+        
+        result = AuthUtils._check_password(password, hashed, password_bytes, hashed_bytes)
+        
+        with _verify_cache_lock:
+            _verify_cache[key] = (result, now)
+            _verify_cache.move_to_end(key)
+            while len(_verify_cache) > _VERIFY_CACHE_MAXSIZE:
+                _verify_cache.popitem(last=False)
+        
+        return result
+    
+    @staticmethod
+    def _check_password(password: str, hashed: str,
+                        password_bytes: bytes, hashed_bytes: bytes) -> bool:
+        """
+        按哈希算法实际校验密码（不经过缓存）
+        
+        Args:
+            password: 原始密码
+            hashed: 哈希后的密码
+            password_bytes: 已编码的原始密码
+            hashed_bytes: 已编码的哈希密码
+            
         Returns:
             bool: 是否匹配
         """
         try:
-            return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+            # 根据哈希前缀识别算法
+            if hashed.startswith('$argon2'):
+                hasher = _get_argon2_hasher()
+                if hasher is None:
+                    logger.error("密码哈希为argon2格式，但未安装argon2-cffi")
+                    return False
+                try:
+                    return hasher.verify(hashed, password)
+                except (VerificationError, InvalidHashError):
+                    return False
+            
+            return bcrypt.checkpw(password_bytes, hashed_bytes)
         except Exception as e:
             logger.error(f"密码验证失败: {e}")
             return False
@@ -57,18 +286,22 @@ class AuthUtils:
         Returns:
             str: JWT Token
         """
-        config = get_config()
-        secret_key = config.get('web.secret_key', 'dev-secret-key')
+        algorithm, signing_key, _, _ = AuthUtils._get_jwt_keys()
         
+        now = int(time.time())
         payload = {
             'user_id': user_id,
             'username': username,
             'role': role,
-            'exp': datetime.utcnow() + timedelta(seconds=expires_in),
-            'iat': datetime.utcnow()
+            'exp': now + expires_in,
+            'iat': now
         }
         
-        token = jwt.encode(payload, secret_key, algorithm='HS256')
+        token = _JWS.encode(
+            json.dumps(payload, separators=(',', ':')).encode('utf-8'),
+            signing_key,
+            algorithm=algorithm
+        )
         return token
     
     @staticmethod
@@ -82,15 +315,24 @@ class AuthUtils:
         Returns:
             Optional[Dict]: Token 载荷，验证失败返回 None
         """
-        config = get_config()
-        secret_key = config.get('web.secret_key', 'dev-secret-key')
+        _, _, verification_key, algorithms = AuthUtils._get_jwt_keys()
         
         try:
-            payload = jwt.decode(token, secret_key, algorithms=['HS256'])
+            # 只接受配置的算法（防止算法混淆），签名校验通过后只需检查过期时间（载荷由本服务签发）
+            payload = json.loads(_JWS.decode(token, verification_key, algorithms=algorithms))
+            if not isinstance(payload, dict):
+                raise jwt.DecodeError("Token载荷格式错误")
+            
+            exp = payload.get('exp')
+            if exp is not None:
+                if not isinstance(exp, (int, float)):
+                    raise jwt.DecodeError("Token过期时间格式错误")
+                if exp <= time.time():
+                    raise jwt.ExpiredSignatureError("Signature has expired")
             return payload
         except jwt.ExpiredSignatureError:
             logger.warning("Token已过期")
             return None
-        except jwt.InvalidTokenError as e:
+        except (jwt.InvalidTokenError, ValueError) as e:
             logger.warning(f"无效的Token: {e}")
             return None
@@ -3,10 +3,20 @@
 负责读取、验证和管理系统配置
 """
 import os
+import threading
 import yaml
 from typing import Dict, Any
 from pathlib import Path
 
+# 优先使用 libyaml 的 C 实现解析配置文件
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# 配置项不存在的标记（与值为 None 的情况区分缓存）
+_MISSING = object()
+
 
 class ConfigManager:
     """配置管理器"""
@@ -25,31 +35,63 @@ class ConfigManager:
         
         self.config_path = Path(config_path)
         self.config: Dict[str, Any] = {}
+        
+        # get() 的查找缓存：点号键的拆分结果和已解析的值，配置变化时清空
+        self._split_cache: Dict[str, tuple] = {}
+        self._get_cache: Dict[str, Any] = {}
+        
+        # 配置版本号，每次配置变化后递增；get() 查找期间版本变化时不写入缓存
+        self._generation = 0
+        
+        # 上次加载时配置文件的 (修改时间, 大小)，文件未变化时 reload() 跳过解析
+        self._last_stat = None
+        
         self._load_config()
     
-    def _load_config(self):
-        """加载配置文件"""
+    def _load_config(self) -> bool:
+        """
+        加载配置文件
+        
+        Returns:
+            bool: 是否重新解析了配置文件（文件未变化时跳过解析，返回False）
+        """
         if not self.config_path.exists():
             raise FileNotFoundError(f"配置文件不存在: {self.config_path}")
         
+        stat = self.config_path.stat()
+        file_stat = (stat.st_mtime_ns, stat.st_size)
+        if file_stat == self._last_stat:
+            return False
+        
+        # 在局部变量中完成解析、覆盖和路径处理，完整的新配置再整体替换，
+        # 并发的 get() 不会读到处理到一半的配置
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config = yaml.safe_load(f)
-            
-            # 应用环境变量覆盖
-            self._apply_env_overrides()
-            
-            # 验证配置
-            self._validate_config()
-            
-            # 处理相对路径
-            self._resolve_paths()
-            
+                config = yaml.load(f, Loader=SafeLoader)
         except yaml.YAMLError as e:
             raise ValueError(f"配置文件格式错误: {e}")
+        
+        # 应用环境变量覆盖
+        self._apply_env_overrides(config)
+        
+        # 验证配置
+        self._validate_config(config)
+        
+        # 处理相对路径
+        self._resolve_paths(config)
+        
+        self.config = config
+        self._clear_cache()
+        self._last_stat = file_stat
+        return True
     
-    def _apply_env_overrides(self):
-        """应用环境变量覆盖配置文件中的配置"""
+    def _apply_env_overrides(self, config: Dict[str, Any]):
+        """
+        应用环境变量覆盖配置文件中的配置
+        
+        Args:
+            config: 待处理的配置字典
+        """
         # MySQL配置的环境变量覆盖
         env_mappings = {
             'MYSQL_HOST': ('database', 'mysql', 'host'),
@@ -59,72 +101,83 @@ class ConfigManager:
             'MYSQL_PASSWORD': ('database', 'mysql', 'password'),
         }
         
-        for env_key, config_path in env_mappings.items():
-            env_value = os.getenv(env_key)
-            if env_value is not None:
-                # 特殊处理：将字符串端口号转换为整数
-                if env_key == 'MYSQL_PORT':
-                    try:
-                        env_value = int(env_value)
-                    except ValueError:
-                        continue
-                
-                # 导航到配置字典的指定路径
-                config = self.config
-                for key in config_path[:-1]:
-                    if key not in config:
-                        config[key] = {}
-                    config = config[key]
-                
-                # 设置配置值
-                config[config_path[-1]] = env_value
+        # 一次性读取已设置的环境变量
+        env = os.environ
+        overrides = [(env_key, config_path, env[env_key])
+                     for env_key, config_path in env_mappings.items() if env_key in env]
+        
+        for env_key, config_path, env_value in overrides:
+            # 特殊处理：将字符串端口号转换为整数
+            if env_key == 'MYSQL_PORT':
+                try:
+                    env_value = int(env_value)
+                except ValueError:
+                    continue
+            
+            # 导航到配置字典的指定路径
+            section = config
+            for key in config_path[:-1]:
+                section = section.setdefault(key, {})
+            
+            # 设置配置值
+            section[config_path[-1]] = env_value
     
-    def _validate_config(self):
-        """验证配置参数的有效性"""
+    def _validate_config(self, config: Dict[str, Any]):
+        """
+        验证配置参数的有效性
+        
+        Args:
+            config: 待验证的配置字典
+        """
         # 验证数据源配置
-        datasource_type = self.config.get('datasource', {}).get('type')
+        datasource_type = config.get('datasource', {}).get('type')
         if datasource_type not in ['akshare', 'tushare']:
             raise ValueError(f"不支持的数据源类型: {datasource_type}")
         
         if datasource_type == 'tushare':
             # 支持两种配置格式: datasource.tushare.token 或 datasource.tushare_token
-            token = self.config.get('datasource', {}).get('tushare', {}).get('token')
+            token = config.get('datasource', {}).get('tushare', {}).get('token')
             if not token:
-                token = self.config.get('datasource', {}).get('tushare_token')
+                token = config.get('datasource', {}).get('tushare_token')
             if not token:
                 raise ValueError("使用tushare数据源时必须配置tushare_token")
         
         # 验证API频率限制
-        rate_limit = self.config.get('api_rate_limit', {})
+        rate_limit = config.get('api_rate_limit', {})
         min_delay = rate_limit.get('min_delay', 0.1)
         max_delay = rate_limit.get('max_delay', 0.3)
         if min_delay > max_delay:
             raise ValueError("min_delay不能大于max_delay")
         
         # 验证Web服务端口
-        port = self.config.get('web', {}).get('port', 5000)
+        port = config.get('web', {}).get('port', 5000)
         if not (1024 <= port <= 65535):
             raise ValueError(f"端口号必须在1024-65535之间: {port}")
         
         # 验证日志级别
-        log_level = self.config.get('logging', {}).get('level', 'INFO')
+        log_level = config.get('logging', {}).get('level', 'INFO')
         valid_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
         if log_level not in valid_levels:
             raise ValueError(f"无效的日志级别: {log_level}")
         
         # 验证数据库配置
-        db_config = self.config.get('database', {})
+        db_config = config.get('database', {})
         db_type = db_config.get('type', 'mysql')
         
         if db_type != 'mysql':
             raise ValueError(f"不支持的数据库类型: {db_type}，只支持mysql")
     
-    def _resolve_paths(self):
-        """将相对路径转换为绝对路径"""
+    def _resolve_paths(self, config: Dict[str, Any]):
+        """
+        将相对路径转换为绝对路径
+        
+        Args:
+            config: 待处理的配置字典
+        """
         project_root = self.config_path.parent
         
         # 数据库路径
-        db_config = self.config.get('database', {})
+        db_config = config.get('database', {})
         for key in ['duckdb_path']:
             if key in db_config:
                 path = Path(db_config[key])
@@ -132,14 +185,14 @@ class ConfigManager:
                     db_config[key] = str(project_root / path)
         
         # 日志文件路径
-        log_config = self.config.get('logging', {})
+        log_config = config.get('logging', {})
         if 'file_path' in log_config:
             path = Path(log_config['file_path'])
             if not path.is_absolute():
                 log_config['file_path'] = str(project_root / path)
         
         # 备份目录
-        data_mgmt = self.config.get('data_management', {})
+        data_mgmt = config.get('data_management', {})
         if 'backup_dir' in data_mgmt:
             path = Path(data_mgmt['backup_dir'])
             if not path.is_absolute():
@@ -156,19 +209,47 @@ class ConfigManager:
         Returns:
             配置值
         """
-        keys = key.split('.')
-        value = self.config
+        try:
+            value = self._get_cache[key]
+        except KeyError:
+            generation = self._generation
+            value = self._lookup(key)
+            # 查找期间配置发生了变化，结果可能是旧值，不写入缓存
+            if generation == self._generation:
+                self._get_cache[key] = value
         
+        return default if value is _MISSING else value
+    
+    def _lookup(self, key: str) -> Any:
+        """
+        按点号分隔的多级键查找配置值
+        
+        Args:
+            key: 配置键
+            
+        Returns:
+            配置值，不存在时返回 _MISSING
+        """
+        keys = self._split_cache.get(key)
+        if keys is None:
+            keys = self._split_cache[key] = tuple(key.split('.'))
+        
+        value = self.config
         for k in keys:
             if isinstance(value, dict):
                 value = value.get(k)
                 if value is None:
-                    return default
+                    return _MISSING
             else:
-                return default
+                return _MISSING
         
         return value
     
+    def _clear_cache(self):
+        """配置变化后清空 get() 的查找缓存"""
+        self._generation += 1
+        self._get_cache.clear()
+    
     def set(self, key: str, value: Any):
         """
         设置配置项
@@ -177,15 +258,19 @@ class ConfigManager:
             key: 配置键，支持点号分隔的多级键
             value: 配置值
         """
+        # 内存中的配置已与文件不一致，下次 reload() 需要重新解析
+        self._last_stat = None
+        
         keys = key.split('.')
         config = self.config
         
         for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
+            config = config.setdefault(k, {})
         
         config[keys[-1]] = value
+        
+        # 修改完成后再清空缓存，避免并发的 get() 缓存修改前的值
+        self._clear_cache()
     
     def save(self):
         """保存配置到文件"""
@@ -197,7 +282,12 @@ class ConfigManager:
     
     def reload(self):
         """重新加载配置文件"""
-        self._load_config()
+        if not self._load_config():
+            return
+        
+        # 配置有变化时清空依赖配置的缓存
+        from app.utils.auth import AuthUtils
+        AuthUtils.clear_key_cache()
     
     def get_all(self) -> Dict[str, Any]:
         """获取所有配置"""
@@ -206,6 +296,7 @@ class ConfigManager:
 
 # 全局配置实例
 _config_instance = None
+_config_lock = threading.Lock()
 
 
 def get_config(config_path: str = None) -> ConfigManager:
@@ -219,6 +310,21 @@ def get_config(config_path: str = None) -> ConfigManager:
         ConfigManager实例
     """
     global _config_instance
+    # 双重检查：已创建时无需加锁，首次创建时加锁避免多线程重复初始化
     if _config_instance is None:
-        _config_instance = ConfigManager(config_path)
+        with _config_lock:
+            if _config_instance is None:
+                _config_instance = ConfigManager(config_path)
     return _config_instance
+
+
+def set_config(config: ConfigManager):
+    """
+    设置全局配置实例（子进程中复用父进程已加载的配置，避免重新解析配置文件）
+    
+    Args:
+        config: ConfigManager实例
+    """
+    global _config_instance
+    with _config_lock:
+        _config_instance = config
@@ -2,13 +2,41 @@
 数据库操作重试装饰器
 """
 import time
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import Callable, Any, Type, Tuple
 from app.utils import get_logger
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _default_retry_exceptions() -> Tuple[Type[Exception], ...]:
+    """
+    获取默认重试的数据库异常类型
+    
+    结果只构建一次，避免每次装饰时重复导入 pymysql/sqlalchemy 并重建元组
+    
+    Returns:
+        异常类型元组
+    """
+    from pymysql import OperationalError, InterfaceError, DatabaseError
+    from sqlalchemy.exc import (
+        OperationalError as SQLAlchemyOperationalError,
+        InterfaceError as SQLAlchemyInterfaceError,
+        DatabaseError as SQLAlchemyDatabaseError,
+        DisconnectionError
+    )
+    return (
+        OperationalError,
+        InterfaceError,
+        DatabaseError,
+        SQLAlchemyOperationalError,
+        SQLAlchemyInterfaceError,
+        SQLAlchemyDatabaseError,
+        DisconnectionError
+    )
+
+
 def retry_db_operation(
     max_retries: int = 3,
     retry_delay: float = 0.5,
@@ -35,67 +63,77 @@ def retry_db_operation(
     """
     if retry_exceptions is None:
         # 默认重试这些常见数据库异常
-        from pymysql import OperationalError, InterfaceError, DatabaseError
-        from sqlalchemy.exc import (
-            OperationalError as SQLAlchemyOperationalError,
-            InterfaceError as SQLAlchemyInterfaceError,
-            DatabaseError as SQLAlchemyDatabaseError,
-            DisconnectionError
-        )
-        retry_exceptions = (
-            OperationalError,
-            InterfaceError,
-            DatabaseError,
-            SQLAlchemyOperationalError,
-            SQLAlchemyInterfaceError,
-            SQLAlchemyDatabaseError,
-            DisconnectionError
-        )
+        retry_exceptions = _default_retry_exceptions()
+    
+    # 预先计算每次重试前的等待时间（指数退避）
+    delays = tuple(retry_delay * backoff_factor ** i for i in range(max_retries))
     
     def decorator(func: Callable) -> Callable:
+        if max_retries <= 0:
+            # 不重试时直接调用，仅保留非预期异常的日志
+            @wraps(func)
+            def wrapper(*args, **kwargs) -> Any:
+                try:
+                    return func(*args, **kwargs)
+                except retry_exceptions as e:
+                    logger.error(
+                        "数据库操作失败，已达到最大重试次数 %d，函数: %s，异常: %s: %s",
+                        max_retries, func.__name__, type(e).__name__, e
+                    )
+                    raise
+                except Exception as e:
+                    logger.error(
+                        "数据库操作遇到非预期异常，函数: %s，异常: %s: %s",
+                        func.__name__, type(e).__name__, e
+                    )
+                    raise
+            
+            return wrapper
+        
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            last_exception = None
-            current_delay = retry_delay
+            # 第一次尝试，成功时不进入重试循环
+            try:
+                return func(*args, **kwargs)
+            except retry_exceptions as e:
+                last_exception = e
+            except Exception as e:
+                # 非数据库异常，不重试，直接抛出
+                logger.error(
+                    "数据库操作遇到非预期异常，函数: %s，异常: %s: %s",
+                    func.__name__, type(e).__name__, e
+                )
+                raise
             
-            for attempt in range(max_retries + 1):  # +1 表示包括第一次尝试
+            for attempt, current_delay in enumerate(delays):
+                # 记录重试日志（由logging延迟格式化，级别被过滤时不拼接字符串）
+                logger.warning(
+                    "数据库操作失败，准备第 %d/%d 次重试，函数: %s，异常: %s: %s，等待 %.2f 秒后重试...",
+                    attempt + 1, max_retries, func.__name__, type(last_exception).__name__,
+                    last_exception, current_delay
+                )
+                
+                # 等待指定时间
+                time.sleep(current_delay)
+                
                 try:
                     return func(*args, **kwargs)
                 except retry_exceptions as e:
                     last_exception = e
-                    
-                    # 最后一次尝试失败，不再重试
-                    if attempt >= max_retries:
-                        error_msg = (
-                            f"数据库操作失败，已达到最大重试次数 {max_retries}，"
-                            f"函数: {func.__name__}，异常: {type(e).__name__}: {e}"
-                        )
-                        logger.error(error_msg)
-                        raise
-                    
-                    # 记录重试日志
-                    retry_msg = (
-                        f"数据库操作失败，准备第 {attempt + 1}/{max_retries} 次重试，"
-                        f"函数: {func.__name__}，"
-                        f"异常: {type(e).__name__}: {e}，"
-                        f"等待 {current_delay:.2f} 秒后重试..."
-                    )
-                    logger.warning(retry_msg)
-                    
-                    # 等待指定时间
-                    time.sleep(current_delay)
-                    
-                    # 计算下次重试的延迟时间（指数退避）
-                    current_delay *= backoff_factor
-                    
                 except Exception as e:
                     # 非数据库异常，不重试，直接抛出
-                    logger.error(f"数据库操作遇到非预期异常，函数: {func.__name__}，异常: {type(e).__name__}: {e}")
+                    logger.error(
+                        "数据库操作遇到非预期异常，函数: %s，异常: %s: %s",
+                        func.__name__, type(e).__name__, e
+                    )
                     raise
             
-            # 理论上不会执行到这里，但为了类型检查
-            if last_exception:
-                raise last_exception
+            # 最后一次尝试失败，不再重试
+            logger.error(
+                "数据库操作失败，已达到最大重试次数 %d，函数: %s，异常: %s: %s",
+                max_retries, func.__name__, type(last_exception).__name__, last_exception
+            )
+            raise last_exception
         
         return wrapper
     return decorator
@@ -2,9 +2,11 @@
 日志管理模块
 提供统一的日志记录功能
 """
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
@@ -31,6 +33,8 @@ class LoggerManager:
     
     _loggers = {}
     _initialized = False
+    _listener = None
+    _queue_handler = None
     
     @classmethod
     def setup(cls, log_file: str, level: str = 'INFO', 
@@ -84,17 +88,63 @@ class LoggerManager:
         console_handler = ErrorTolerantStreamHandler()
         console_handler.setFormatter(formatter)
         
-        # 配置根日志记录器
+        # 配置根日志记录器：业务线程只负责入队，文件和控制台输出由后台线程完成
+        log_queue = queue.Queue(-1)
+        cls._listener = QueueListener(
+            log_queue, file_handler, console_handler,
+            respect_handler_level=True
+        )
+        cls._listener.start()
+        cls._queue_handler = QueueHandler(log_queue)
+        atexit.register(cls.shutdown)
+        # 后台运行时进程会fork，子进程中没有监听线程，需要重新启动
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=cls._restart_listener)
+        
         root_logger = logging.getLogger()
         root_logger.setLevel(getattr(logging, level.upper()))
-        root_logger.addHandler(file_handler)
-        root_logger.addHandler(console_handler)
+        root_logger.addHandler(cls._queue_handler)
         
         # 禁用日志传播错误，避免级联失败
         root_logger.raiseExceptions = False
         
         cls._initialized = True
     
+    @classmethod
+    def _restart_listener(cls):
+        """fork后在子进程中使用新的队列重新启动后台日志线程"""
+        listener = cls._listener
+        if listener is None or cls._queue_handler is None:
+            return
+        
+        log_queue = queue.Queue(-1)
+        cls._listener = QueueListener(
+            log_queue, *listener.handlers,
+            respect_handler_level=True
+        )
+        cls._listener.start()
+        cls._queue_handler.queue = log_queue
+    
+    @classmethod
+    def shutdown(cls):
+        """停止后台日志线程，并写出队列中剩余的日志"""
+        listener = cls._listener
+        if listener is None:
+            return
+        cls._listener = None
+        
+        try:
+            listener.stop()
+        except Exception:
+            # 退出阶段的日志错误不影响程序结束
+            pass
+        
+        for handler in listener.handlers:
+            try:
+                handler.close()
+            except Exception:
+                pass
+    
     @classmethod
     def get_logger(cls, name: str) -> logging.Logger:
         """
@@ -2,8 +2,10 @@
 API访问频率控制模块
 实现请求队列和延迟控制，避免被数据源封禁
 """
+import re
 import time
 import random
+import itertools
 import threading
 from typing import Callable, Any
 from functools import wraps
@@ -11,6 +13,12 @@ from app.utils import get_config, get_logger
 
 logger = get_logger(__name__)
 
+# 预生成的随机延迟个数
+_JITTER_TABLE_SIZE = 4096
+
+# 频率限制错误关键字匹配（模块加载时编译一次）
+_RATE_LIMIT_RE = re.compile(r'rate limit|too many requests|频率|限制|429|最多访问', re.IGNORECASE)
+
 
 class RateLimiter:
     """API访问频率限制器"""
@@ -30,33 +38,38 @@ class RateLimiter:
         self.max_delay = max_delay
         self.max_retries = max_retries
         self.retry_delay_increment = retry_delay_increment
-        self.last_request_time = 0
+        # 下一个请求允许发出的时间（单调时钟），锁只保护该时间的读改写，不覆盖等待过程
+        self._next_allowed = 0.0
         self.lock = threading.Lock()
+        self._build_jitter()
         self._paused = False
         self._pause_lock = threading.Lock()
         
         logger.info(f"频率限制器初始化: 延迟{min_delay}-{max_delay}秒, 最大重试{max_retries}次")
     
+    def _build_jitter(self):
+        """按当前的最小/最大延迟预生成随机延迟表，wait 时循环取用，避免每次调用随机数生成器"""
+        jitter = tuple(random.uniform(self.min_delay, self.max_delay)
+                       for _ in range(_JITTER_TABLE_SIZE))
+        self._jitter_iter = itertools.cycle(jitter)
+    
     def wait(self):
         """等待适当的时间间隔"""
+        # 检查是否暂停
+        while self._paused:
+            time.sleep(0.1)
+        
+        # 预约发送时间：取当前时间和下一个允许时间中的较晚者，并按随机延迟推后下一个允许时间
         with self.lock:
-            # 检查是否暂停
-            while self._paused:
-                time.sleep(0.1)
-            
-            # 计算需要等待的时间
-            current_time = time.time()
-            elapsed = current_time - self.last_request_time
-            
-            # 随机延迟
-            delay = random.uniform(self.min_delay, self.max_delay)
-            
-            if elapsed < delay:
-                wait_time = delay - elapsed
-                logger.debug(f"等待{wait_time:.2f}秒...")
-                time.sleep(wait_time)
-            
-            self.last_request_time = time.time()
+            now = time.monotonic()
+            target = max(now, self._next_allowed)
+            self._next_allowed = target + next(self._jitter_iter)
+        
+        # 在锁外等待，其他线程可以同时预约各自的时间
+        wait_time = target - now
+        if wait_time > 0:
+            logger.debug("等待%.2f秒...", wait_time)
+            time.sleep(wait_time)
     
     def pause(self):
         """暂停请求"""
@@ -103,31 +116,30 @@ class RateLimiter:
                 
                 # 成功则返回结果
                 if attempt > 0:
-                    logger.info(f"重试成功（第{attempt}次重试）")
+                    logger.info("重试成功（第%d次重试）", attempt)
                 return result
                 
             except Exception as e:
                 last_exception = e
                 
                 # 检查是否是频率限制错误
-                error_msg = str(e).lower()
-                is_rate_limit_error = any(keyword in error_msg for keyword in [
-                    'rate limit', 'too many requests', '频率', '限制', '429', '最多访问'
-                ])
+                is_rate_limit_error = bool(_RATE_LIMIT_RE.search(str(e)))
                 
                 if is_rate_limit_error:
-                    logger.warning(f"检测到频率限制错误: {e}")
+                    logger.warning("检测到频率限制错误: %s", e)
                     # 增加延迟时间（更激进的延迟策略）
                     retry_delay += self.retry_delay_increment
                     # 延迟到更合理的时间范围（考虑到Tushare 50次/分钟的）
                     # 至少需要 60/50 = 1.2秒/次，加上缓冲，设置为2.5秒
                     self.max_delay = min(retry_delay, 2.5)  
+                    with self.lock:
+                        self._build_jitter()
                 
                 if attempt < self.max_retries:
-                    logger.warning(f"执行失败，{retry_delay:.2f}秒后重试（第{attempt + 1}次重试）: {e}")
+                    logger.warning("执行失败，%.2f秒后重试（第%d次重试）: %s", retry_delay, attempt + 1, e)
                     time.sleep(retry_delay)
                 else:
-                    logger.error(f"执行失败，已达到最大重试次数: {e}")
+                    logger.error("执行失败，已达到最大重试次数: %s", e)
         
         # 所有重试都失败，抛出最后一个异常
         raise last_exception
@@ -135,6 +147,7 @@ class RateLimiter:
 
 # 全局频率限制器实例
 _rate_limiter_instance = None
+_rate_limiter_lock = threading.Lock()
 
 
 def get_rate_limiter() -> RateLimiter:
@@ -145,16 +158,19 @@ def get_rate_limiter() -> RateLimiter:
         RateLimiter实例
     """
     global _rate_limiter_instance
+    # 双重检查：已创建时无需加锁，首次创建时加锁避免多线程重复初始化
     if _rate_limiter_instance is None:
-        config = get_config()
-        rate_limit_config = config.get('api_rate_limit', {})
-        
-        _rate_limiter_instance = RateLimiter(
-            min_delay=rate_limit_config.get('min_delay', 0.1),
-            max_delay=rate_limit_config.get('max_delay', 0.3),
-            max_retries=rate_limit_config.get('max_retries', 3),
-            retry_delay_increment=rate_limit_config.get('retry_delay_increment', 0.5)
-        )
+        with _rate_limiter_lock:
+            if _rate_limiter_instance is None:
+                config = get_config()
+                rate_limit_config = config.get('api_rate_limit', {})
+                
+                _rate_limiter_instance = RateLimiter(
+                    min_delay=rate_limit_config.get('min_delay', 0.1),
+                    max_delay=rate_limit_config.get('max_delay', 0.3),
+                    max_retries=rate_limit_config.get('max_retries', 3),
+                    retry_delay_increment=rate_limit_config.get('retry_delay_increment', 0.5)
+                )
     
     return _rate_limiter_instance
 
@@ -6,6 +6,30 @@
 from datetime import datetime, date, timedelta
 from typing import List, Set
 import calendar
+from functools import lru_cache
+
+import numpy as np
+
+# 1970-01-01 的日期序号，用于日期序号与 datetime64[D] 之间的换算
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=65536)
+def _trading_flag(ordinal: int, holidays: frozenset) -> bool:
+    """
+    逐日判断是否为交易日（带缓存，相同日期和节假日配置直接命中）
+    
+    Args:
+        ordinal: 日期序号
+        holidays: 生效的节假日集合，元素为 月*100+日 的整数
+        
+    Returns:
+        bool: True表示是交易日
+    """
+    date_obj = date.fromordinal(ordinal)
+    if date_obj.weekday() >= 5:
+        return False
+    return not holidays or (date_obj.month * 100 + date_obj.day) not in holidays
 
 
 class TradingDayHelper:
@@ -29,6 +53,10 @@ class TradingDayHelper:
         '10-01', '10-02', '10-03', '10-04', '10-05', '10-06', '10-07',
     ]
     
+    # 交易日位图覆盖的年份范围，范围外的日期逐日判断
+    BITMAP_START_YEAR = 1990
+    BITMAP_END_YEAR = 2050
+    
     def __init__(self, holidays: List[str] = None, use_simplified: bool = True):
         """
         初始化交易日助手
@@ -47,6 +75,79 @@ class TradingDayHelper:
         # 添加默认节假日
         if not self.use_simplified and holidays is None:
             self.holidays = set(self.DEFAULT_HOLIDAYS)
+        
+        # 节假日整数键（月*100+日）快照，用于节假日判断及逐日判断缓存，节假日变化时随之更新
+        self._holiday_ints = self._make_holiday_ints()
+        
+        # 交易日位图：第 i 位表示 _bitmap_start + i 这一天是否为交易日（首次使用时构建）
+        self._bitmap_start = date(self.BITMAP_START_YEAR, 1, 1).toordinal()
+        self._bitmap_end = date(self.BITMAP_END_YEAR, 12, 31).toordinal()
+        self._bitmap = None
+    
+    def _make_holiday_ints(self) -> frozenset:
+        """将当前生效节假日转换为 月*100+日 的整数集合（简化模式下为空）"""
+        if self.use_simplified:
+            return frozenset()
+        return frozenset(int(h[:2]) * 100 + int(h[3:]) for h in self.holidays)
+    
+    def _get_bitmap(self) -> bytearray:
+        """
+        获取交易日位图，未构建时按当前节假日配置构建
+        
+        Returns:
+            bytearray: 交易日位图
+        """
+        if self._bitmap is None:
+            mask = self._trading_mask(self._bitmap_start, self._bitmap_end)
+            self._bitmap = bytearray(np.packbits(mask, bitorder='little').tobytes())
+        return self._bitmap
+    
+    def _trading_mask(self, start_ordinal: int, end_ordinal: int) -> np.ndarray:
+        """
+        用 NumPy 按日期序号计算区间（包含两端）内每天是否为交易日
+        
+        星期由序号直接取模得到，节假日按 月*100+日 整数键批量匹配，
+        无需按年份展开节假日，多年区间也只做几次向量运算
+        
+        Args:
+            start_ordinal: 开始日期序号
+            end_ordinal: 结束日期序号
+            
+        Returns:
+            np.ndarray: 布尔数组，第 i 个元素对应 start_ordinal + i
+        """
+        ordinals = np.arange(start_ordinal, end_ordinal + 1, dtype='int64')
+        # 序号 1 (0001-01-01) 为周一，(序号 + 6) % 7 即 weekday()
+        mask = (ordinals + 6) % 7 < 5
+        
+        if self._holiday_ints:
+            days = (ordinals - _EPOCH_ORDINAL).astype('datetime64[D]')
+            months = days.astype('datetime64[M]')
+            keys = ((months.astype('int64') % 12 + 1) * 100
+                    + (days - months).astype('int64') + 1)
+            mask &= ~np.isin(keys, np.fromiter(self._holiday_ints, dtype='int64'))
+        
+        return mask
+    
+    def _in_bitmap(self, start_ordinal: int, end_ordinal: int) -> bool:
+        """判断日期序号区间是否完全落在位图范围内"""
+        return self._bitmap_start <= start_ordinal and end_ordinal <= self._bitmap_end
+    
+    def _bitmap_bits(self, start_ordinal: int, end_ordinal: int) -> int:
+        """
+        取出位图中指定区间（包含两端）的位
+        
+        Args:
+            start_ordinal: 开始日期序号
+            end_ordinal: 结束日期序号
+            
+        Returns:
+            int: 区间内的位，最低位对应开始日期
+        """
+        a = start_ordinal - self._bitmap_start
+        b = end_ordinal - self._bitmap_start
+        bits = int.from_bytes(self._get_bitmap()[a >> 3:(b >> 3) + 1], 'little')
+        return (bits >> (a & 7)) & ((1 << (b - a + 1)) - 1)
     
     def is_weekend(self, date_obj: date) -> bool:
         """
@@ -70,11 +171,7 @@ class TradingDayHelper:
         Returns:
             bool: True表示是节假日
         """
-        if self.use_simplified:
-            return False
-        
-        holiday_str = date_obj.strftime('%m-%d')
-        return holiday_str in self.holidays
+        return (date_obj.month * 100 + date_obj.day) in self._holiday_ints
     
     def is_trading_day(self, date_obj: date) -> bool:
         """
@@ -86,7 +183,23 @@ class TradingDayHelper:
         Returns:
             bool: True表示是交易日
         """
-        return not self.is_weekend(date_obj) and not self.is_holiday(date_obj)
+        ordinal = date_obj.toordinal()
+        if self._bitmap_start <= ordinal <= self._bitmap_end:
+            offset = ordinal - self._bitmap_start
+            return bool((self._get_bitmap()[offset >> 3] >> (offset & 7)) & 1)
+        return self._compute_trading_day(date_obj)
+    
+    def _compute_trading_day(self, date_obj: date) -> bool:
+        """
+        按周末和节假日规则逐日判断是否为交易日（不查位图，结果按日期缓存）
+        
+        Args:
+            date_obj: 日期对象
+            
+        Returns:
+            bool: True表示是交易日
+        """
+        return _trading_flag(date_obj.toordinal(), self._holiday_ints)
     
     def has_trading_days_between(self, start_date: date, end_date: date) -> bool:
         """
@@ -105,13 +218,12 @@ class TradingDayHelper:
         if start_date == end_date:
             return self.is_trading_day(start_date)
         
-        current_date = start_date
-        while current_date <= end_date:
-            if self.is_trading_day(current_date):
-                return True
-            current_date += timedelta(days=1)
+        start_ordinal = start_date.toordinal()
+        end_ordinal = end_date.toordinal()
+        if self._in_bitmap(start_ordinal, end_ordinal):
+            return self._bitmap_bits(start_ordinal, end_ordinal) != 0
         
-        return False
+        return bool(self._trading_mask(start_ordinal, end_ordinal).any())
     
     def get_trading_days_between(self, start_date: date, end_date: date) -> List[date]:
         """
@@ -124,13 +236,21 @@ class TradingDayHelper:
         Returns:
             List[date]: 交易日列表
         """
-        trading_days = []
-        current_date = start_date
-        while current_date <= end_date:
-            if self.is_trading_day(current_date):
-                trading_days.append(current_date)
-            current_date += timedelta(days=1)
-        return trading_days
+        if start_date > end_date:
+            return []
+        
+        start_ordinal = start_date.toordinal()
+        end_ordinal = end_date.toordinal()
+        if self._in_bitmap(start_ordinal, end_ordinal):
+            a = start_ordinal - self._bitmap_start
+            b = end_ordinal - self._bitmap_start
+            chunk = np.frombuffer(self._get_bitmap(), dtype=np.uint8)[a >> 3:(b >> 3) + 1]
+            mask = np.unpackbits(chunk, bitorder='little')[a & 7:(a & 7) + b - a + 1]
+        else:
+            mask = self._trading_mask(start_ordinal, end_ordinal)
+        
+        offsets = np.flatnonzero(mask) + (start_ordinal - _EPOCH_ORDINAL)
+        return offsets.astype('datetime64[D]').tolist()
     
     def count_trading_days_between(self, start_date: date, end_date: date) -> int:
         """
@@ -143,13 +263,15 @@ class TradingDayHelper:
         Returns:
             int: 交易日数量
         """
-        count = 0
-        current_date = start_date
-        while current_date <= end_date:
-            if self.is_trading_day(current_date):
-                count += 1
-            current_date += timedelta(days=1)
-        return count
+        if start_date > end_date:
+            return 0
+        
+        start_ordinal = start_date.toordinal()
+        end_ordinal = end_date.toordinal()
+        if self._in_bitmap(start_ordinal, end_ordinal):
+            return bin(self._bitmap_bits(start_ordinal, end_ordinal)).count('1')
+        
+        return int(np.count_nonzero(self._trading_mask(start_ordinal, end_ordinal)))
     
     def add_holidays(self, holidays: List[str]):
         """
@@ -159,6 +281,8 @@ class TradingDayHelper:
             holidays: 节假日列表，格式为 'MM-DD'
         """
         self.holidays.update(holidays)
+        self._holiday_ints = self._make_holiday_ints()
+        self._bitmap = None
     
     def remove_holidays(self, holidays: List[str]):
         """
@@ -169,6 +293,8 @@ class TradingDayHelper:
         """
         for holiday in holidays:
             self.holidays.discard(holiday)
+        self._holiday_ints = self._make_holiday_ints()
+        self._bitmap = None
     
     def get_next_trading_day(self, date_obj: date, max_days: int = 7) -> date:
         """
@@ -9,7 +9,12 @@ Flask Web应用创建和配置
 5. 系统设置
 """
 
+import re
+from datetime import datetime
+from functools import lru_cache
+
 from flask import Flask, render_template, request
+from markupsafe import Markup
 from app.utils import get_config, get_logger
 
 logger = get_logger(__name__)
@@ -37,10 +42,18 @@ def create_web_app(config=None):
     app.config['JSON_AS_ASCII'] = False
     app.config['SECRET_KEY'] = config.get('web', {}).get('secret_key', 'dev-secret-key')
     
+    # Web页面访问API的基础URL
+    api_port = config.get('api', {}).get('port', 5000)
+    app.config['API_BASE_URL'] = f"http://localhost:{api_port}/api"
+    
     # 配置自定义JSON提供者，格式化datetime对象
     from app.web.json_provider import CustomJSONProvider
     app.json = CustomJSONProvider(app)
     
+    # 启用响应压缩（页面和API响应）
+    from app.api.app import enable_compression
+    enable_compression(app)
+    
     # 注册Web路由蓝图
     from app.web.routes import (
         dashboard_bp,
@@ -77,6 +90,12 @@ def create_web_app(config=None):
     
     logger.info("API路由注册完成")
     
+    # Web页面直接在进程内调用API，不经过本机HTTP
+    if config.get('web', {}).get('inprocess_api', False):
+        from app.web.http_client import enable_inprocess_api
+        enable_inprocess_api(app)
+        logger.info("Web页面已启用进程内API调用")
+    
     # 注册错误处理器
     register_error_handlers(app)
     
@@ -91,9 +110,18 @@ def create_web_app(config=None):
     return app
 
 
+# 外部请求访问Web端口上的API接口时无需认证的路径
+WEB_PUBLIC_PATHS = frozenset([
+    '/api/auth/login',
+    '/api/auth/register',
+    '/api/system/health'
+])
+
+
 def register_request_hooks(app):
     """注册请求钩子"""
-    from flask import request, jsonify, g
+    from app.api.app import PUBLIC_PATHS, authenticate_request
+    from app.web.http_client import INPROCESS_ENVIRON_KEY
     
     @app.before_request
     def before_request():
@@ -101,43 +129,11 @@ def register_request_hooks(app):
         # 仅对 API 请求进行认证检查
         if not request.path.startswith('/api/'):
             return
-            
-        # 认证逻辑
-        if request.method == 'OPTIONS':
-            return
-            
-        # 白名单
-        public_paths = [
-            '/api/auth/login',
-            '/api/auth/register',
-            '/api/system/health'
-        ]
-        
-        if request.path in public_paths:
-            return
-            
-        # 获取 Token
-        auth_header = request.headers.get('Authorization')
-        if not auth_header:
-            return jsonify({'error': 'Missing Authorization header'}), 401
-            
-        try:
-            parts = auth_header.split()
-            if len(parts) != 2 or parts[0].lower() != 'bearer':
-                return jsonify({'error': 'Invalid token type'}), 401
-            token = parts[1]
-        except ValueError:
-            return jsonify({'error': 'Invalid Authorization header'}), 401
-            
-        # 验证 Token
-        from app.utils.auth import AuthUtils
         
-        payload = AuthUtils.verify_token(token)
-        if not payload:
-            return jsonify({'error': 'Invalid or expired token'}), 401
-            
-        # 设置用户信息到上下文
-        g.user = payload
+        # 进程内调用（代替访问API端口）沿用API应用的白名单，外部请求只放行登录、注册和健康检查
+        if request.environ.get(INPROCESS_ENVIRON_KEY):
+            return authenticate_request(PUBLIC_PATHS)
+        return authenticate_request(WEB_PUBLIC_PATHS)
 
 
 def register_error_handlers(app):
@@ -159,9 +155,62 @@ def register_error_handlers(app):
                              error_message='服务器内部错误'), 500
 
 
+# 日期时间字符串中的毫秒部分（如 ",123" 或 ".123456"）
+_TS_FRACTION_RE = re.compile(r'[,.]\d*')
+
+
+@lru_cache(maxsize=4096)
+def _format_datetime_str(value: str, format: str) -> str:
+    """解析日期时间字符串并格式化（带缓存）"""
+    # 去掉毫秒，只保留 'YYYY-MM-DD HH:MM:SS' 部分
+    value = _TS_FRACTION_RE.sub('', value)
+    if len(value) != 19:
+        raise ValueError(f"无法解析的日期时间: {value}")
+    dt = datetime.fromisoformat(value)
+    return dt.strftime(format)
+
+
+@lru_cache(maxsize=4096)
+def _format_float(value, decimals: int, suffix: str = '') -> str:
+    """按小数位数格式化数字（带缓存）"""
+    return f'{float(value):.{decimals}f}{suffix}'
+
+
+@lru_cache(maxsize=4096)
+def _format_large_number(value) -> str:
+    """格式化大数字（带缓存）"""
+    num = float(value)
+    if num >= 100000000:
+        return f'{num/100000000:.2f}亿'
+    elif num >= 10000:
+        return f'{num/10000:.2f}万'
+    else:
+        return str(int(num))
+
+
+# 涨跌幅的HTML模板（已标记为安全，Jinja不再转义）
+_PCT_RISE_HTML = '<span class="text-rise">+{}</span>'
+_PCT_FALL_HTML = '<span class="text-fall">{}</span>'
+
+
+@lru_cache(maxsize=4096)
+def _format_pct_change(value) -> str:
+    """格式化涨跌幅（带缓存），涨跌时返回带颜色的 Markup"""
+    pct = float(value)
+    formatted = f'{pct:.2f}%'
+    if pct > 0:
+        return Markup(_PCT_RISE_HTML.format(formatted))
+    elif pct < 0:
+        return Markup(_PCT_FALL_HTML.format(formatted))
+    else:
+        return formatted
+
+
 def register_template_filters(app):
     """注册模板过滤器"""
     
+    # 表格中大量单元格的值相同，格式化结果按值缓存；无法格式化（或不可哈希）的值原样返回
+    
     @app.template_filter('datetime')
     def format_datetime(value, format='%Y-%m-%d %H:%M:%S'):
         """格式化日期时间"""
@@ -170,14 +219,7 @@ def register_template_filters(app):
         # 如果是字符串，尝试解析
         if isinstance(value, str):
             try:
-                from datetime import datetime
-                # 处理带逗号的时间格式
-                value = value.replace(',', '')
-                # 只保留日期时间部分，去掉毫秒
-                if '.' in value:
-                    value = value.split('.')[0]
-                dt = datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
-                return dt.strftime(format)
+                return _format_datetime_str(value, format)
             except:
                 return value
         # 如果是datetime对象，直接格式化
@@ -192,7 +234,7 @@ def register_template_filters(app):
         if value is None:
             return '-'
         try:
-            return f'{float(value):.{decimals}f}'
+            return _format_float(value, decimals)
         except:
             return value
     
@@ -202,7 +244,7 @@ def register_template_filters(app):
         if value is None:
             return '-'
         try:
-            return f'{float(value):.{decimals}f}%'
+            return _format_float(value, decimals, '%')
         except:
             return value
     
@@ -212,13 +254,7 @@ def register_template_filters(app):
         if value is None:
             return '-'
         try:
-            num = float(value)
-            if num >= 100000000:
-                return f'{num/100000000:.2f}亿'
-            elif num >= 10000:
-                return f'{num/10000:.2f}万'
-            else:
-                return str(int(num))
+            return _format_large_number(value)
         except:
             return value
     
@@ -228,13 +264,6 @@ def register_template_filters(app):
         if value is None:
             return '-'
         try:
-            pct = float(value)
-            formatted = f'{pct:.2f}%'
-            if pct > 0:
-                return f'<span class="text-rise">+{formatted}</span>'
-            elif pct < 0:
-                return f'<span class="text-fall">{formatted}</span>'
-            else:
-                return formatted
+            return _format_pct_change(value)
         except:
             return value
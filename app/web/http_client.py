@@ -0,0 +1,249 @@
+"""
+Web页面访问后端API使用的HTTP会话
+
+所有Web路由共享同一个 requests.Session，借助连接池复用到API服务的连接，
+避免每次渲染页面都重新建立TCP连接
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+import requests
+from flask import current_app, g, request
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+
+# 未显式指定时使用的请求超时（秒）
+DEFAULT_TIMEOUT = 5
+
+# GET响应缓存的最大条目数
+_RESPONSE_CACHE_MAXSIZE = 512
+
+# 进程内调用时写入内层请求 environ 的标记，Web应用据此对内层请求使用API应用的白名单
+INPROCESS_ENVIRON_KEY = 'stock_app.inprocess'
+
+# 并发请求多个API接口使用的线程池（等待网络时释放GIL）
+API_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='web-api')
+
+
+class APIResponse(requests.Response):
+    """API响应，安装了 orjson 时用 orjson 解析JSON"""
+    
+    def json(self, **kwargs):
+        """解析响应体中的JSON"""
+        if kwargs:
+            return super().json(**kwargs)
+        return json_loads(self.content)
+
+
+class APISession(requests.Session):
+    """带默认超时的HTTP会话"""
+    
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT):
+        """
+        初始化HTTP会话
+        
+        Args:
+            timeout: 默认请求超时（秒）
+        """
+        super().__init__()
+        self.timeout = timeout
+        
+        # 连接失败时自动重试（默认只重试GET等幂等请求），应对API服务重启时连接池中的失效连接
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        )
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+        self.headers.update({'Accept': 'application/json'})
+        
+        # 会话在所有用户之间共享，认证信息只通过请求头传递，不保存任何响应Cookie
+        self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        
+        # 只访问本机API：不读取环境变量中的代理、证书和 .netrc 配置（每次请求都会查找）
+        self.trust_env = False
+        self.headers['Connection'] = 'keep-alive'
+    
+    def request(self, method, url, **kwargs):
+        """发送请求，未指定超时时使用默认超时"""
+        kwargs.setdefault('timeout', self.timeout)
+        response = super().request(method, url, **kwargs)
+        response.__class__ = APIResponse
+        return response
+
+
+class WSGIAdapter(BaseAdapter):
+    """
+    进程内调用的传输适配器
+    
+    Web应用本身也注册了全部API蓝图，挂载该适配器后，发往本机API地址的请求
+    直接交给Flask应用处理，不经过TCP连接和HTTP服务器
+    """
+    
+    def __init__(self, app):
+        """
+        初始化适配器
+        
+        Args:
+            app: 处理请求的Flask应用
+        """
+        super().__init__()
+        self.app = app
+    
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """
+        在当前进程内处理请求
+        
+        Args:
+            request: requests.PreparedRequest
+            
+        Returns:
+            requests.Response
+        """
+        url = urlsplit(request.url)
+        path = url.path + ('?' + url.query if url.query else '')
+        
+        # 进程内调用无需压缩响应（返回的内容也不会再经过解压）
+        headers = dict(request.headers)
+        headers.pop('Accept-Encoding', None)
+        
+        # 在独立的应用上下文中处理：页面请求线程中调用时，内层请求不复用外层请求的 g
+        with self.app.app_context(), self.app.test_client() as client:
+            wsgi_response = client.open(
+                path,
+                method=request.method,
+                headers=headers,
+                data=request.body,
+                environ_base={INPROCESS_ENVIRON_KEY: True}
+            )
+            
+            response = requests.Response()
+            response.status_code = wsgi_response.status_code
+            response.reason = wsgi_response.status.partition(' ')[2]
+            response.headers = CaseInsensitiveDict(wsgi_response.headers)
+            response.encoding = get_encoding_from_headers(response.headers)
+            response._content = wsgi_response.get_data()
+            response.url = request.url
+            response.request = request
+            response.connection = self
+        
+        return response
+    
+    def close(self):
+        """无需释放资源"""
+        pass
+
+
+# 全局共享的HTTP会话
+HTTP = APISession()
+
+
+def api_base_url() -> str:
+    """
+    获取当前应用访问API使用的基础URL（在 create_web_app 中配置）
+    
+    Returns:
+        str: API基础URL
+    """
+    return current_app.config['API_BASE_URL']
+
+
+def load_auth_headers():
+    """
+    根据Cookie中的认证Token生成访问API的认证头，保存到 g.auth_headers
+    
+    作为Web蓝图的 before_request 钩子使用
+    """
+    token = request.cookies.get('auth_token')
+    g.auth_headers = {'Authorization': f'Bearer {token}'} if token else {}
+
+
+def enable_inprocess_api(app):
+    """
+    将发往本机API地址的请求改为进程内调用
+    
+    Args:
+        app: 同时注册了API蓝图的Flask应用
+    """
+    url = urlsplit(app.config['API_BASE_URL'])
+    HTTP.mount(f"{url.scheme}://{url.netloc}/", WSGIAdapter(app))
+
+
+class CachedResponse:
+    """缓存的API响应，只保留状态码和解析后的JSON"""
+    
+    __slots__ = ('status_code', '_payload')
+    
+    def __init__(self, status_code: int, payload):
+        self.status_code = status_code
+        self._payload = payload
+    
+    def json(self):
+        """返回解析后的JSON数据"""
+        return self._payload
+
+
+# 短时响应缓存：键为 (url, 参数, 认证头)，值为 (过期时间, CachedResponse)
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def cached_get(url: str, params: dict = None, headers: dict = None, ttl: float = 5):
+    """
+    带短时缓存的GET请求，同一用户在有效期内重复访问同一接口时直接返回缓存结果
+    
+    只缓存状态码为200的响应，失败响应（如401）每次都会重新请求
+    
+    Args:
+        url: 请求地址
+        params: 查询参数
+        headers: 请求头（包含认证信息，作为缓存键的一部分）
+        ttl: 缓存有效期（秒）
+    
+    Returns:
+        CachedResponse或requests.Response，均提供 status_code 和 json()
+    """
+    key = (
+        url,
+        frozenset(params.items()) if params else None,
+        (headers or {}).get('Authorization')
+    )
+    now = time.monotonic()
+    
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+        if cached is not None and cached[0] > now:
+            _response_cache.move_to_end(key)
+            return cached[1]
+    
+    response = HTTP.get(url, params=params, headers=headers)
+    if response.status_code != 200:
+        return response
+    
+    cached_response = CachedResponse(response.status_code, response.json())
+    with _response_cache_lock:
+        _response_cache[key] = (now + ttl, cached_response)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > _RESPONSE_CACHE_MAXSIZE:
+            _response_cache.popitem(last=False)
+    
+    return cached_response
+
+
+def clear_response_cache():
+    """清空GET响应缓存（数据变更后调用）"""
+    with _response_cache_lock:
+        _response_cache.clear()
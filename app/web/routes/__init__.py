@@ -1,16 +1,32 @@
-"""Web路由模块"""
-from .dashboard import dashboard_bp
-from .strategy import strategy_bp
-from .stock import stock_bp
-from .system import system_bp
-from .data import data_bp
-from .auth import auth_bp
+"""
+Web路由模块
 
-__all__ = [
-    'dashboard_bp',
-    'strategy_bp',
-    'stock_bp',
-    'system_bp',
-    'data_bp',
-    'auth_bp'
-]
+蓝图在首次访问时才导入对应的路由模块，导入本包或其中单个路由模块时不会连带导入其他路由
+"""
+import importlib
+
+# 蓝图名称 -> 所在模块
+_BLUEPRINT_MODULES = {
+    'dashboard_bp': '.dashboard',
+    'strategy_bp': '.strategy',
+    'stock_bp': '.stock',
+    'system_bp': '.system',
+    'data_bp': '.data',
+    'auth_bp': '.auth'
+}
+
+__all__ = list(_BLUEPRINT_MODULES)
+
+
+def __getattr__(name):
+    """按需导入蓝图"""
+    module_name = _BLUEPRINT_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    blueprint = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = blueprint
+    return blueprint
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,44 +4,43 @@
 显示系统概览和统计信息
 """
 
-from flask import Blueprint, render_template, request, redirect
-import requests
-from app.utils import get_logger, get_config
+from flask import Blueprint, render_template, redirect, g
+from app.web.http_client import API_EXECUTOR, api_base_url, cached_get, load_auth_headers
+from app.utils import get_logger
 
 logger = get_logger(__name__)
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
-# API基础URL
-config = get_config()
-API_BASE_URL = f"http://localhost:{config.get('api', {}).get('port', 5000)}/api"
+# 请求前从Cookie中读取认证Token，生成访问API的认证头（g.auth_headers）
+dashboard_bp.before_request(load_auth_headers)
 
-def get_auth_headers():
-    """获取认证头"""
-    token = request.cookies.get('auth_token')
-    if token:
-        return {'Authorization': f'Bearer {token}'}
-    return {}
 
 @dashboard_bp.route('/')
 def index():
     """仪表板首页"""
     try:
-        headers = get_auth_headers()
+        headers = g.auth_headers
         
-        # 获取系统统计信息
-        stats_response = requests.get(f"{API_BASE_URL}/system/stats", headers=headers, timeout=5)
+        # 三个接口互不依赖，并发请求：系统统计信息、数据源状态、最近的任务日志
+        # 统计和系统信息变化较慢，短时间内的重复访问使用缓存结果
+        stats_future = API_EXECUTOR.submit(
+            cached_get, f"{api_base_url()}/system/stats", headers=headers, ttl=2)
+        info_future = API_EXECUTOR.submit(
+            cached_get, f"{api_base_url()}/system/info", headers=headers, ttl=10)
+        logs_future = API_EXECUTOR.submit(
+            cached_get, f"{api_base_url()}/system/scheduler/logs?limit=5", headers=headers, ttl=2)
+        
+        stats_response = stats_future.result()
         if stats_response.status_code == 401:
             return redirect('/login')
             
         stats = stats_response.json().get('data', {}) if stats_response.status_code == 200 else {}
         
-        # 获取数据源状态
-        info_response = requests.get(f"{API_BASE_URL}/system/info", headers=headers, timeout=5)
+        info_response = info_future.result()
         system_info = info_response.json().get('data', {}) if info_response.status_code == 200 else {}
         
-        # 获取最近的任务日志
-        logs_response = requests.get(f"{API_BASE_URL}/system/scheduler/logs?limit=5", headers=headers, timeout=5)
+        logs_response = logs_future.result()
         recent_logs = logs_response.json().get('data', []) if logs_response.status_code == 200 else []
         
         return render_template('dashboard.html',
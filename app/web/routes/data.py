@@ -4,33 +4,26 @@
 提供数据导入、更新和管理功能
 """
 
-from flask import Blueprint, render_template, request, redirect
-import requests
+from flask import Blueprint, render_template, request, redirect, jsonify, g
+from app.web.http_client import HTTP, api_base_url, cached_get, clear_response_cache, load_auth_headers
 from app.utils import get_logger, get_config
 
 logger = get_logger(__name__)
 
 data_bp = Blueprint('data', __name__)
 
-# API基础URL
-config = get_config()
-API_BASE_URL = f"http://localhost:{config.get('api', {}).get('port', 5000)}/api"
+# 请求前从Cookie中读取认证Token，生成访问API的认证头（g.auth_headers）
+data_bp.before_request(load_auth_headers)
 
-def get_auth_headers():
-    """获取认证头"""
-    token = request.cookies.get('auth_token')
-    if token:
-        return {'Authorization': f'Bearer {token}'}
-    return {}
 
 @data_bp.route('/')
 def index():
     """数据管理页面"""
     try:
-        headers = get_auth_headers()
+        headers = g.auth_headers
         
         # 获取数据更新状态
-        response = requests.get(f"{API_BASE_URL}/data/status", headers=headers, timeout=5)
+        response = cached_get(f"{api_base_url()}/data/status", headers=headers, ttl=1)
         if response.status_code == 401:
             return redirect('/login')
             
@@ -41,6 +34,7 @@ def index():
             status = {}
         
         # 检查数据源配置
+        config = get_config()
         datasource_config = {
             'akshare': True,  # Akshare 总是可用的（开源）
             'tushare': False,
@@ -58,43 +52,56 @@ def index():
         return render_template('data/index.html', status={}, error=str(e), datasource={'akshare': True, 'tushare': False})
 
 
+def _task_response(response, message: str, default_error: str):
+    """
+    将API触发任务的响应转换为页面使用的JSON响应
+    
+    Args:
+        response: API响应
+        message: 成功提示
+        default_error: API未返回错误信息时的提示
+        
+    Returns:
+        Flask响应
+    """
+    if response.ok:
+        clear_response_cache()
+        return jsonify(success=True, message=message)
+    
+    # 只有JSON响应才解析错误信息，避免解析HTML错误页
+    error = default_error
+    if response.headers.get('Content-Type', '').startswith('application/json'):
+        error = response.json().get('error', default_error)
+    return jsonify(success=False, error=error)
+
+
 @data_bp.route('/import', methods=['POST'])
 def import_data():
     """触发全量数据导入"""
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/data/import",
-            json=request.get_json() or {},
+        response = HTTP.post(
+            f"{api_base_url()}/data/import",
+            json=request.get_json(silent=True) or {},
             timeout=10
         )
-        
-        if response.status_code == 200:
-            return {'success': True, 'message': '数据导入任务已启动'}
-        else:
-            error = response.json().get('error', '导入失败')
-            return {'success': False, 'error': error}
+        return _task_response(response, '数据导入任务已启动', '导入失败')
     
     except Exception as e:
         logger.error(f"触发数据导入失败: {e}")
-        return {'success': False, 'error': str(e)}
+        return jsonify(success=False, error=str(e))
 
 
 @data_bp.route('/update', methods=['POST'])
 def update_data():
     """触发增量数据更新"""
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/data/update",
-            json=request.get_json() or {},
+        response = HTTP.post(
+            f"{api_base_url()}/data/update",
+            json=request.get_json(silent=True) or {},
             timeout=10
         )
-        
-        if response.status_code == 200:
-            return {'success': True, 'message': '数据更新任务已启动'}
-        else:
-            error = response.json().get('error', '更新失败')
-            return {'success': False, 'error': error}
+        return _task_response(response, '数据更新任务已启动', '更新失败')
     
     except Exception as e:
         logger.error(f"触发数据更新失败: {e}")
-        return {'success': False, 'error': str(e)}
+        return jsonify(success=False, error=str(e))
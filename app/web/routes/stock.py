@@ -4,65 +4,55 @@
 提供股票列表、详情和行情查询功能
 """
 
-from flask import Blueprint, render_template, request, redirect
-import requests
-from app.utils import get_logger, get_config
+from flask import Blueprint, render_template, request, redirect, g
+from app.web.http_client import API_EXECUTOR, HTTP, api_base_url, load_auth_headers
+from app.utils import get_logger
 
 logger = get_logger(__name__)
 
 stock_bp = Blueprint('stock', __name__)
 
-# API基础URL
-config = get_config()
-API_BASE_URL = f"http://localhost:{config.get('api', {}).get('port', 5000)}/api"
+# 前端市场类型 -> API市场参数
+_MARKET_MAP = {
+    '沪市': 'SH',
+    '深市': 'SZ',
+    '北交所': 'BJ'
+}
+
+# 股票列表页展示的字段
+STOCK_LIST_FIELDS = 'code,name,industry,market_type,list_date,status'
+
+# 请求前从Cookie中读取认证Token，生成访问API的认证头（g.auth_headers）
+stock_bp.before_request(load_auth_headers)
 
-def get_auth_headers():
-    """获取认证头"""
-    token = request.cookies.get('auth_token')
-    if token:
-        return {'Authorization': f'Bearer {token}'}
-    return {}
 
 @stock_bp.route('/')
 def index():
     """股票列表页面"""
     try:
-        headers = get_auth_headers()
-        
-        # 获取查询参数
-        params = {}
-        keyword = None
-        market = None
-        
-        # 将前端参数转换为API期望的参数
-        code = request.args.get('code')
-        name = request.args.get('name')
+        headers = g.auth_headers
         
-        # 如果有代码或名称，构建关键词搜索
-        if code or name:
-            keyword = f"{code or ''} {name or ''}".strip()
+        # 默认获取前100只股票，只请求列表页展示的字段
+        params = {'limit': 100, 'fields': STOCK_LIST_FIELDS}
         
-        # 转换市场类型参数
-        market_type = request.args.get('market')
-        if market_type:
-            market_type_map = {
-                '沪市': 'SH',
-                '深市': 'SZ',
-                '北交所': 'BJ'
-            }
-            market = market_type_map.get(market_type)
-        
-        # 构建API参数
-        if keyword:
-            params['keyword'] = keyword
-        if market:
-            params['market'] = market
-        
-        # 默认获取前100只股票
-        params['limit'] = 100
+        # 将前端参数转换为API期望的参数（无查询参数时跳过）
+        args = request.args
+        if args:
+            # 如果有代码或名称，构建关键词搜索
+            code = args.get('code')
+            name = args.get('name')
+            if code or name:
+                keyword = f"{code or ''} {name or ''}".strip()
+                if keyword:
+                    params['keyword'] = keyword
+            
+            # 转换市场类型参数
+            market = _MARKET_MAP.get(args.get('market'))
+            if market:
+                params['market'] = market
         
         # 获取股票列表
-        response = requests.get(f"{API_BASE_URL}/stocks", params=params, headers=headers, timeout=5)
+        response = HTTP.get(f"{api_base_url()}/stocks", params=params, headers=headers, timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -91,10 +81,20 @@ def index():
 def detail(stock_code):
     """股票详情页面"""
     try:
-        headers = get_auth_headers()
+        headers = g.auth_headers
         
-        # 获取股票基本信息
-        response = requests.get(f"{API_BASE_URL}/stocks/{stock_code}", headers=headers, timeout=5)
+        # 并发获取股票基本信息和历史行情数据（最近100天）
+        stock_future = API_EXECUTOR.submit(
+            HTTP.get, f"{api_base_url()}/stocks/{stock_code}", headers=headers, timeout=5)
+        history_future = API_EXECUTOR.submit(
+            HTTP.get,
+            f"{api_base_url()}/stocks/{stock_code}/history",
+            params={'limit': 100},
+            headers=headers,
+            timeout=5
+        )
+        
+        response = stock_future.result()
         if response.status_code == 200:
             stock = response.json().get('data', {})
         elif response.status_code == 401:
@@ -104,13 +104,7 @@ def detail(stock_code):
                                  error_code=404,
                                  error_message='股票不存在')
         
-        # 获取历史行情数据（最近100天）
-        history_response = requests.get(
-            f"{API_BASE_URL}/stocks/{stock_code}/history",
-            params={'limit': 100},
-            headers=headers,
-            timeout=5
-        )
+        history_response = history_future.result()
         if history_response.status_code == 200:
             history_data = history_response.json().get('data', [])
         else:
@@ -5,49 +5,61 @@
 """
 
 from flask import Blueprint, render_template, request
-import requests
-from app.utils import get_logger, get_config
+from app.web.http_client import API_EXECUTOR, HTTP, api_base_url, cached_get
+from app.utils import get_logger
 
 logger = get_logger(__name__)
 
 system_bp = Blueprint('system', __name__)
 
-# API基础URL
-config = get_config()
-API_BASE_URL = f"http://localhost:{config.get('api', {}).get('port', 5000)}/api"
+# 系统信息（端口、日志等，修改后需重启生效）的缓存有效期（秒）
+SYSTEM_INFO_CACHE_TTL = 60
+
+# 数据库状态（含行情数据统计查询）的缓存有效期（秒）
+DATABASE_STATUS_CACHE_TTL = 10
 
 
 @system_bp.route('/')
 def index():
     """系统设置页面"""
     try:
+        # 以下接口互不依赖，并发请求
+        # 可编辑配置在本页修改后需立即显示，不缓存；系统信息和数据库状态变化缓慢，短时缓存
+        config_future = API_EXECUTOR.submit(HTTP.get, f"{api_base_url()}/system/config", timeout=5)
+        info_future = API_EXECUTOR.submit(
+            cached_get, f"{api_base_url()}/system/system-info", ttl=SYSTEM_INFO_CACHE_TTL)
+        db_status_future = API_EXECUTOR.submit(
+            cached_get, f"{api_base_url()}/system/database-status", ttl=DATABASE_STATUS_CACHE_TTL)
+        jobs_future = API_EXECUTOR.submit(HTTP.get, f"{api_base_url()}/system/scheduler/jobs", timeout=5)
+        stats_future = API_EXECUTOR.submit(cached_get, f"{api_base_url()}/system/stats", ttl=2)
+        
         # 获取可编辑配置
-        config_response = requests.get(f"{API_BASE_URL}/system/config", timeout=5)
+        config_response = config_future.result()
         if config_response.status_code == 200:
             system_config = config_response.json().get('data', {})
         else:
             system_config = {}
         
         # 获取系统信息（仅展示）
-        info_response = requests.get(f"{API_BASE_URL}/system/system-info", timeout=5)
+        info_response = info_future.result()
         if info_response.status_code == 200:
             system_info_config = info_response.json().get('data', {})
         else:
             system_info_config = {}
         
         # 获取数据库状态
-        db_status_response = requests.get(f"{API_BASE_URL}/system/database-status", timeout=5)
+        db_status_response = db_status_future.result()
         if db_status_response.status_code == 200:
             database_status = db_status_response.json().get('data', {})
         else:
             database_status = {}
         
         # 获取调度任务列表
-        jobs_response = requests.get(f"{API_BASE_URL}/system/scheduler/jobs", timeout=5)
+        jobs_response = jobs_future.result()
         jobs = jobs_response.json().get('data', []) if jobs_response.status_code == 200 else []
         
         # 获取市场统计信息（用于显示数据范围）
-        stats_response = requests.get(f"{API_BASE_URL}/system/stats", timeout=5)
+        stats_response = stats_future.result()
         stats = stats_response.json().get('data', {}) if stats_response.status_code == 200 else {}
         market_stats = stats.get('market_data', {})
         
@@ -81,7 +93,7 @@ def logs():
             params['module'] = request.args.get('module')
         
         # 获取系统日志
-        response = requests.get(f"{API_BASE_URL}/system/logs", params=params, timeout=5)
+        response = HTTP.get(f"{api_base_url()}/system/logs", params=params, timeout=5)
         if response.status_code == 200:
             data = response.json()
             logs = data.get('data', [])
@@ -108,7 +120,7 @@ def tasks():
     """任务执行历史页面"""
     try:
         # 获取任务执行历史
-        response = requests.get(f"{API_BASE_URL}/system/scheduler/logs?limit=50", timeout=5)
+        response = HTTP.get(f"{api_base_url()}/system/scheduler/logs?limit=50", timeout=5)
         if response.status_code == 200:
             data = response.json()
             tasks = data.get('data', [])
@@ -10,29 +10,49 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from datetime import datetime
-from app.utils import get_logger, setup_logging
-from app.utils.config import get_config
-from app.models.database_factory import DatabaseFactory
+from sqlalchemy import text
+from app.utils import bootstrap, get_logger
 
 
-def check_database_state():
-    """检查当前数据库状态"""
+def check_database_state(database):
+    """
+    检查当前数据库状态
+    
+    Args:
+        database: 数据库实例
+    """
     logger = get_logger(__name__)
     
     try:
-        # 加载配置
-        config = get_config()
-        
-        # 初始化数据库
-        db_factory = DatabaseFactory()
-        database = db_factory.get_database(config=config.get('database.mysql'))
-        
         logger.info("=" * 80)
         logger.info("当前数据库状态")
         logger.info("=" * 80)
         
-        # 1. 统计各种情况的股票数量
-        query = """
+        # 在同一个会话（同一个连接）上执行，只需从连接池取一次连接并检测一次连接有效性
+        with database.get_session() as session:
+            _report_database_state(session, logger)
+        
+        logger.info("\n" + "=" * 80)
+        
+    except Exception as e:
+        logger.error(f"检查失败: {e}", exc_info=True)
+
+
+def _report_database_state(session, logger):
+    """
+    查询并输出数据库状态
+    
+    Args:
+        session: 数据库会话
+        logger: 日志记录器
+    """
+    # 统计数和两类样本（每类最多 3 只）合并为一条查询，一次往返取回：
+    # 统计子查询恰好一行，LEFT JOIN 样本后即使没有样本也会保留统计行
+    query = """
+        SELECT
+            t.total, t.both_null, t.both_not_null, t.only_earliest_null, t.only_latest_null,
+            s.tag, s.code, s.name, s.earliest_data_date, s.latest_data_date
+        FROM (
             SELECT 
                 COUNT(*) as total,
                 SUM(CASE WHEN earliest_data_date IS NULL AND latest_data_date IS NULL THEN 1 ELSE 0 END) as both_null,
@@ -40,57 +60,55 @@ def check_database_state():
                 SUM(CASE WHEN earliest_data_date IS NULL AND latest_data_date IS NOT NULL THEN 1 ELSE 0 END) as only_earliest_null,
                 SUM(CASE WHEN earliest_data_date IS NOT NULL AND latest_data_date IS NULL THEN 1 ELSE 0 END) as only_latest_null
             FROM stocks
-        """
-        stats = database.execute_query(query)[0]
-        
-        logger.info(f"总股票数: {stats['total']}")
-        logger.info(f"两个字段都为 NULL: {stats['both_null']}")
-        logger.info(f"两个字段都有值: {stats['both_not_null']}")
-        logger.info(f"只有 earliest_data_date 为 NULL: {stats['only_earliest_null']}")
-        logger.info(f"只有 latest_data_date 为 NULL: {stats['only_latest_null']}")
-        
-        # 2. 查看一些具体的样本
-        logger.info("\n" + "=" * 80)
-        logger.info("部分更新样本（每个类别最多 3 只）")
-        logger.info("=" * 80)
-        
-        # 只有 earliest_data_date 为 NULL 的样本
-        query = """
-            SELECT code, name, earliest_data_date, latest_data_date
-            FROM stocks
-            WHERE earliest_data_date IS NULL AND latest_data_date IS NOT NULL
-            LIMIT 3
-        """
-        samples = database.execute_query(query)
-        if samples:
-            logger.info("\n只有 earliest_data_date 为 NULL:")
-            for stock in samples:
-                logger.info(f"  {stock['code']} - {stock['name']}: earliest={stock['earliest_data_date']}, latest={stock['latest_data_date']}")
-        
-        # 只有 latest_data_date 为 NULL 的样本
-        query = """
-            SELECT code, name, earliest_data_date, latest_data_date
-            FROM stocks
-            WHERE earliest_data_date IS NOT NULL AND latest_data_date IS NULL
-            LIMIT 3
-        """
-        samples = database.execute_query(query)
+        ) t
+        LEFT JOIN (
+            (
+                SELECT 'only_earliest_null' as tag, code, name, earliest_data_date, latest_data_date
+                FROM stocks
+                WHERE earliest_data_date IS NULL AND latest_data_date IS NOT NULL
+                LIMIT 3
+            )
+            UNION ALL
+            (
+                SELECT 'only_latest_null' as tag, code, name, earliest_data_date, latest_data_date
+                FROM stocks
+                WHERE earliest_data_date IS NOT NULL AND latest_data_date IS NULL
+                LIMIT 3
+            )
+        ) s ON TRUE
+    """
+    rows = session.execute(text(query)).mappings().all()
+    
+    # 1. 统计各种情况的股票数量
+    stats = rows[0]
+    
+    logger.info(f"总股票数: {stats['total']}")
+    logger.info(f"两个字段都为 NULL: {stats['both_null']}")
+    logger.info(f"两个字段都有值: {stats['both_not_null']}")
+    logger.info(f"只有 earliest_data_date 为 NULL: {stats['only_earliest_null']}")
+    logger.info(f"只有 latest_data_date 为 NULL: {stats['only_latest_null']}")
+    
+    # 2. 查看一些具体的样本
+    logger.info("\n" + "=" * 80)
+    logger.info("部分更新样本（每个类别最多 3 只）")
+    logger.info("=" * 80)
+    
+    sample_titles = [
+        ('only_earliest_null', "\n只有 earliest_data_date 为 NULL:"),
+        ('only_latest_null', "\n只有 latest_data_date 为 NULL:"),
+    ]
+    for tag, title in sample_titles:
+        samples = [row for row in rows if row['tag'] == tag]
         if samples:
-            logger.info("\n只有 latest_data_date 为 NULL:")
+            logger.info(title)
             for stock in samples:
                 logger.info(f"  {stock['code']} - {stock['name']}: earliest={stock['earliest_data_date']}, latest={stock['latest_data_date']}")
-        
-        logger.info("\n" + "=" * 80)
-        
-    except Exception as e:
-        logger.error(f"检查失败: {e}", exc_info=True)
 
 
 if __name__ == "__main__":
-    # 加载配置并初始化日志系统
-    config = get_config()
-    setup_logging(config)
+    # 加载配置、初始化日志系统和数据库
+    config, database = bootstrap()
     
     logger = get_logger(__name__)
     
-    check_database_state()
+    check_database_state(database)
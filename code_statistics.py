@@ -6,55 +6,80 @@
 
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# 按块读取文件的块大小（1 MiB）
+READ_CHUNK_SIZE = 1 << 20
+
+# 文件数达到该值时使用多进程并行统计（文件较少时进程启动开销大于收益）
+PARALLEL_MIN_FILES = 256
+
+# 代码文件扩展名
+CODE_EXTENSIONS = frozenset({
+    '.py',    # Python
+    '.js',    # JavaScript
+    '.html',  # HTML
+    '.css',   # CSS
+    '.sh',    # Shell脚本
+    '.yaml',  # YAML配置
+    '.yml',   # YAML配置
+    '.sql',   # SQL脚本
+    '.java',  # Java
+    '.cpp',   # C++
+    '.c',     # C
+    '.h',     # C头文件
+    '.php',   # PHP
+    '.rb',    # Ruby
+    '.go',    # Go
+    '.rs',    # Rust
+    '.ts',    # TypeScript
+    '.vue',   # Vue.js
+    '.jsx',   # React JSX
+    '.tsx',   # React TSX
+})
+
+# 文档文件扩展名
+DOC_EXTENSIONS = frozenset({'.md'})
+
+# 统计时忽略的目录
+IGNORE_DIRS = frozenset({
+    '.git', '.svn', '.hg', '.idea', '.vscode',
+    '__pycache__', 'node_modules', 'venv', 'env',
+    '.codebuddy', 'logs', 'data'
+})
+
 def count_lines_in_file(file_path):
-    """统计单个文件的行数"""
+    """统计单个文件的行数（按块读取二进制内容统计换行符，不解码、不逐行创建字符串）"""
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return len(f.readlines())
+        lines = 0
+        last_chunk = b''
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                lines += chunk.count(b'\n')
+                last_chunk = chunk
+        # 最后一行没有换行符时也算一行
+        if last_chunk and not last_chunk.endswith(b'\n'):
+            lines += 1
+        return lines
     except Exception as e:
         print(f"警告: 无法读取文件 {file_path}: {e}")
         return 0
 
 def is_code_file(file_path):
     """判断是否为代码文件"""
-    code_extensions = {
-        '.py',    # Python
-        '.js',    # JavaScript
-        '.html',  # HTML
-        '.css',   # CSS
-        '.sh',    # Shell脚本
-        '.yaml',  # YAML配置
-        '.yml',   # YAML配置
-        '.sql',   # SQL脚本
-        '.java',  # Java
-        '.cpp',   # C++
-        '.c',     # C
-        '.h',     # C头文件
-        '.php',   # PHP
-        '.rb',    # Ruby
-        '.go',    # Go
-        '.rs',    # Rust
-        '.ts',    # TypeScript
-        '.vue',   # Vue.js
-        '.jsx',   # React JSX
-        '.tsx',   # React TSX
-    }
-    return file_path.suffix.lower() in code_extensions
+    return file_path.suffix.lower() in CODE_EXTENSIONS
 
 def is_doc_file(file_path):
     """判断是否为文档文件"""
-    return file_path.suffix.lower() == '.md'
+    return file_path.suffix.lower() in DOC_EXTENSIONS
 
 def should_ignore_directory(dir_name):
     """判断是否应该忽略的目录"""
-    ignore_dirs = {
-        '.git', '.svn', '.hg', '.idea', '.vscode',
-        '__pycache__', 'node_modules', 'venv', 'env',
-        '.codebuddy', 'logs', 'data'
-    }
-    return dir_name in ignore_dirs
+    return dir_name in IGNORE_DIRS
 
 def analyze_project(directory_path):
     """分析项目代码行数和文档行数"""
@@ -72,23 +97,37 @@ def analyze_project(directory_path):
     print(f"正在分析项目: {directory_path}")
     print("-" * 60)
     
+    code_files = []
+    doc_files = []
     for root, dirs, files in os.walk(directory):
         # 过滤需要忽略的目录
         dirs[:] = [d for d in dirs if not should_ignore_directory(d)]
         
         for file in files:
-            file_path = Path(root) / file
+            # 遍历时只使用字符串路径，避免为每个文件创建 Path 对象；扩展名只计算一次
+            file_path = os.path.join(root, file)
+            ext = os.path.splitext(file)[1].lower()
             
-            if is_code_file(file_path):
-                lines = count_lines_in_file(file_path)
-                ext = file_path.suffix.lower()
-                code_stats[ext] = code_stats.get(ext, 0) + lines
-                total_code_lines += lines
-                
-            elif is_doc_file(file_path):
-                lines = count_lines_in_file(file_path)
-                doc_stats[file_path.relative_to(directory)] = lines
-                total_doc_lines += lines
+            if ext in CODE_EXTENSIONS:
+                code_files.append((ext, file_path))
+            elif ext in DOC_EXTENSIONS:
+                doc_files.append(file_path)
+    
+    # 各文件的行数统计互不依赖，文件较多时使用多进程并行统计
+    all_files = [file_path for _, file_path in code_files] + doc_files
+    if len(all_files) >= PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor() as executor:
+            all_lines = list(executor.map(count_lines_in_file, all_files, chunksize=32))
+    else:
+        all_lines = [count_lines_in_file(file_path) for file_path in all_files]
+    
+    for (ext, _), lines in zip(code_files, all_lines):
+        code_stats[ext] = code_stats.get(ext, 0) + lines
+        total_code_lines += lines
+    
+    for file_path, lines in zip(doc_files, all_lines[len(code_files):]):
+        doc_stats[os.path.relpath(file_path, directory)] = lines
+        total_doc_lines += lines
     
     return {
         'code_stats': code_stats,
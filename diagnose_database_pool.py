@@ -11,6 +11,209 @@ from app.utils import get_config, get_logger
 logger = get_logger(__name__)
 
 
+def percentile(sorted_values: list, pct: float) -> float:
+    """
+    计算已排序数据的百分位数（最近秩法）
+    
+    Args:
+        sorted_values: 升序排列的数据
+        pct: 百分位（0-100）
+        
+    Returns:
+        百分位数
+    """
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_concurrent_probe(concurrent_count: int, sleep_seconds: float = 0.1, engine=None) -> dict:
+    """
+    并发执行探测查询，统计每个探测从请求连接到得到结果的耗时
+    
+    探测与应用共用同一个连接池，并发数超过连接池容量（size + max_overflow）时，
+    等待连接的耗时会体现在延迟分布中
+    
+    Args:
+        concurrent_count: 并发探测数
+        sleep_seconds: 每个探测在数据库中占用连接的时间（秒）
+        engine: 使用的SQLAlchemy引擎（默认使用应用的数据库实例）
+        
+    Returns:
+        dict: 包含 results（每个探测的结果）、elapsed（总耗时）、latencies（成功探测的耗时，升序）
+    """
+    import concurrent.futures
+    
+    query = f"SELECT SLEEP({sleep_seconds}) as test"
+    
+    def probe(conn_id):
+        start = time.perf_counter()
+        try:
+            if engine is None:
+                get_database().execute_query(query)
+            else:
+                with engine.connect() as conn:
+                    conn.execute(text(query))
+            return {'id': conn_id, 'success': True, 'latency': time.perf_counter() - start}
+        except Exception as e:
+            return {'id': conn_id, 'success': False, 'error': str(e)}
+    
+    start_time = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrent_count) as executor:
+        results = list(executor.map(probe, range(concurrent_count)))
+    elapsed = time.perf_counter() - start_time
+    
+    latencies = sorted(r['latency'] for r in results if r['success'])
+    return {'results': results, 'elapsed': elapsed, 'latencies': latencies}
+
+
+# 连接池大小扫描的取值（参照 客户端并发数 × 连接池大小 的压测矩阵）
+SWEEP_POOL_SIZES = (10, 25, 50, 100)
+SWEEP_CONCURRENCY = (2, 5, 10, 20, 50)
+
+# 连接池再增大时吞吐量提升低于该比例，即认为到达拐点
+SWEEP_MIN_GAIN = 0.05
+
+
+def sweep_pool_sizes(csv_path: str = None) -> int:
+    """
+    在不同连接池大小和并发数下执行探测，输出吞吐量和p95延迟，并推荐连接池大小
+    
+    每个连接池大小使用独立的临时引擎（max_overflow=0，连接池大小即连接上限），
+    推荐值为继续增大连接池时最高并发下吞吐量提升不足 SWEEP_MIN_GAIN 的最小连接池大小
+    
+    Args:
+        csv_path: 结果CSV文件路径（可选）
+        
+    Returns:
+        int: 推荐的连接池大小，扫描失败时返回None
+    """
+    from sqlalchemy import create_engine
+    
+    print("\n" + "=" * 60)
+    print("连接池大小扫描")
+    print("=" * 60)
+    
+    db = get_database()
+    if not (hasattr(db, 'orm_db') and hasattr(db.orm_db, 'engine')):
+        print("  ⚠️  当前数据库实例不是ORM模式，无法扫描连接池大小")
+        return None
+    
+    url = db.orm_db.engine.url
+    rows = []
+    peak_throughput = {}
+    
+    print(f"\n  {'pool_size':>9} {'clients':>7} {'ops/s':>8} {'p95(s)':>8} {'失败':>4}")
+    for pool_size in SWEEP_POOL_SIZES:
+        engine = create_engine(url, pool_size=pool_size, max_overflow=0, pool_pre_ping=True)
+        try:
+            for clients in SWEEP_CONCURRENCY:
+                probe = run_concurrent_probe(clients, engine=engine)
+                latencies = probe['latencies']
+                throughput = len(latencies) / probe['elapsed'] if probe['elapsed'] else 0
+                p95 = percentile(latencies, 95) if latencies else None
+                failed = clients - len(latencies)
+                rows.append((pool_size, clients, throughput, p95, failed))
+                p95_text = f"{p95:.3f}" if p95 is not None else '-'
+                print(f"  {pool_size:>9} {clients:>7} {throughput:>8.1f} {p95_text:>8} {failed:>4}")
+            peak_throughput[pool_size] = rows[-1][2]
+        finally:
+            engine.dispose()
+    
+    if csv_path:
+        import csv
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['pool_size', 'clients', 'ops_per_sec', 'p95_seconds', 'failed'])
+            writer.writerows(rows)
+        print(f"\n  结果已写入: {csv_path}")
+    
+    # 找拐点：继续增大连接池时吞吐量提升不足 SWEEP_MIN_GAIN
+    recommended = SWEEP_POOL_SIZES[-1]
+    for smaller, larger in zip(SWEEP_POOL_SIZES, SWEEP_POOL_SIZES[1:]):
+        base = peak_throughput[smaller]
+        if base and (peak_throughput[larger] - base) / base < SWEEP_MIN_GAIN:
+            recommended = smaller
+            break
+    
+    print(f"\n  RECOMMEND pool_size={recommended}")
+    return recommended
+
+
+# 数据库服务器状态（需要MySQL 5.7及以上版本的 performance_schema.global_status）
+SERVER_STATUS_QUERY = """
+    SELECT
+        (SELECT VARIABLE_VALUE FROM performance_schema.global_status
+         WHERE VARIABLE_NAME = 'Threads_connected') AS threads_connected,
+        @@GLOBAL.max_connections AS max_connections,
+        @@GLOBAL.wait_timeout AS wait_timeout
+"""
+
+
+# ProxySQL 连接复用情况（需要在 database.proxysql 中配置管理接口）
+PROXYSQL_GLOBAL_QUERY = """
+    SELECT Variable_Name, Variable_Value FROM stats_mysql_global
+    WHERE Variable_Name IN ('Client_Connections_connected', 'Server_Connections_connected')
+"""
+PROXYSQL_POOL_QUERY = """
+    SELECT hostgroup, srv_host, srv_port, status, ConnUsed, ConnFree, ConnERR, Latency_us
+    FROM stats_mysql_connection_pool
+"""
+
+
+def report_proxysql_stats(proxysql_config: dict) -> bool:
+    """
+    通过 ProxySQL 管理接口报告前后端连接数和连接复用比
+    
+    应用连接 ProxySQL 时，后端 MySQL 连接由 ProxySQL 复用，
+    复用比 = 客户端连接数 / 后端连接数，越大说明节省的 MySQL 连接越多
+    
+    Args:
+        proxysql_config: ProxySQL 管理接口配置（host、admin_port、admin_username、admin_password）
+        
+    Returns:
+        bool: 是否成功获取
+    """
+    import pymysql
+    
+    print(f"\nProxySQL 连接复用情况...")
+    try:
+        conn = pymysql.connect(
+            host=proxysql_config.get('host', '127.0.0.1'),
+            port=proxysql_config.get('admin_port', 6032),
+            user=proxysql_config.get('admin_username', 'admin'),
+            password=proxysql_config.get('admin_password', 'admin'),
+            connect_timeout=5
+        )
+    except Exception as e:
+        print(f"  ⚠️  无法连接 ProxySQL 管理接口: {e}")
+        return False
+    
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(PROXYSQL_GLOBAL_QUERY)
+            stats = {name: int(value) for name, value in cursor.fetchall()}
+            cursor.execute(PROXYSQL_POOL_QUERY)
+            backends = cursor.fetchall()
+    except Exception as e:
+        print(f"  ⚠️  查询 ProxySQL 统计信息失败: {e}")
+        return False
+    finally:
+        conn.close()
+    
+    client_connections = stats.get('Client_Connections_connected', 0)
+    server_connections = stats.get('Server_Connections_connected', 0)
+    print(f"  客户端连接数: {client_connections}")
+    print(f"  后端连接数: {server_connections}")
+    if server_connections:
+        print(f"  连接复用比: {client_connections / server_connections:.1f}")
+    
+    for hostgroup, host, port, status, used, free, errors, latency_us in backends:
+        print(f"  后端 [{hostgroup}] {host}:{port} {status}: "
+              f"使用中 {used}, 空闲 {free}, 错误 {errors}, 延迟 {int(latency_us) / 1000:.1f}ms")
+    
+    return True
+
+
 def diagnose_connection_pool():
     """诊断数据库连接池状态"""
     print("=" * 60)
@@ -66,32 +269,25 @@ def diagnose_connection_pool():
             print(f"    错误: {e}")
             return False
         
-        # 测试并发连接
+        # 测试并发连接：并发数略超过连接池容量，观察连接池耗尽时的等待延迟
         print(f"\n测试并发连接...")
-        import concurrent.futures
-        
-        def test_connection(conn_id):
-            try:
-                conn_db = get_database()
-                result = conn_db.execute_query("SELECT SLEEP(0.1) as test")
-                return {'id': conn_id, 'success': True}
-            except Exception as e:
-                return {'id': conn_id, 'success': False, 'error': str(e)}
-        
-        concurrent_count = 5
-        start_time = time.time()
+        pool_capacity = pool_config.get('size', 10) + pool_config.get('max_overflow', 20)
+        concurrent_count = pool_capacity + 5
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrent_count) as executor:
-            futures = [executor.submit(test_connection, i) for i in range(concurrent_count)]
-            results = [future.result() for future in concurrent.futures.as_completed(futures)]
+        probe = run_concurrent_probe(concurrent_count)
+        results = probe['results']
+        latencies = probe['latencies']
         
-        elapsed_time = time.time() - start_time
-        
-        success_count = sum(1 for r in results if r['success'])
-        print(f"  并发数: {concurrent_count}")
+        success_count = len(latencies)
+        print(f"  并发数: {concurrent_count} (连接池容量: {pool_capacity})")
         print(f"  成功数: {success_count}")
         print(f"  失败数: {concurrent_count - success_count}")
-        print(f"  总耗时: {elapsed_time:.3f}s")
+        print(f"  总耗时: {probe['elapsed']:.3f}s")
+        if latencies:
+            print(f"  单次延迟: min={latencies[0]:.3f}s, "
+                  f"p50={percentile(latencies, 50):.3f}s, "
+                  f"p95={percentile(latencies, 95):.3f}s, "
+                  f"max={latencies[-1]:.3f}s")
         
         if success_count < concurrent_count:
             print(f"\n  ⚠️  部分连接失败:")
@@ -102,32 +298,31 @@ def diagnose_connection_pool():
         # 检查数据库服务器状态
         print(f"\n检查数据库服务器状态...")
         try:
-            # 检查连接数
-            result = db.execute_query("SHOW STATUS LIKE 'Threads_connected'")
+            # 连接数、最大连接数和超时设置在一次查询中取回
+            result = db.execute_query(SERVER_STATUS_QUERY)
             if result:
-                threads = int(result[0].get('Value', 0))
+                status = result[0]
+                threads = int(status.get('threads_connected') or 0)
+                max_conn = int(status.get('max_connections') or 0)
+                wait_timeout = status.get('wait_timeout') or 0
+                
                 print(f"  当前连接数: {threads}")
-            
-            # 检查最大连接数
-            result = db.execute_query("SHOW VARIABLES LIKE 'max_connections'")
-            if result:
-                max_conn = int(result[0].get('Value', 0))
                 print(f"  最大连接数: {max_conn}")
                 if threads and max_conn:
                     usage = (threads / max_conn) * 100
                     print(f"  连接使用率: {usage:.1f}%")
                     if usage > 80:
                         print(f"  ⚠️  警告: 连接使用率过高")
-            
-            # 检查超时设置
-            result = db.execute_query("SHOW VARIABLES LIKE 'wait_timeout'")
-            if result:
-                wait_timeout = result[0].get('Value', 0)
                 print(f"  连接超时 (wait_timeout): {wait_timeout}s")
             
         except Exception as e:
             print(f"  ⚠️  无法获取数据库服务器状态: {e}")
         
+        # 经 ProxySQL 连接时，报告前后端连接复用情况
+        proxysql_config = config.get('database.proxysql')
+        if proxysql_config:
+            report_proxysql_stats(proxysql_config)
+        
         return True
         
     except Exception as e:
@@ -137,6 +332,100 @@ def diagnose_connection_pool():
         return False
 
 
+# 健康探测的会话超时：单条语句最长执行时间（毫秒）和行锁等待时间（秒）
+PROBE_MAX_EXECUTION_TIME_MS = 5000
+PROBE_LOCK_WAIT_TIMEOUT = 2
+
+# 健康探测的步骤：在临时表上执行一次完整的读写事务，最后回滚
+HEALTH_PROBE_STEPS = (
+    ('INSERT', "INSERT INTO _healthcheck (id, checked_at) VALUES (1, NOW(6))"),
+    ('SELECT', "SELECT checked_at FROM _healthcheck WHERE id = 1"),
+    ('UPDATE', "UPDATE _healthcheck SET checked_at = NOW(6) WHERE id = 1"),
+    ('DELETE', "DELETE FROM _healthcheck WHERE id = 1"),
+)
+
+
+def run_health_probe(db) -> list:
+    """
+    执行事务健康探测：在同一个连接上设置语句/锁超时，对临时表依次执行
+    INSERT、SELECT、UPDATE、DELETE 后回滚，记录每一步的耗时
+    
+    临时表只对当前连接可见，探测不会写入任何业务数据；
+    结束时删除临时表并恢复会话超时，连接归还连接池后不影响后续使用
+    
+    Args:
+        db: 数据库实例
+        
+    Returns:
+        list: 每一步的结果，包含 step、success、elapsed，失败时包含 error
+    """
+    steps = []
+    
+    def run_step(session, name, sql):
+        start = time.perf_counter()
+        try:
+            session.execute(text(sql))
+            steps.append({'step': name, 'success': True, 'elapsed': time.perf_counter() - start})
+            return True
+        except Exception as e:
+            steps.append({'step': name, 'success': False, 'elapsed': time.perf_counter() - start, 'error': str(e)})
+            return False
+    
+    with db.get_session() as session:
+        try:
+            ok = run_step(session, 'SET TIMEOUT',
+                          f"SET SESSION max_execution_time = {PROBE_MAX_EXECUTION_TIME_MS}, "
+                          f"innodb_lock_wait_timeout = {PROBE_LOCK_WAIT_TIMEOUT}")
+            ok = ok and run_step(session, 'CREATE TEMPORARY',
+                                 "CREATE TEMPORARY TABLE IF NOT EXISTS _healthcheck "
+                                 "(id INT PRIMARY KEY, checked_at DATETIME(6)) ENGINE=InnoDB")
+            for name, sql in HEALTH_PROBE_STEPS:
+                ok = ok and run_step(session, name, sql)
+            
+            start = time.perf_counter()
+            session.rollback()
+            steps.append({'step': 'ROLLBACK', 'success': True, 'elapsed': time.perf_counter() - start})
+        finally:
+            session.rollback()
+            try:
+                session.execute(text("DROP TEMPORARY TABLE IF EXISTS _healthcheck"))
+                session.execute(text("SET SESSION max_execution_time = DEFAULT, innodb_lock_wait_timeout = DEFAULT"))
+                session.commit()
+            except Exception as e:
+                # 清理失败时作废该连接，避免带着临时表和会话设置回到连接池
+                logger.warning(f"健康探测清理失败，作废连接: {e}")
+                session.connection().invalidate()
+    
+    return steps
+
+
+def get_replica_lag(db):
+    """
+    查询主从复制延迟
+    
+    Args:
+        db: 数据库实例
+        
+    Returns:
+        Tuple[str, Optional[int]]: (状态, 延迟秒数)，状态为 replica（从库）、primary（非从库）或 unknown（无法查询）
+    """
+    # MySQL 8.0.22 起使用 SHOW REPLICA STATUS，旧版本使用 SHOW SLAVE STATUS
+    for query, lag_key in (("SHOW REPLICA STATUS", 'Seconds_Behind_Source'),
+                           ("SHOW SLAVE STATUS", 'Seconds_Behind_Master')):
+        try:
+            result = db.execute_query(query)
+        except Exception:
+            continue
+        if not result:
+            return 'primary', None
+        return 'replica', result[0].get(lag_key)
+    return 'unknown', None
+
+
+# 稳定性测试的查询次数
+STABILITY_QUERY_COUNT = 10
+
+
 def test_connection_stability():
     """测试连接稳定性"""
     print("\n" + "=" * 60)
@@ -146,12 +435,13 @@ def test_connection_stability():
     try:
         db = get_database()
         
-        # 执行多次查询
-        print(f"\n执行 10 次查询测试...")
+        # 执行多次查询（每次单独取连接、单独往返）
+        print(f"\n执行 {STABILITY_QUERY_COUNT} 次查询测试...")
         success_count = 0
         fail_count = 0
         
-        for i in range(10):
+        start_time = time.perf_counter()
+        for i in range(STABILITY_QUERY_COUNT):
             try:
                 result = db.execute_query("SELECT 1 as test")
                 if result and result[0].get('test') == 1:
@@ -164,16 +454,58 @@ def test_connection_stability():
                 fail_count += 1
                 print(f"  第 {i+1} 次: ✗ {e}")
         
+        single_elapsed = time.perf_counter() - start_time
+        
         print(f"\n结果: 成功 {success_count} 次, 失败 {fail_count} 次")
         
-        # 测试长时间运行的查询
-        print(f"\n测试长时间查询...")
+        # 同样数量的探测合并为一条 UNION ALL 查询，一次往返完成，对比往返开销
+        print(f"\n批量查询测试（{STABILITY_QUERY_COUNT} 个探测合并为一次查询）...")
+        batch_query = " UNION ALL ".join(["SELECT 1 as test"] * STABILITY_QUERY_COUNT)
+        start_time = time.perf_counter()
         try:
-            result = db.execute_query("SELECT SLEEP(2) as test")
-            if result:
-                print(f"  ✓ 长时间查询成功")
+            result = db.execute_query(batch_query)
+            batch_elapsed = time.perf_counter() - start_time
+            if len(result) == STABILITY_QUERY_COUNT and all(row.get('test') == 1 for row in result):
+                print(f"  ✓ 批量查询成功")
+            else:
+                fail_count += 1
+                print(f"  ⚠️  批量查询返回结果异常")
+            print(f"  逐条查询耗时: {single_elapsed:.3f}s")
+            print(f"  批量查询耗时: {batch_elapsed:.3f}s")
         except Exception as e:
-            print(f"  ✗ 长时间查询失败: {e}")
+            fail_count += 1
+            print(f"  ✗ 批量查询失败: {e}")
+        
+        # 事务健康探测（代替只能测到取连接的 SELECT SLEEP）
+        print(f"\n事务健康探测...")
+        try:
+            read_only = db.execute_query("SELECT @@GLOBAL.read_only AS read_only")
+            if read_only and int(read_only[0].get('read_only') or 0):
+                fail_count += 1
+                print(f"  ⚠️  数据库处于只读状态（read_only=1）")
+            
+            for step in run_health_probe(db):
+                if step['success']:
+                    print(f"  ✓ {step['step']:<16} {step['elapsed'] * 1000:.1f}ms")
+                else:
+                    fail_count += 1
+                    print(f"  ✗ {step['step']:<16} {step['elapsed'] * 1000:.1f}ms  {step['error']}")
+        except Exception as e:
+            fail_count += 1
+            print(f"  ✗ 事务健康探测失败: {e}")
+        
+        # 主从复制延迟
+        role, lag = get_replica_lag(db)
+        if role == 'replica':
+            if lag is None:
+                fail_count += 1
+                print(f"  ⚠️  从库复制未运行（延迟为 NULL）")
+            else:
+                print(f"  复制延迟: {lag}s")
+        elif role == 'primary':
+            print(f"  非从库，无复制延迟")
+        else:
+            print(f"  无法查询复制状态（需要 REPLICATION CLIENT 权限）")
         
         return fail_count == 0
         
@@ -184,6 +516,14 @@ def test_connection_stability():
 
 def main():
     """主函数"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="数据库连接池诊断工具")
+    parser.add_argument('--sweep', action='store_true',
+                        help=f"扫描连接池大小 {SWEEP_POOL_SIZES} × 并发数 {SWEEP_CONCURRENCY}，推荐连接池大小")
+    parser.add_argument('--csv', help="扫描结果输出的CSV文件路径")
+    args = parser.parse_args()
+    
     print("\n" + "=" * 60)
     print("数据库连接池诊断工具")
     print("=" * 60)
@@ -195,6 +535,10 @@ def main():
     # 测试连接稳定性
     stability_ok = test_connection_stability()
     
+    # 扫描连接池大小（会临时建立最多 max(SWEEP_POOL_SIZES) 个连接，需显式开启）
+    if args.sweep:
+        sweep_pool_sizes(args.csv)
+    
     print("\n" + "=" * 60)
     print("诊断总结")
     print("=" * 60)
@@ -10,24 +10,20 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from datetime import datetime
-from app.utils import get_logger, setup_logging
-from app.utils.config import get_config
-from app.models.database_factory import DatabaseFactory
+from app.utils import bootstrap, get_logger
 from app.services.stock_date_range_service import StockDateRangeService
 
 
-def diagnose_partial_update():
-    """诊断部分更新的问题"""
+def diagnose_partial_update(database):
+    """
+    诊断部分更新的问题
+    
+    Args:
+        database: 数据库实例
+    """
     logger = get_logger(__name__)
     
     try:
-        # 加载配置
-        config = get_config()
-        
-        # 初始化数据库
-        db_factory = DatabaseFactory()
-        database = db_factory.get_database(config=config.get('database.mysql'))
-        
         logger.info("=" * 80)
         logger.info("开始诊断部分更新问题")
         logger.info("=" * 80)
@@ -42,7 +38,26 @@ def diagnose_partial_update():
         """
         partial_stocks = database.execute_query(query)
         
-        logger.info(f"找到 {len(partial_stocks)} 只股票只更新了一个日期字段:")
+        logger.info("找到 %s 只股票只更新了一个日期字段:", len(partial_stocks))
+        
+        # 2. 一次查询这些股票在 daily_market 表中的数据概况
+        summaries = {}
+        if partial_stocks:
+            stock_codes = [stock['code'] for stock in partial_stocks]
+            placeholders = ','.join(['%s'] * len(stock_codes))
+            query = f"""
+                SELECT 
+                    code,
+                    MIN(trade_date) as min_date,
+                    MAX(trade_date) as max_date,
+                    COUNT(*) as total_count,
+                    COUNT(DISTINCT trade_date) as unique_dates,
+                    SUM(trade_date IS NULL) as null_count
+                FROM daily_market
+                WHERE code IN ({placeholders})
+                GROUP BY code
+            """
+            summaries = {row['code']: row for row in database.execute_query(query, tuple(stock_codes))}
         
         for stock in partial_stocks:
             stock_code = stock['code']
@@ -50,67 +65,33 @@ def diagnose_partial_update():
             earliest = stock.get('earliest_data_date')
             latest = stock.get('latest_data_date')
             
-            logger.info(f"\n股票: {stock_code} - {stock_name}")
-            logger.info(f"  earliest_data_date: {earliest}")
-            logger.info(f"  latest_data_date: {latest}")
-            
-            # 2. 检查 daily_market 表中的数据
-            query = f"""
-                SELECT 
-                    trade_date,
-                    COUNT(*) as count,
-                    MIN(trade_date) as min_date,
-                    MAX(trade_date) as max_date
-                FROM daily_market
-                WHERE code = %s
-                GROUP BY trade_date
-                ORDER BY trade_date
-                LIMIT 10
-            """
-            market_data = database.execute_query(query, (stock_code,))
+            logger.info("\n股票: %s - %s", stock_code, stock_name)
+            logger.info("  earliest_data_date: %s", earliest)
+            logger.info("  latest_data_date: %s", latest)
             
-            logger.info(f"  daily_market 表数据条数: {len(market_data)}")
+            summary = summaries.get(stock_code)
+            if not summary:
+                logger.info("  daily_market 表数据条数: 0")
+                continue
             
-            if market_data:
-                # 查询真实的 MIN 和 MAX
-                query = f"""
-                    SELECT 
-                        MIN(trade_date) as min_date,
-                        MAX(trade_date) as max_date,
-                        COUNT(*) as total_count,
-                        COUNT(DISTINCT trade_date) as unique_dates
-                    FROM daily_market
-                    WHERE code = %s
-                """
-                summary = database.execute_query(query, (stock_code,))[0]
-                
-                logger.info(f"  MIN(trade_date): {summary.get('min_date')} (类型: {type(summary.get('min_date'))})")
-                logger.info(f"  MAX(trade_date): {summary.get('max_date')} (类型: {type(summary.get('max_date'))})")
-                logger.info(f"  总数据条数: {summary.get('total_count')}")
-                logger.info(f"  唯一日期数: {summary.get('unique_dates')}")
-                
-                # 检查是否有 NULL 值
-                query = f"""
-                    SELECT COUNT(*) as null_count
-                    FROM daily_market
-                    WHERE code = %s AND trade_date IS NULL
-                """
-                null_check = database.execute_query(query, (stock_code,))
-                logger.info(f"  NULL 值数量: {null_check[0].get('null_count')}")
+            logger.info("  MIN(trade_date): %s (类型: %s)", summary.get('min_date'), type(summary.get('min_date')))
+            logger.info("  MAX(trade_date): %s (类型: %s)", summary.get('max_date'), type(summary.get('max_date')))
+            logger.info("  总数据条数: %s", summary.get('total_count'))
+            logger.info("  唯一日期数: %s", summary.get('unique_dates'))
+            logger.info("  NULL 值数量: %s", summary.get('null_count'))
         
         logger.info("\n" + "=" * 80)
         logger.info("诊断完成")
         logger.info("=" * 80)
         
     except Exception as e:
-        logger.error(f"诊断失败: {e}", exc_info=True)
+        logger.error("诊断失败: %s", e, exc_info=True)
 
 
 if __name__ == "__main__":
-    # 加载配置并初始化日志系统
-    config = get_config()
-    setup_logging(config)
+    # 加载配置、初始化日志系统和数据库
+    config, database = bootstrap()
     
     logger = get_logger(__name__)
     
-    diagnose_partial_update()
+    diagnose_partial_update(database)
@@ -1,93 +1,67 @@
 #!/usr/bin/env python3
 """删除数据库中的所有外键约束"""
-import pymysql
-from app.utils import get_config
+from app.models.database_factory import get_database
 
 def main():
     print("=" * 60)
     print("删除数据库中的外键约束")
     print("=" * 60)
     
-    config = get_config()
-    mysql_config = config.get('database', {}).get('mysql', {})
-    
+    conn = None
     try:
-        conn = pymysql.connect(
-            host=mysql_config.get('host'),
-            port=mysql_config.get('port'),
-            user=mysql_config.get('username'),
-            password=mysql_config.get('password'),
-            database=mysql_config.get('database'),
-            charset=mysql_config.get('charset', 'utf8mb4')
-        )
-        
-        cursor = conn.cursor()
+        # 使用应用的连接池（同一个连接上完成查询、删除和验证）
+        engine = get_database().orm_db.engine
+        conn = engine.connect()
         
         # 查询所有外键约束
-        cursor.execute("""
+        foreign_keys = conn.exec_driver_sql("""
             SELECT 
                 TABLE_NAME,
                 CONSTRAINT_NAME
             FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS
-            WHERE TABLE_SCHEMA = %s
+            WHERE TABLE_SCHEMA = DATABASE()
             AND CONSTRAINT_TYPE = 'FOREIGN KEY'
-        """, (mysql_config.get('database'),))
-        
-        foreign_keys = cursor.fetchall()
+        """).fetchall()
         
         if not foreign_keys:
             print('\n✓ 数据库中没有外键约束，无需删除')
-            conn.close()
             return True
         
         print(f'\n发现 {len(foreign_keys)} 个外键约束：\n')
         
-        # 删除每个外键约束
-        for fk in foreign_keys:
-            table_name = fk[0]
-            constraint_name = fk[1]
-            
-            try:
-                # 禁用外键检查
-                cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
-                
-                # 删除外键约束
-                drop_sql = f"ALTER TABLE `{table_name}` DROP FOREIGN KEY `{constraint_name}`"
-                cursor.execute(drop_sql)
-                conn.commit()
-                
-                print(f'✓ 已删除: {table_name}.{constraint_name}')
-                
-                # 重新启用外键检查
-                cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
-                
-            except Exception as e:
-                print(f'⚠️  删除失败: {table_name}.{constraint_name}')
-                print(f'    错误: {e}')
-                conn.rollback()
+        # 按表分组，同一张表的外键在一条 ALTER TABLE 语句中删除
+        constraints_by_table = {}
+        for table_name, constraint_name in foreign_keys:
+            constraints_by_table.setdefault(table_name, []).append(constraint_name)
         
-        conn.close()
+        # 禁用外键检查（会话级设置，整个删除过程只需设置一次）
+        conn.exec_driver_sql("SET FOREIGN_KEY_CHECKS = 0")
         
-        # 验证是否全部删除
-        conn = pymysql.connect(
-            host=mysql_config.get('host'),
-            port=mysql_config.get('port'),
-            user=mysql_config.get('username'),
-            password=mysql_config.get('password'),
-            database=mysql_config.get('database'),
-            charset=mysql_config.get('charset', 'utf8mb4')
-        )
+        try:
+            # 删除外键约束（DDL语句自动提交，无需单独commit）
+            for table_name, constraint_names in constraints_by_table.items():
+                drop_sql = f"ALTER TABLE `{table_name}` " + ", ".join(
+                    f"DROP FOREIGN KEY `{constraint_name}`" for constraint_name in constraint_names
+                )
+                try:
+                    conn.exec_driver_sql(drop_sql)
+                    for constraint_name in constraint_names:
+                        print(f'✓ 已删除: {table_name}.{constraint_name}')
+                except Exception as e:
+                    for constraint_name in constraint_names:
+                        print(f'⚠️  删除失败: {table_name}.{constraint_name}')
+                    print(f'    错误: {e}')
+        finally:
+            # 重新启用外键检查（连接会归还到连接池，必须恢复会话设置）
+            conn.exec_driver_sql("SET FOREIGN_KEY_CHECKS = 1")
         
-        cursor = conn.cursor()
-        cursor.execute("""
+        # 在同一连接上验证是否全部删除
+        count = conn.exec_driver_sql("""
             SELECT COUNT(*)
             FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS
-            WHERE TABLE_SCHEMA = %s
+            WHERE TABLE_SCHEMA = DATABASE()
             AND CONSTRAINT_TYPE = 'FOREIGN KEY'
-        """, (mysql_config.get('database'),))
-        
-        count = cursor.fetchone()[0]
-        conn.close()
+        """).scalar()
         
         print('\n' + '=' * 60)
         if count == 0:
@@ -100,6 +74,9 @@ def main():
     except Exception as e:
         print(f'\n⚠️  删除外键约束时出错: {e}')
         return False
+    finally:
+        if conn:
+            conn.close()
 
 if __name__ == '__main__':
     success = main()
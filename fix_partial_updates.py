@@ -9,25 +9,72 @@ import os
 # 添加项目根目录到 Python 路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from app.utils import get_logger, setup_logging
-from app.utils.config import get_config
-from app.models.database_factory import DatabaseFactory
+from app.utils import bootstrap, get_logger
 from app.services.stock_date_range_service import StockDateRangeService
 
 
-def fix_partial_updates():
-    """修复只更新了一个字段的股票"""
+# 逐批查询后更新时每批处理的股票数量
+STOCK_BATCH_SIZE = 500
+
+
+def fix_stock_batch(date_range_service: StockDateRangeService, stocks: list) -> int:
+    """
+    查询一批只更新了一个日期字段的股票的完整日期范围，补全后更新到 stocks 表
+    
+    Args:
+        date_range_service: 日期范围服务
+        stocks: 股票列表（包含 code、name 和两个日期字段）
+        
+    Returns:
+        int: 成功更新的股票数量
+    """
     logger = get_logger(__name__)
+    date_ranges = date_range_service.batch_get_stock_date_range_from_daily_market(
+        [stock['code'] for stock in stocks]
+    )
     
-    try:
-        # 加载配置
-        config = get_config()
+    # 准备批量更新的数据
+    updates = {}
+    for stock in stocks:
+        stock_code = stock['code']
+        stock_name = stock['name']
+        current_earliest = stock.get('earliest_data_date')
+        current_latest = stock.get('latest_data_date')
         
-        # 初始化数据库
-        db_factory = DatabaseFactory()
-        database = db_factory.get_database(config=config.get('database.mysql'))
+        earliest, latest = date_ranges.get(stock_code, (None, None))
         
+        # 保留已有的值，只更新 NULL 的字段
+        if earliest is None:
+            earliest = current_earliest
+        if latest is None:
+            latest = current_latest
+        
+        # 确保两个都有值
+        if earliest and latest:
+            updates[stock_code] = (earliest, latest)
+            logger.info("股票 %s - %s: 更新为 %s ~ %s", stock_code, stock_name, earliest, latest)
+        else:
+            logger.warning("股票 %s - %s: 无法获取完整的日期范围，跳过", stock_code, stock_name)
+    
+    if not updates:
+        return 0
+    
+    return date_range_service.batch_update_stock_date_ranges_optimized(updates)
+
+
+def fix_partial_updates(config, database):
+    """
+    修复只更新了一个字段的股票
+    
+    Args:
+        config: 配置
+        database: 数据库实例
+    """
+    logger = get_logger(__name__)
+    
+    try:
         # 创建日期范围服务
         date_range_service = StockDateRangeService(database)
         
@@ -35,6 +82,16 @@ def fix_partial_updates():
         logger.info("开始修复只更新了一个日期字段的股票")
         logger.info("=" * 80)
         
+        # 优先在数据库中用一条 UPDATE JOIN 完成修复
+        updated_count = date_range_service.fill_null_date_ranges_from_daily_market(partial_only=True)
+        if updated_count is not None:
+            logger.info("=" * 80)
+            logger.info("修复完成，成功更新: %s 只股票", updated_count)
+            logger.info("=" * 80)
+            return True
+        
+        logger.warning("UPDATE JOIN 执行失败，改为逐批查询后更新")
+        
         # 1. 查找只更新了一个字段的股票
         query = """
             SELECT code, name, earliest_data_date, latest_data_date
@@ -49,64 +106,47 @@ def fix_partial_updates():
             return True
         
         total_count = len(partial_stocks)
-        logger.info(f"找到 {total_count} 只股票只更新了一个日期字段")
-        
-        # 2. 批量查询这些股票在 daily_market 表中的完整日期范围
-        stock_codes = [stock['code'] for stock in partial_stocks]
-        date_ranges = date_range_service.batch_get_stock_date_range_from_daily_market(stock_codes)
+        logger.info("找到 %s 只股票只更新了一个日期字段", total_count)
         
-        # 3. 准备批量更新的数据
-        updates = {}
-        for stock in partial_stocks:
-            stock_code = stock['code']
-            stock_name = stock['name']
-            current_earliest = stock.get('earliest_data_date')
-            current_latest = stock.get('latest_data_date')
-            
-            earliest, latest = date_ranges.get(stock_code, (None, None))
-            
-            # 保留已有的值，只更新 NULL 的字段
-            if earliest is None:
-                earliest = current_earliest
-            if latest is None:
-                latest = current_latest
-            
-            # 确保两个都有值
-            if earliest and latest:
-                updates[stock_code] = (earliest, latest)
-                logger.info(f"股票 {stock_code} - {stock_name}: 更新为 {earliest} ~ {latest}")
-            else:
-                logger.warning(f"股票 {stock_code} - {stock_name}: 无法获取完整的日期范围，跳过")
-        
-        if not updates:
-            logger.warning("没有找到需要更新的股票")
-            return True
+        # 2. 分批查询完整日期范围并更新，避免超长的 IN 列表和一次构建全部更新数据；
+        # 各批互不依赖，用线程池并发执行，并发数不超过数据库连接池大小
+        batches = [partial_stocks[i:i + STOCK_BATCH_SIZE] for i in range(0, total_count, STOCK_BATCH_SIZE)]
+        pool_size = config.get('database.mysql.pool.size', 10)
+        max_workers = max(1, min(pool_size, (os.cpu_count() or 1) * 4, len(batches)))
         
-        # 4. 批量更新
-        success_count = date_range_service.batch_update_stock_date_ranges_optimized(updates)
+        success_count = 0
+        processed_count = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(fix_stock_batch, date_range_service, batch): len(batch)
+                for batch in batches
+            }
+            for future in as_completed(futures):
+                success_count += future.result()
+                processed_count += futures[future]
+                logger.info("分批修复进度: %s/%s", processed_count, total_count)
         
         logger.info("=" * 80)
-        logger.info(f"修复完成")
-        logger.info(f"总计处理: {total_count} 只股票")
-        logger.info(f"成功更新: {success_count} 只股票")
-        logger.info(f"跳过: {total_count - success_count} 只股票")
+        logger.info("修复完成")
+        logger.info("总计处理: %s 只股票", total_count)
+        logger.info("成功更新: %s 只股票", success_count)
+        logger.info("跳过: %s 只股票", total_count - success_count)
         logger.info("=" * 80)
         
         return True
         
     except Exception as e:
-        logger.error(f"修复失败: {e}", exc_info=True)
+        logger.error("修复失败: %s", e, exc_info=True)
         return False
 
 
 if __name__ == "__main__":
-    # 加载配置并初始化日志系统
-    config = get_config()
-    setup_logging(config)
+    # 加载配置、初始化日志系统和数据库
+    config, database = bootstrap()
     
     logger = get_logger(__name__)
     
-    success = fix_partial_updates()
+    success = fix_partial_updates(config, database)
     
     if success:
         logger.info("✓ 修复成功")
@@ -10,9 +10,16 @@ bind = "0.0.0.0:5000"
 backlog = 2048
 
 # 工作进程
-workers = multiprocessing.cpu_count() * 2 + 1  # 推荐公式：(2 * CPU核心数) + 1
-worker_class = "sync"
+# 请求大多在等待数据库，使用线程工作模式：一个进程内多个线程并发处理请求，
+# 等待数据库期间不会占住整个进程；每个进程的线程数不超过数据库连接池大小（pool.size）
+# 可通过环境变量 GUNICORN_WORKERS 指定进程数，指定后不再按数据库连接数调整
+workers = int(os.environ.get('GUNICORN_WORKERS') or max(2, multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = 4
 worker_connections = 1000
+# master 进程加载应用后再 fork 工作进程，工作进程共享已导入的代码，启动更快、内存占用更少
+# （继承的数据库连接在 post_fork 中丢弃，见下方钩子）
+preload_app = True
 max_requests = 1000  # 每个工作进程处理 1000 个请求后重启，防止内存泄漏
 max_requests_jitter = 50  # 随机重启时间，避免所有 worker 同时重启
 timeout = 30
@@ -39,14 +46,61 @@ tmp_upload_dir = None
 # keyfile = "/path/to/ssl/key.pem"
 # certfile = "/path/to/ssl/cert.pem"
 
+# 所有进程的数据库连接最多占用 MySQL max_connections 的比例
+DB_CONNECTION_BUDGET = 0.7
+
+
+def limit_workers_by_db_connections(server):
+    """
+    按数据库连接数限制工作进程数
+    
+    每个进程最多占用 max(pool.size, pool.max_size) + pool.max_overflow 个连接
+    （启用动态扩缩容时连接池可扩大到 pool.max_size），进程数不超过
+    floor(DB_CONNECTION_BUDGET * max_connections / 每进程连接数)，至少保留 1 个进程；
+    设置了 GUNICORN_WORKERS 或无法查询 max_connections 时保持原进程数
+    
+    Args:
+        server: Gunicorn Arbiter
+    """
+    if os.environ.get('GUNICORN_WORKERS'):
+        print(f"工作进程数: {server.num_workers}（由 GUNICORN_WORKERS 指定）")
+        return
+    
+    try:
+        from app.models.database_factory import get_database
+        from app.utils import get_config
+        
+        pool_config = get_config().get('database.mysql.pool', {})
+        pool_size = pool_config.get('size', 10)
+        max_pool_size = pool_config.get('max_size', pool_size)
+        connections_per_worker = max(pool_size, max_pool_size) + pool_config.get('max_overflow', 20)
+        
+        # 通过应用的数据库层查询，连接参数与工作进程一致（工作进程 fork 后会重置继承的连接池）
+        result = get_database().execute_query("SELECT @@GLOBAL.max_connections AS max_connections")
+        max_connections = int(result[0]['max_connections'])
+    except Exception as e:
+        print(f"无法查询数据库 max_connections，工作进程数保持 {server.num_workers}: {e}")
+        return
+    
+    limit = max(1, int(DB_CONNECTION_BUDGET * max_connections / connections_per_worker))
+    if server.num_workers > limit:
+        print(f"工作进程数 {server.num_workers} 超出数据库连接预算"
+              f"（max_connections={max_connections}，每进程 {connections_per_worker} 个连接），调整为 {limit}")
+        server.num_workers = limit
+    else:
+        print(f"工作进程数: {server.num_workers}（max_connections={max_connections}）")
+
+
 # 服务器钩子
 def on_starting(server):
     """服务器启动前执行"""
     print("Gunicorn 服务器启动中...")
+    limit_workers_by_db_connections(server)
 
 def on_reload(server):
     """重新加载时执行"""
     print("Gunicorn 服务器重新加载中...")
+    limit_workers_by_db_connections(server)
 
 def when_ready(server):
     """服务器就绪时执行"""
@@ -57,8 +111,18 @@ def pre_fork(server, worker):
     pass
 
 def post_fork(server, worker):
-    """Fork 工作进程后执行"""
-    pass
+    """Fork 工作进程后执行：丢弃从 master 继承的数据库连接，工作进程建立并预热自己的连接池"""
+    from app.models.database_factory import get_database, reset_connection_pools_after_fork
+    reset_connection_pools_after_fork()
+    
+    # 预热连接池，首批请求无需等待建立连接（预热失败不影响工作进程启动，连接会在使用时按需建立）
+    database = get_database()
+    if hasattr(database, 'warm_up_pool'):
+        try:
+            count = database.warm_up_pool()
+            print(f"Worker {worker.pid} 已预热 {count} 个数据库连接")
+        except Exception as e:
+            print(f"Worker {worker.pid} 预热数据库连接池失败: {e}")
 
 def pre_exec(server):
     """新 master 进程 fork 后执行"""
@@ -73,8 +137,9 @@ def worker_abort(worker):
     print(f"Worker {worker.pid} 异常退出!")
 
 def child_exit(server, worker):
-    """worker 退出时执行"""
-    pass
+    """worker 退出时执行：清理该进程的监控指标文件"""
+    from app.models.pool_metrics import mark_worker_dead
+    mark_worker_dead(worker.pid)
 
 def worker_exit(server, worker):
     """worker 退出时执行"""
@@ -15,20 +15,28 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from app.utils import get_config, setup_logging, get_logger
+from app.utils import get_config, set_config, setup_logging, get_logger
 
 # PID文件路径
 PID_FILE = project_root / '.stock_app.pid'
+# 服务子进程PID文件（forkserver 启动的子进程命令行中没有 main.py，无法按命令行查找）
+SERVICE_PID_FILE = project_root / '.stock_app.services.pid'
 LOG_FILE = project_root / 'logs' / 'app.log'
 
 
-def run_api_server():
-    """运行API服务器"""
+def run_api_server(config=None):
+    """
+    运行API服务器
+    
+    Args:
+        config: 配置管理器实例，默认使用全局配置
+    """
     from app.api import create_app
     from app.scheduler import get_task_scheduler
     
     logger = get_logger(__name__)
-    config = get_config()
+    if config is None:
+        config = get_config()
     
     try:
         # 创建Flask应用
@@ -61,7 +69,8 @@ def run_api_server():
             host=host,
             port=port,
             debug=debug,
-            use_reloader=False
+            use_reloader=False,
+            threaded=True  # 每个请求一个线程，等待数据库和外部接口时不阻塞其他请求
         )
         
     except KeyboardInterrupt:
@@ -75,12 +84,18 @@ def run_api_server():
         logger.info("API服务器已关闭")
 
 
-def run_web_server():
-    """运行Web服务器"""
+def run_web_server(config=None):
+    """
+    运行Web服务器
+    
+    Args:
+        config: 配置管理器实例，默认使用全局配置
+    """
     from app.web import create_web_app
     
     logger = get_logger(__name__)
-    config = get_config()
+    if config is None:
+        config = get_config()
     
     try:
         # 创建Flask应用
@@ -98,7 +113,8 @@ def run_web_server():
         app.run(
             host=host,
             port=port,
-            debug=debug
+            debug=debug,
+            threaded=True  # 每个请求一个线程，等待API响应时不阻塞其他请求
         )
         
     except KeyboardInterrupt:
@@ -106,10 +122,33 @@ def run_web_server():
         logger.info("Web服务器已关闭")
 
 
-def init_databases():
-    """初始化数据库"""
+def run_service_process(target, config):
+    """
+    子进程入口：初始化日志和信号处理后运行服务
+    
+    子进程由 forkserver 启动，不继承父进程的日志配置和信号处理函数；
+    配置由父进程传入并设为全局配置，子进程无需重新解析配置文件
+    
+    Args:
+        target: 要运行的服务函数（run_api_server 或 run_web_server）
+        config: 父进程已加载的配置管理器实例
+    """
+    set_config(config)
+    setup_logging(config)
+    signal.signal(signal.SIGTERM, service_signal_handler)
+    target(config)
+
+
+def init_databases(config=None):
+    """
+    初始化数据库
+    
+    Args:
+        config: 配置管理器实例，默认使用全局配置
+    """
     try:
-        config = get_config()
+        if config is None:
+            config = get_config()
         
         # 初始化日志系统
         setup_logging(config)
@@ -152,89 +191,229 @@ def save_pid(pid):
         print(f"保存PID文件失败: {e}")
 
 
+def save_service_pids(pids: list):
+    """保存服务子进程ID到文件"""
+    try:
+        SERVICE_PID_FILE.write_text('\n'.join(str(pid) for pid in pids))
+    except Exception as e:
+        print(f"保存服务进程PID文件失败: {e}")
+
+
+def read_service_pids() -> list:
+    """
+    读取保存的服务子进程ID
+    
+    Returns:
+        list: 进程ID列表，文件不存在或格式错误时返回空列表
+    """
+    try:
+        return [int(line) for line in SERVICE_PID_FILE.read_text().split()]
+    except (OSError, ValueError):
+        return []
+
+
 def cleanup_pid():
     """清理PID文件"""
     try:
         if PID_FILE.exists():
             PID_FILE.unlink()
             print(f"PID文件已删除: {PID_FILE}")
+        if SERVICE_PID_FILE.exists():
+            SERVICE_PID_FILE.unlink()
     except Exception as e:
         print(f"删除PID文件失败: {e}")
 
 
+def is_app_cmdline(argv: list) -> bool:
+    """
+    判断命令行参数是否为本程序的进程（python ... main.py ...）
+    
+    Args:
+        argv: 进程的命令行参数列表
+        
+    Returns:
+        bool: 是否为本程序的进程
+    """
+    return (
+        bool(argv)
+        and 'python' in os.path.basename(argv[0])
+        and any(os.path.basename(arg) == 'main.py' for arg in argv[1:])
+    )
+
+
+def is_service_cmdline(argv: list) -> bool:
+    """
+    判断命令行参数是否为 forkserver 启动的服务子进程
+    （python -B -c "from multiprocessing.forkserver import main; ..."）
+    
+    Args:
+        argv: 进程的命令行参数列表
+        
+    Returns:
+        bool: 是否为 forkserver 启动的Python进程
+    """
+    return (
+        bool(argv)
+        and 'python' in os.path.basename(argv[0])
+        and any('multiprocessing.forkserver' in arg for arg in argv[1:])
+    )
+
+
+def read_cmdline(pid: int) -> list:
+    """
+    读取进程的命令行参数
+    
+    Args:
+        pid: 进程ID
+        
+    Returns:
+        list: 命令行参数列表，进程不存在或无权限读取时返回空列表
+    """
+    if os.path.isdir('/proc'):
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                cmdline = f.read()
+        except OSError:
+            return []
+        return [arg.decode(errors='replace') for arg in cmdline.split(b'\0') if arg]
+    
+    import subprocess
+    result = subprocess.run(['ps', '-o', 'args=', '-p', str(pid)], capture_output=True, text=True)
+    return result.stdout.split()
+
+
+def find_app_pids() -> list:
+    """
+    查找所有 main.py 相关的Python进程
+    
+    Linux上直接读取 /proc/[pid]/cmdline 按参数精确匹配，其他系统回退到解析 ps 输出；
+    另外加上PID文件中记录的、仍在运行的服务子进程
+    
+    Returns:
+        list: 进程ID列表（不含当前进程）
+    """
+    current_pid = os.getpid()
+    pids = []
+    
+    if os.path.isdir('/proc'):
+        for entry in os.listdir('/proc'):
+            if entry.isdigit() and int(entry) != current_pid and is_app_cmdline(read_cmdline(int(entry))):
+                pids.append(int(entry))
+    else:
+        import subprocess
+        result = subprocess.run(['ps', '-axo', 'pid=,args='], capture_output=True, text=True)
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            if len(parts) > 1 and parts[0].isdigit() and int(parts[0]) != current_pid:
+                if is_app_cmdline(parts[1:]):
+                    pids.append(int(parts[0]))
+    
+    # 校验命令行，避免PID被其他进程复用时误杀
+    for pid in read_service_pids():
+        if pid != current_pid and pid not in pids and is_service_cmdline(read_cmdline(pid)):
+            pids.append(pid)
+    
+    return pids
+
+
 def kill_all_processes():
     """查找并杀死所有相关的Python进程"""
-    import subprocess
     try:
-        # 查找所有 main.py 相关的进程
-        result = subprocess.run(
-            ['ps', 'aux'],
-            capture_output=True,
-            text=True
-        )
-        
         killed_count = 0
-        for line in result.stdout.split('\n'):
-            if 'python' in line and 'main.py' in line and 'grep' not in line:
-                parts = line.split()
-                if len(parts) > 1:
-                    try:
-                        pid = int(parts[1])
-                        # 不要杀死当前进程
-                        if pid != os.getpid():
-                            os.kill(pid, signal.SIGKILL)
-                            killed_count += 1
-                            print(f"已杀死进程: {pid}")
-                    except (ValueError, ProcessLookupError, PermissionError):
-                        pass
+        for pid in find_app_pids():
+            try:
+                os.kill(pid, signal.SIGKILL)
+                killed_count += 1
+                print(f"已杀死进程: {pid}")
+            except (ProcessLookupError, PermissionError):
+                pass
         
         if killed_count > 0:
             print(f"共杀死 {killed_count} 个相关进程")
+        
+        if SERVICE_PID_FILE.exists():
+            SERVICE_PID_FILE.unlink()
     except Exception as e:
         print(f"清理进程失败: {e}")
 
 
-def daemonize():
-    """将进程转为后台守护进程"""
-    try:
-        # 第一次fork
-        pid = os.fork()
-        if pid > 0:
-            # 父进程退出
-            print(f"服务正在后台运行，PID: {pid}")
-            sys.exit(0)
-    except OSError as e:
-        print(f"第一次fork失败: {e}")
-        sys.exit(1)
+def spawn_daemon(args) -> int:
+    """
+    以后台守护进程方式启动服务
     
-    # 脱离控制终端，创建新的会话和进程组
-    os.setsid()
+    在加载配置、连接数据库之前，直接启动一个新的Python解释器（新会话、脱离控制终端，
+    标准输出重定向到日志文件）运行 start --detached，当前进程随后退出。
+    子进程从干净的解释器开始初始化，不会继承当前进程已加载的模块和数据库连接
     
-    # 第二次fork
-    try:
-        pid = os.fork()
-        if pid > 0:
-            sys.exit(0)
-    except OSError as e:
-        print(f"第二次fork失败: {e}")
-        sys.exit(1)
-    
-    # 重定向标准输入输出
-    sys.stdout.flush()
-    sys.stderr.flush()
+    Args:
+        args: 命令行参数
+        
+    Returns:
+        int: 守护进程的PID（同时也是其进程组ID）
+    """
+    import subprocess
     
-    # 重定向到日志文件
+    # 确保日志目录存在
     log_dir = LOG_FILE.parent
     if not log_dir.exists():
         log_dir.mkdir(parents=True, exist_ok=True)
     
-    # 打开日志文件
-    sys.stdin = open(os.devnull, 'r')
-    sys.stdout = open(LOG_FILE, 'a+')
-    sys.stderr = open(LOG_FILE, 'a+')
+    command = [sys.executable, str(Path(__file__).resolve()), 'start', '--detached']
+    if args.api_only:
+        command.append('--api-only')
+    if args.web_only:
+        command.append('--web-only')
+    
+    with open(LOG_FILE, 'a+') as log_file:
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            cwd=str(project_root),
+            start_new_session=True  # 脱离控制终端，创建新的会话和进程组
+        )
+    
+    return process.pid
+
+
+def wait_for_exit(pid: int, timeout: float) -> bool:
+    """
+    等待进程退出
+    
+    Linux 5.3+ 上通过 pidfd 在进程退出时立即返回，否则回退到每秒检查一次
+    
+    Args:
+        pid: 进程ID
+        timeout: 最长等待时间（秒）
+        
+    Returns:
+        bool: 进程是否已退出
+    """
+    try:
+        pidfd = os.pidfd_open(pid)
+    except ProcessLookupError:
+        return True
+    except (AttributeError, OSError):
+        pidfd = None
+    
+    if pidfd is not None:
+        import select
+        try:
+            poller = select.poll()
+            poller.register(pidfd, select.POLLIN)
+            return bool(poller.poll(timeout * 1000))
+        finally:
+            os.close(pidfd)
     
-    # 保存当前进程组ID（使用当前进程PID作为进程组ID）
-    save_pid(os.getpid())
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(1)
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return True
+    return False
 
 
 def stop_services():
@@ -275,24 +454,15 @@ def stop_services():
             return 1
         
         # 等待进程结束
-        max_wait = 10
-        for i in range(max_wait):
-            time.sleep(1)
-            try:
-                os.kill(pgid, 0)
-                print(f"等待进程结束... ({i+1}/{max_wait})")
-            except OSError:
-                break
-        
-        # 检查是否已停止
-        try:
-            os.kill(pgid, 0)
+        print("等待进程结束...")
+        if not wait_for_exit(pgid, timeout=10):
             # 强制杀死整个进程组
             print("进程未响应，强制停止...")
-            os.killpg(pgid, signal.SIGKILL)
-            time.sleep(1)
-        except (OSError, ProcessLookupError):
-            pass
+            try:
+                os.killpg(pgid, signal.SIGKILL)
+                wait_for_exit(pgid, timeout=1)
+            except (OSError, ProcessLookupError):
+                pass
         
         # 确保所有相关进程都被杀死
         kill_all_processes()
@@ -312,6 +482,34 @@ def stop_services():
         return 1
 
 
+def tail_lines(path: Path, count: int, block_size: int = 4096) -> list:
+    """
+    读取文件末尾的若干行
+    
+    从文件末尾按块向前读取，直到读到足够的换行符，不会把整个日志文件读入内存
+    
+    Args:
+        path: 文件路径
+        count: 行数
+        block_size: 每次读取的字节数
+        
+    Returns:
+        list: 末尾的行（不超过count行）
+    """
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        data = b''
+        # 多读一个换行符，保证第一行是完整的
+        while position > 0 and data.count(b'\n') <= count:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+    
+    lines = data.decode('utf-8', errors='replace').splitlines()
+    return lines[-count:]
+
+
 def status_services():
     """查看服务状态"""
     print("=" * 60)
@@ -336,13 +534,12 @@ def status_services():
             if LOG_FILE.exists():
                 print("\n最近的日志:")
                 try:
-                    with open(LOG_FILE, 'r', encoding='utf-8') as f:
-                        lines = f.readlines()
-                        if lines:
-                            for line in lines[-5:]:
-                                print(f"  {line.rstrip()}")
-                        else:
-                            print("  (日志文件为空)")
+                    lines = tail_lines(LOG_FILE, 5)
+                    if lines:
+                        for line in lines:
+                            print(f"  {line.rstrip()}")
+                    else:
+                        print("  (日志文件为空)")
                 except Exception as e:
                     print(f"  读取日志失败: {e}")
         except OSError:
@@ -354,17 +551,22 @@ def status_services():
         print(f"状态: 未知错误 ({e})")
 
 
-def signal_handler(signum, frame):
-    """信号处理函数"""
-    print(f"收到信号 {signum}，正在关闭服务...")
-    
-    # 关闭调度器
+def shutdown_scheduler():
+    """关闭调度器"""
     try:
         from app.scheduler import get_task_scheduler
         scheduler = get_task_scheduler()
         scheduler.shutdown(wait=False)
     except:
         pass
+
+
+def signal_handler(signum, frame):
+    """信号处理函数"""
+    print(f"收到信号 {signum}，正在关闭服务...")
+    
+    # 关闭调度器
+    shutdown_scheduler()
     
     # 清理PID文件
     cleanup_pid()
@@ -372,6 +574,13 @@ def signal_handler(signum, frame):
     sys.exit(0)
 
 
+def service_signal_handler(signum, frame):
+    """服务子进程的信号处理函数（PID文件由主进程清理）"""
+    print(f"收到信号 {signum}，正在关闭服务...")
+    shutdown_scheduler()
+    sys.exit(0)
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description='股海罗盘', formatter_class=argparse.RawDescriptionHelpFormatter)
@@ -384,6 +593,7 @@ def main():
     start_parser.add_argument('--api-only', action='store_true', help='只启动API服务器')
     start_parser.add_argument('--web-only', action='store_true', help='只启动Web服务器')
     start_parser.add_argument('--foreground', '-f', action='store_true', help='前台运行（默认后台运行）')
+    start_parser.add_argument('--detached', action='store_true', help=argparse.SUPPRESS)
     
     # stop命令
     subparsers.add_parser('stop', help='停止服务')
@@ -436,8 +646,27 @@ def main():
     
     # 处理start命令
     if args.command == 'start':
+        detached = getattr(args, 'detached', False)
+        
+        # 后台运行：先启动守护进程再初始化，当前进程不加载任何服务
+        if not args.foreground and not detached:
+            print("\n" + "=" * 60)
+            print("启动股海罗盘（后台模式）")
+            print("=" * 60)
+            try:
+                pid = spawn_daemon(args)
+            except OSError as e:
+                print(f"启动后台进程失败: {e}")
+                sys.exit(1)
+            save_pid(pid)
+            print(f"服务正在后台运行，PID: {pid}")
+            return
+        
+        # 只加载一次配置，传给数据库初始化和各服务进程
+        config = get_config()
+        
         # 先初始化数据库
-        init_databases()
+        init_databases(config)
         
         # 设置信号处理
         signal.signal(signal.SIGTERM, signal_handler)
@@ -446,13 +675,8 @@ def main():
         # 注册清理函数
         atexit.register(cleanup_pid)
         
-        # 决定是否后台运行
-        if not args.foreground:
-            print("\n" + "=" * 60)
-            print("启动股海罗盘（后台模式）")
-            print("=" * 60)
-            daemonize()
-        else:
+        # 守护进程的PID文件已由启动它的进程写入
+        if not detached:
             print("\n" + "=" * 60)
             print("启动股海罗盘（前台模式）")
             print("=" * 60)
@@ -462,29 +686,36 @@ def main():
         # 根据参数决定启动哪些服务
         if args.api_only:
             logger.info("启动API服务器（含调度器）")
-            run_api_server()
+            run_api_server(config)
         elif args.web_only:
             logger.info("启动Web服务器")
-            run_web_server()
+            run_web_server(config)
         else:
             logger.info("启动所有服务（API + Web + 调度器）")
             
             # 使用多进程同时启动API和Web服务器
+            # 子进程由 forkserver 从只预加载了 app.utils 的模板进程fork，
+            # 不会复制主进程已加载的模块、数据库连接池和调度器状态
             # 注意：子进程会继承父进程的进程组ID
-            api_process = multiprocessing.Process(target=run_api_server)
-            web_process = multiprocessing.Process(target=run_web_server)
+            ctx = multiprocessing.get_context('forkserver')
+            ctx.set_forkserver_preload(['app.utils'])
+            api_process = ctx.Process(target=run_service_process, args=(run_api_server, config))
+            web_process = ctx.Process(target=run_service_process, args=(run_web_server, config))
             
             # 启动进程
             api_process.start()
             web_process.start()
             
+            # 记录子进程PID，主进程异常退出后 stop 仍能找到并停止子进程
+            save_service_pids([api_process.pid, web_process.pid])
+            
             # 记录子进程信息到日志
             logger.info(f"API进程 PID: {api_process.pid}")
             logger.info(f"Web进程 PID: {web_process.pid}")
             logger.info(f"主进程 PID: {os.getpid()}")
             logger.info(f"进程组 PGID: {os.getpgid(0)}")
             
-            if not args.foreground:
+            if detached:
                 logger.info("所有服务已启动！")
                 logger.info(f"  - API服务器: http://localhost:5000")
                 logger.info(f"  - Web界面:   http://localhost:8000")
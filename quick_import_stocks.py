@@ -1,25 +1,28 @@
 """快速导入股票基础数据"""
-from app.models import get_sqlite_db, get_duckdb
+from datetime import datetime
+from app.models.database_factory import get_database
 
-# 从DuckDB获取股票代码
-duckdb = get_duckdb()
-result = duckdb.execute_query('SELECT DISTINCT code FROM daily_market ORDER BY code')
-stock_codes = [row['code'] for row in result]
+db = get_database()
 
-print(f"从DuckDB获取到 {len(stock_codes)} 只股票")
+# 统计行情表中的股票数（代码本身由下面的 INSERT ... SELECT 在数据库内读取，无需逐行取回）
+result = db.execute_query('SELECT COUNT(DISTINCT code) AS stock_count FROM daily_market')
+stock_count = result[0]['stock_count'] if result else 0
 
-# 插入到SQLite
-sqlite_db = get_sqlite_db()
-success_count = 0
+print(f"从行情表获取到 {stock_count} 只股票")
 
-for code in stock_codes:
-    try:
-        sqlite_db.execute_update(
-            'INSERT OR IGNORE INTO stocks (code, name, market_type) VALUES (?, ?, ?)',
-            (code, f'股票{code}', 'A股')
-        )
-        success_count += 1
-    except Exception as e:
-        print(f'插入失败 {code}: {e}')
+# 一条 INSERT ... SELECT 在数据库内完成导入（已存在的股票保持不变）
+try:
+    now = datetime.now()
+    success_count = db.execute_update(
+        """
+        INSERT IGNORE INTO stocks (code, name, market_type, created_at, updated_at)
+        SELECT DISTINCT code, CONCAT('股票', code), 'A股', %s, %s
+        FROM daily_market
+        """,
+        (now, now)
+    )
+except Exception as e:
+    print(f'导入失败: {e}')
+    success_count = 0
 
-print(f'成功导入 {success_count} 只股票到SQLite')
+print(f'成功导入 {success_count} 只股票到stocks表')
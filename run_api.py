@@ -26,7 +26,8 @@ def main():
     
     app = create_app()
     logger.info(f"启动 API 服务: http://{args.host}:{args.port}")
-    app.run(host=args.host, port=args.port, debug=args.debug)
+    # 每个请求一个线程，等待数据库和外部接口时不阻塞其他请求
+    app.run(host=args.host, port=args.port, debug=args.debug, threaded=True)
 
 if __name__ == '__main__':
     main()
@@ -50,6 +50,9 @@ def start_gunicorn_web():
         "gunicorn",
         "--config", "gunicorn_config.py",
         "--bind", "0.0.0.0:8000",
+        # Web页面主要在等待API响应，使用线程工作模式，等待期间同一进程可继续处理其他请求
+        "--worker-class", "gthread",
+        "--threads", "8",
         "app.web.app:create_web_app()",
     ]
     
@@ -79,7 +79,8 @@ def main():
         app.run(
             host=host,
             port=port,
-            debug=debug
+            debug=debug,
+            threaded=True  # 每个请求一个线程，等待API响应时不阻塞其他请求
         )
         
     except KeyboardInterrupt:
@@ -1,92 +1,88 @@
 #!/usr/bin/env python3
 """
 测试数据填充脚本
-为DuckDB数据库创建示例数据，用于测试
+为MySQL数据库创建示例行情数据，用于测试
 """
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
 import sys
 import os
 
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.models.duckdb_manager import DuckDBManager
-from app.utils.config import get_config
+from app.models.database_factory import get_database
 
 
-def populate_duckdb_test_data():
-    """填充DuckDB测试数据"""
-    print("开始填充DuckDB测试数据...")
+def populate_market_test_data():
+    """填充 daily_market 测试数据"""
+    print("开始填充行情测试数据...")
     
-    # 获取配置
-    config = get_config()
-    db_manager = DuckDBManager(config.get('database.duckdb_path'))
+    db = get_database()
     
     # 创建示例数据
     start_date = datetime(2024, 1, 1)
     end_date = datetime(2024, 12, 20)
-    date_range = pd.date_range(start_date, end_date)
+    dates = pd.date_range(start_date, end_date).date
     
     # 为10只股票创建数据
     test_stocks = [
         '000001.SZ', '000002.SZ', '000858.SZ', '002594.SZ', '300059.SZ',
         '600000.SH', '600519.SH', '601318.SH', '600036.SH', '688981.SH'
     ]
-    all_data = []
     
-    for stock_code in test_stocks:
-        for date in date_range:
-            base_price = 10 if stock_code.startswith(('000', '002', '300')) else 100
-            
-            # 模拟价格波动
-            random.seed(f'{stock_code}_{date}'.encode())
-            open_price = base_price * (0.95 + random.random() * 0.1)
-            close_price = base_price * (0.95 + random.random() * 0.1)
-            high_price = max(open_price, close_price) * (1 + random.random() * 0.02)
-            low_price = min(open_price, close_price) * (1 - random.random() * 0.02)
-            volume = int(1000000 * (0.5 + random.random()))
-            amount = volume * close_price
-            
-            all_data.append({
-                'code': stock_code,
-                'trade_date': date,
-                'open': round(open_price, 2),
-                'high': round(high_price, 2),
-                'low': round(low_price, 2),
-                'close': round(close_price, 2),
-                'volume': volume,
-                'amount': round(amount, 2),
-                'change_pct': round((close_price - base_price) / base_price * 100, 2),
-                'turnover_rate': round(random.random() * 5, 2)
-            })
+    # 按列一次生成所有股票所有日期的数据（股票在外层、日期在内层）
+    n = len(test_stocks) * len(dates)
+    codes = np.repeat(test_stocks, len(dates))
+    trade_dates = np.tile(dates, len(test_stocks))
+    base_price = np.repeat(
+        [10.0 if code.startswith(('000', '002', '300')) else 100.0 for code in test_stocks],
+        len(dates)
+    )
     
-    # 转换为DataFrame并写入DuckDB
-    df = pd.DataFrame(all_data)
-    print(f'创建 {len(df)} 条测试数据，覆盖 {len(test_stocks)} 只股票')
+    # 模拟价格波动（固定种子，每次生成的数据相同）
+    rng = np.random.default_rng(seed=0)
+    open_price = base_price * (0.95 + rng.random(n) * 0.1)
+    close_price = base_price * (0.95 + rng.random(n) * 0.1)
+    high_price = np.maximum(open_price, close_price) * (1 + rng.random(n) * 0.02)
+    low_price = np.minimum(open_price, close_price) * (1 - rng.random(n) * 0.02)
+    volume = (1000000 * (0.5 + rng.random(n))).astype(np.int64)
+    amount = volume * close_price
+    change_pct = (close_price - base_price) / base_price * 100
+    turnover_rate = rng.random(n) * 5
     
-    # 插入数据
-    inserted = db_manager.insert_dataframe('daily_market', df)
-    print(f'✓ 成功插入 {inserted} 条数据')
+    print(f'创建 {n} 条测试数据，覆盖 {len(test_stocks)} 只股票')
     
-    # 验证数据
-    count = len(df['code'].unique())
-    print(f'✓ 数据库中现在有 {count} 只股票的数据')
+    # 一条 executemany 批量写入（已存在的记录保持不变）
+    rows = list(zip(
+        codes.tolist(), trade_dates.tolist(),
+        np.round(open_price, 2).tolist(), np.round(high_price, 2).tolist(),
+        np.round(low_price, 2).tolist(), np.round(close_price, 2).tolist(),
+        volume.tolist(), np.round(amount, 2).tolist(),
+        np.round(change_pct, 2).tolist(), np.round(turnover_rate, 2).tolist()
+    ))
+    inserted = db.execute_many(
+        """
+        INSERT IGNORE INTO daily_market
+            (code, trade_date, open, high, low, close, volume, amount, change_pct, turnover_rate)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """,
+        rows
+    )
+    print(f'✓ 成功插入 {inserted} 条数据')
+    print(f'✓ 数据库中现在有 {len(test_stocks)} 只股票的测试数据')
     
     return inserted
 
 
-def populate_sqlite_test_data():
-    """填充SQLite测试数据（添加示例策略）"""
-    print("\n开始填充SQLite测试数据...")
+def populate_strategy_test_data():
+    """填充策略测试数据（添加示例策略）"""
+    print("\n开始填充策略测试数据...")
     
-    from app.models.sqlite_db import SQLiteDB
-    from app.utils.config import get_config
     import json
     
-    config = get_config()
-    sqlite_db = SQLiteDB(config.get('database.sqlite_path'))
+    db = get_database()
     
     # 添加示例策略
     strategies = [
@@ -114,25 +110,36 @@ def populate_sqlite_test_data():
         }
     ]
     
+    # 一条 executemany 批量写入（同名策略已存在时跳过）
+    now = datetime.now()
+    inserted = db.execute_many(
+        """
+        INSERT IGNORE INTO strategies (name, description, config, enabled, created_at, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        """,
+        [
+            (strategy['name'], strategy['description'], strategy['config'], strategy['enabled'], now, now)
+            for strategy in strategies
+        ]
+    )
     for strategy_data in strategies:
-        strategy_id = sqlite_db.insert_one('strategies', strategy_data)
-        print(f'✓ 创建策略: {strategy_data["name"]} (ID: {strategy_id})')
+        print(f'✓ 创建策略: {strategy_data["name"]}')
     
-    return len(strategies)
+    return inserted
 
 
 if __name__ == '__main__':
     try:
-        # 填充DuckDB数据
-        duckdb_count = populate_duckdb_test_data()
+        # 填充行情数据
+        market_count = populate_market_test_data()
         
-        # 填充SQLite数据
-        sqlite_count = populate_sqlite_test_data()
+        # 填充策略数据
+        strategy_count = populate_strategy_test_data()
         
         print("\n" + "="*50)
         print("测试数据填充完成！")
-        print(f"  - DuckDB行情数据: {duckdb_count} 条")
-        print(f"  - SQLite示例策略: {sqlite_count} 个")
+        print(f"  - 行情数据: {market_count} 条")
+        print(f"  - 示例策略: {strategy_count} 个")
         print("="*50)
         print("\n现在可以运行完整测试:")
         print("  python3 -m tests.run_tests")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+配置管理测试
+
+测试内容：
+1. 查找期间配置变化时不缓存旧值
+2. 重新加载时应用环境变量覆盖，配置无效时保留原配置
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.config import ConfigManager
+
+EXAMPLE_CONFIG = Path(__file__).resolve().parent.parent / 'config.example.yaml'
+
+
+class TestConfigManager(unittest.TestCase):
+    """配置管理器测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = Path(self.temp_dir) / 'config.yaml'
+        shutil.copy(EXAMPLE_CONFIG, self.config_path)
+        self.config = ConfigManager(str(self.config_path))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_01_no_stale_cache_during_change(self):
+        """测试查找期间配置被修改时不缓存旧值"""
+        lookup = self.config._lookup
+
+        def lookup_then_set(key):
+            value = lookup(key)
+            self.config.set('api.port', 6000)
+            return value
+
+        self.config._lookup = lookup_then_set
+        self.config.get('api.port')
+        self.config._lookup = lookup
+
+        self.assertEqual(self.config.get('api.port'), 6000)
+
+    def test_02_reload_applies_overrides(self):
+        """测试重新加载后读取到环境变量覆盖的值，配置无效时保留原配置"""
+        self.config.get('database.mysql.host')
+
+        os.environ['MYSQL_HOST'] = 'db.example.com'
+        try:
+            self.config.set('api.port', 6000)
+            self.config.reload()
+            self.assertEqual(self.config.get('database.mysql.host'), 'db.example.com')
+        finally:
+            del os.environ['MYSQL_HOST']
+
+        self.config_path.write_text('datasource:\n  type: unknown\n', encoding='utf-8')
+        with self.assertRaises(ValueError):
+            self.config.reload()
+        self.assertEqual(self.config.get('database.mysql.host'), 'db.example.com')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
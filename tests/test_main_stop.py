@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+主程序停止服务测试
+
+测试内容：
+1. 没有PID文件时，stop 仍能停止 forkserver 启动的服务子进程
+2. 记录的PID被其他进程复用时不会误杀
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+class TestStopServices(unittest.TestCase):
+    """停止服务测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.original_files = (main.PID_FILE, main.SERVICE_PID_FILE)
+        main.PID_FILE = Path(self.temp_dir.name) / '.stock_app.pid'
+        main.SERVICE_PID_FILE = Path(self.temp_dir.name) / '.stock_app.services.pid'
+
+    def tearDown(self):
+        main.PID_FILE, main.SERVICE_PID_FILE = self.original_files
+        self.temp_dir.cleanup()
+
+    def test_01_stop_without_pid_file(self):
+        """测试PID文件丢失后停止 forkserver 子进程"""
+        ctx = multiprocessing.get_context('forkserver')
+        process = ctx.Process(target=time.sleep, args=(60,))
+        process.start()
+        try:
+            self.assertFalse(main.is_app_cmdline(main.read_cmdline(process.pid)))
+            main.save_service_pids([process.pid])
+
+            self.assertEqual(main.stop_services(), 1)
+            process.join(timeout=5)
+            self.assertFalse(process.is_alive())
+            self.assertFalse(main.SERVICE_PID_FILE.exists())
+        finally:
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+    def test_02_reused_pid_not_killed(self):
+        """测试记录的PID已属于其他进程时不杀死该进程"""
+        main.save_service_pids([os.getppid()])
+        self.assertNotIn(os.getppid(), main.find_app_pids())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
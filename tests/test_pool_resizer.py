@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+连接池动态扩缩容测试
+
+测试内容：
+1. 调整 pool_size 后连接计数保持一致
+2. 持续溢出时扩大、空闲后缩小
+"""
+
+import os
+import sys
+import unittest
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from app.models.pool_resizer import PoolResizer, resize_queue_pool
+
+
+class TestPoolResizer(unittest.TestCase):
+    """连接池扩缩容测试"""
+    
+    def setUp(self):
+        self.engine = create_engine('sqlite://', poolclass=QueuePool, pool_size=2, max_overflow=5)
+    
+    def tearDown(self):
+        self.engine.dispose()
+    
+    def test_01_resize_keeps_counts(self):
+        """测试扩大和缩小后借出数、溢出数和空闲数正确"""
+        pool = self.engine.pool
+        conns = [self.engine.connect() for _ in range(4)]
+        self.assertEqual(pool.overflow(), 2)
+        
+        resize_queue_pool(pool, 5)
+        self.assertEqual(pool.size(), 5)
+        self.assertEqual(pool.overflow(), -1)
+        self.assertEqual(pool.checkedout(), 4)
+        
+        for conn in conns:
+            conn.close()
+        self.assertEqual(pool.checkedin(), 4)
+        self.assertEqual(pool.checkedout(), 0)
+        
+        resize_queue_pool(pool, 2)
+        self.assertEqual(pool.size(), 2)
+        self.assertEqual(pool.checkedin(), 2)
+        self.assertEqual(pool.overflow(), 0)
+        self.assertEqual(pool.checkedout(), 0)
+    
+    def test_02_grow_and_shrink(self):
+        """测试连续溢出后扩大，空闲超过时限后缩回最小值"""
+        pool = self.engine.pool
+        resizer = PoolResizer(self.engine, min_size=2, max_size=6, step=3,
+                              grow_after=2, shrink_after=0)
+        conns = [self.engine.connect() for _ in range(4)]
+        
+        resizer.check()
+        self.assertEqual(pool.size(), 2)
+        resizer.check()
+        self.assertEqual(pool.size(), 5)
+        resizer.check()
+        self.assertEqual(pool.size(), 5)
+        
+        for conn in conns:
+            conn.close()
+        resizer.check()
+        self.assertEqual(pool.size(), 5)
+        resizer.check()
+        self.assertEqual(pool.size(), 2)
+        self.assertEqual(pool.checkedin(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
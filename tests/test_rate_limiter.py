@@ -241,6 +241,36 @@ class TestConcurrency(unittest.TestCase):
         
         logger.info(f"  5个并发请求总耗时: {elapsed:.3f}秒")
         logger.info("✓ 并发请求测试通过")
+    
+    def test_02_concurrent_spacing(self):
+        """测试并发请求之间仍保持最小间隔"""
+        logger.info("测试并发请求间隔...")
+        
+        limiter = RateLimiter(min_delay=0.05, max_delay=0.06)
+        
+        results = []
+        results_lock = threading.Lock()
+        
+        def make_request():
+            limiter.wait()
+            with results_lock:
+                results.append(time.monotonic())
+        
+        start_time = time.monotonic()
+        threads = [threading.Thread(target=make_request) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+        
+        self.assertEqual(len(results), 5, "不是所有请求都完成了")
+        
+        # 5个请求依次预约发送时间，最后一个至少要在4个最小间隔之后才能发出
+        elapsed = max(results) - start_time
+        self.assertGreaterEqual(elapsed, 4 * limiter.min_delay, f"5个并发请求总耗时 {elapsed:.3f}秒 小于最小间隔之和")
+        
+        logger.info(f"  5个并发请求总耗时: {elapsed:.3f}秒")
+        logger.info("✓ 并发请求间隔测试通过")
 
 
 def run_rate_limiter_tests():
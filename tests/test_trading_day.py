@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+交易日工具测试
+
+测试内容：
+1. 周末和节假日判断
+2. 日期区间内交易日的查询与计数
+3. 位图范围外日期的判断
+4. 节假日增删后结果同步更新
+"""
+
+import os
+import sys
+import unittest
+from datetime import date, timedelta
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.trading_day import TradingDayHelper
+
+
+def reference_trading_days(start_date: date, end_date: date, holidays=()) -> list:
+    """逐日判断的参考实现"""
+    days = []
+    current_date = start_date
+    while current_date <= end_date:
+        if current_date.weekday() < 5 and current_date.strftime('%m-%d') not in holidays:
+            days.append(current_date)
+        current_date += timedelta(days=1)
+    return days
+
+
+class TestTradingDayHelper(unittest.TestCase):
+    """交易日助手测试"""
+
+    def setUp(self):
+        self.simple = TradingDayHelper(use_simplified=True)
+        self.full = TradingDayHelper(use_simplified=False)
+
+    def test_01_is_trading_day(self):
+        """测试单日判断"""
+        self.assertTrue(self.simple.is_trading_day(date(2024, 1, 2)))
+        self.assertFalse(self.simple.is_trading_day(date(2024, 1, 6)))
+        self.assertTrue(self.simple.is_trading_day(date(2024, 10, 1)))
+        self.assertFalse(self.full.is_trading_day(date(2024, 10, 1)))
+        self.assertTrue(self.full.is_trading_day(date(2024, 10, 8)))
+
+    def test_02_range_matches_reference(self):
+        """测试区间查询与逐日判断结果一致"""
+        holidays = set(TradingDayHelper.DEFAULT_HOLIDAYS)
+        ranges = [
+            (date(2024, 1, 1), date(2024, 1, 1)),
+            (date(2024, 1, 6), date(2024, 1, 7)),
+            (date(2023, 12, 25), date(2024, 1, 9)),
+            (date(2020, 3, 3), date(2024, 11, 17)),
+            (date(1990, 1, 1), date(1990, 1, 31)),
+            (date(2050, 12, 1), date(2050, 12, 31)),
+        ]
+        for start_date, end_date in ranges:
+            expected = reference_trading_days(start_date, end_date, holidays)
+            self.assertEqual(self.full.get_trading_days_between(start_date, end_date), expected)
+            self.assertEqual(self.full.count_trading_days_between(start_date, end_date), len(expected))
+            self.assertEqual(self.full.has_trading_days_between(start_date, end_date), bool(expected))
+
+    def test_03_outside_bitmap(self):
+        """测试位图范围外及跨越位图边界的日期"""
+        ranges = [
+            (date(1985, 5, 1), date(1985, 5, 31)),
+            (date(1989, 12, 20), date(1990, 1, 10)),
+            (date(2050, 12, 20), date(2051, 1, 10)),
+        ]
+        for start_date, end_date in ranges:
+            expected = reference_trading_days(start_date, end_date)
+            self.assertEqual(self.simple.get_trading_days_between(start_date, end_date), expected)
+            self.assertEqual(self.simple.count_trading_days_between(start_date, end_date), len(expected))
+        for day in (date(1985, 5, 4), date(1985, 5, 6), date(2060, 1, 3), date(2060, 1, 5)):
+            self.assertEqual(self.simple.is_trading_day(day), day.weekday() < 5)
+
+    def test_04_empty_range(self):
+        """测试开始日期晚于结束日期"""
+        start_date, end_date = date(2024, 1, 10), date(2024, 1, 1)
+        self.assertEqual(self.simple.get_trading_days_between(start_date, end_date), [])
+        self.assertEqual(self.simple.count_trading_days_between(start_date, end_date), 0)
+        self.assertFalse(self.simple.has_trading_days_between(start_date, end_date))
+
+    def test_05_update_holidays(self):
+        """测试增删节假日后结果同步更新"""
+        helper = TradingDayHelper(holidays=[], use_simplified=False)
+        day = date(2024, 6, 10)
+        self.assertTrue(helper.is_trading_day(day))
+        helper.add_holidays(['06-10'])
+        self.assertTrue(helper.is_holiday(day))
+        self.assertFalse(helper.is_holiday(date(2024, 6, 11)))
+        self.assertFalse(helper.is_trading_day(day))
+        self.assertEqual(helper.count_trading_days_between(day, day + timedelta(days=4)), 4)
+        helper.remove_holidays(['06-10'])
+        self.assertFalse(helper.is_holiday(day))
+        self.assertTrue(helper.is_trading_day(day))
+
+    def test_06_next_previous(self):
+        """测试前后交易日查询"""
+        self.assertEqual(self.simple.get_next_trading_day(date(2024, 1, 5)), date(2024, 1, 8))
+        self.assertEqual(self.simple.get_previous_trading_day(date(2024, 1, 8)), date(2024, 1, 5))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
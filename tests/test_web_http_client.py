@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Web HTTP客户端测试
+
+测试内容：
+1. 进程内调用适配器的请求与响应转换
+2. GET响应短时缓存
+3. Web应用进程内调用API时的认证白名单与请求上下文隔离
+"""
+
+import copy
+import os
+import sys
+import unittest
+from unittest import mock
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, g, jsonify, request
+
+from app.web import http_client
+from app.web.http_client import APISession, WSGIAdapter
+
+
+def create_api_app():
+    """创建用于测试的API应用"""
+    app = Flask(__name__)
+    
+    @app.route('/api/echo', methods=['GET', 'POST'])
+    def echo():
+        return jsonify({
+            'method': request.method,
+            'args': request.args.to_dict(),
+            'json': request.get_json(silent=True),
+            'auth': request.headers.get('Authorization'),
+            'accept_encoding': request.headers.get('Accept-Encoding')
+        })
+    
+    @app.route('/api/missing')
+    def missing():
+        return jsonify({'error': 'not found'}), 404
+    
+    return app
+
+
+class TestWSGIAdapter(unittest.TestCase):
+    """进程内调用适配器测试"""
+    
+    def setUp(self):
+        self.session = APISession()
+        self.session.mount('http://localhost:5000/', WSGIAdapter(create_api_app()))
+    
+    def test_01_get(self):
+        """测试GET请求的参数和请求头"""
+        response = self.session.get(
+            'http://localhost:5000/api/echo',
+            params={'limit': 5},
+            headers={'Authorization': 'Bearer token'}
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['method'], 'GET')
+        self.assertEqual(data['args'], {'limit': '5'})
+        self.assertEqual(data['auth'], 'Bearer token')
+        # 进程内调用不请求压缩响应
+        self.assertIsNone(data['accept_encoding'])
+    
+    def test_02_post_json(self):
+        """测试POST请求体"""
+        response = self.session.post('http://localhost:5000/api/echo', json={'a': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['json'], {'a': 1})
+    
+    def test_03_error_status(self):
+        """测试错误状态码"""
+        response = self.session.get('http://localhost:5000/api/missing')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.ok)
+        self.assertEqual(response.json()['error'], 'not found')
+
+
+class TestCachedGet(unittest.TestCase):
+    """GET响应缓存测试"""
+    
+    def setUp(self):
+        http_client.clear_response_cache()
+        self.session = APISession()
+        self.session.mount('http://localhost:5000/', WSGIAdapter(create_api_app()))
+        patcher = mock.patch.object(http_client, 'HTTP', self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(http_client.clear_response_cache)
+    
+    def test_01_cache_hit(self):
+        """测试相同用户的重复请求命中缓存"""
+        headers = {'Authorization': 'Bearer a'}
+        with mock.patch.object(self.session, 'get', wraps=self.session.get) as get:
+            first = http_client.cached_get('http://localhost:5000/api/echo', headers=headers)
+            second = http_client.cached_get('http://localhost:5000/api/echo', headers=headers)
+            other = http_client.cached_get('http://localhost:5000/api/echo',
+                                           headers={'Authorization': 'Bearer b'})
+        self.assertIs(first, second)
+        self.assertEqual(other.json()['auth'], 'Bearer b')
+        self.assertEqual(get.call_count, 2)
+    
+    def test_02_error_not_cached(self):
+        """测试失败响应不缓存"""
+        with mock.patch.object(self.session, 'get', wraps=self.session.get) as get:
+            http_client.cached_get('http://localhost:5000/api/missing')
+            response = http_client.cached_get('http://localhost:5000/api/missing')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(get.call_count, 2)
+
+
+class TestInprocessWebApp(unittest.TestCase):
+    """Web应用进程内调用API测试"""
+    
+    def setUp(self):
+        from app.utils import get_config
+        from app.web.app import create_web_app
+        
+        from app.models.database_factory import DatabaseFactory
+        
+        http_client.clear_response_cache()
+        self.addCleanup(http_client.clear_response_cache)
+        patcher = mock.patch.object(http_client, 'HTTP', APISession())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        # 导入API路由时会初始化数据库，测试不依赖MySQL
+        db_patcher = mock.patch.object(DatabaseFactory, 'get_database', return_value=mock.MagicMock())
+        db_patcher.start()
+        self.addCleanup(db_patcher.stop)
+        
+        config = copy.deepcopy(get_config().get_all())
+        config.setdefault('web', {})['inprocess_api'] = True
+        self.app = create_web_app(config)
+        
+        # 仪表板依赖的接口替换为不访问数据库的实现，认证钩子保持不变
+        self.app.view_functions['api_system.get_system_stats'] = \
+            lambda: jsonify({'success': True, 'data': {}})
+        self.app.view_functions['api_system.get_system_info'] = \
+            lambda: jsonify({'success': True, 'data': {}})
+        self.app.view_functions['api_system.get_scheduler_logs'] = \
+            lambda: jsonify({'success': True, 'data': []})
+        
+        @self.app.route('/api/test/whoami')
+        def whoami():
+            return jsonify({'username': g.user['username']})
+        
+        @self.app.route('/probe')
+        def probe():
+            from app.utils.auth import AuthUtils
+            token = AuthUtils.generate_token(1, 'tester', 'user')
+            response = http_client.HTTP.get(
+                f"{http_client.api_base_url()}/test/whoami",
+                headers={'Authorization': f'Bearer {token}'}
+            )
+            return jsonify({'inner': response.json(), 'leaked': 'user' in g})
+        
+        self.client = self.app.test_client()
+    
+    def test_01_anonymous_dashboard(self):
+        """测试未登录访问仪表板时公开接口不返回401"""
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+    
+    def test_02_context_isolated(self):
+        """测试进程内调用设置的 g.user 不泄漏到页面请求"""
+        data = self.client.get('/probe').get_json()
+        self.assertEqual(data['inner'], {'username': 'tester'})
+        self.assertFalse(data['leaked'])
+    
+    def test_03_external_request_requires_token(self):
+        """测试外部请求访问Web端口的API接口时仍只放行登录、注册和健康检查"""
+        response = self.client.get('/api/system/config')
+        self.assertEqual(response.status_code, 401)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)